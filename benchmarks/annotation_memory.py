@@ -0,0 +1,51 @@
+"""
+Measures the memory used by the annotations of a large CATMA project, with complete and with compact annotations.
+
+Usage: python benchmarks/annotation_memory.py [<projects directory> <project name>]
+
+Without arguments a synthetic project gets generated in a temporary directory, see synthetic_project.py.
+"""
+import contextlib
+import gc
+import io
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from gitma import CatmaProject
+from synthetic_project import DEMO_PROJECT_NAME, create_synthetic_project
+
+
+def measure_annotation_memory(projects_directory: str, project_name: str, compact: bool):
+    # the memory still allocated after loading the project, minus the data frames
+    gc.collect()
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        project = CatmaProject(projects_directory=projects_directory, project_name=project_name, compact=compact)
+    for ac in project.annotation_collections:
+        ac.df = None
+    gc.collect()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    annotation_count = sum(len(ac.annotations) for ac in project.annotation_collections)
+    return memory, annotation_count
+
+
+def main(projects_directory: str, project_name: str) -> None:
+    for compact in (False, True):
+        memory, annotation_count = measure_annotation_memory(projects_directory, project_name, compact)
+        print(
+            f'compact={compact!s:<5}  {memory / 2 ** 20:7.1f} MiB for {annotation_count} annotations, '
+            f'{memory / annotation_count / 1024:5.2f} KiB per annotation'
+        )
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        main(projects_directory=sys.argv[1], project_name=sys.argv[2])
+    else:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            main(projects_directory=create_synthetic_project(temp_dir), project_name=DEMO_PROJECT_NAME)
@@ -0,0 +1,48 @@
+"""
+Measures the time it takes to build `AnnotationCollection.df` and the memory the data frames use.
+
+Usage: python benchmarks/dataframe_construction.py [<projects directory> <project name>]
+
+Without arguments a synthetic project with a collection of 100,000 annotations gets generated in a temporary directory,
+see synthetic_project.py.
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from gitma import CatmaProject
+from synthetic_project import DEMO_PROJECT_NAME, create_synthetic_project
+
+
+def main(projects_directory: str, project_name: str, repetitions: int = 3) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        project = CatmaProject(projects_directory=projects_directory, project_name=project_name, lazy=True)
+
+    for ac in project.annotation_collections:
+        if len(ac.annotations) < 1000:
+            continue
+
+        timings = []
+        for _ in range(repetitions):
+            ac.df = None
+            start = time.perf_counter()
+            ac.df
+            timings.append(time.perf_counter() - start)
+
+        print(
+            f'{ac.name}: {len(ac.annotations)} annotations, df built in {min(timings):.2f}s, '
+            f'{ac.df.memory_usage(deep=True).sum() / 2 ** 20:.1f} MiB'
+        )
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        main(projects_directory=sys.argv[1], project_name=sys.argv[2])
+    else:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            main(projects_directory=create_synthetic_project(temp_dir, ac_count=1, annotations_per_ac=100000), project_name=DEMO_PROJECT_NAME)
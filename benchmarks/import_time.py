@@ -0,0 +1,59 @@
+"""
+Measures the time it takes to import GitMA and its classes in a fresh interpreter, and which heavy dependencies get loaded.
+
+Usage: python benchmarks/import_time.py [<repetitions>]
+
+Use `python -X importtime -c "import gitma"` to find out which module is responsible if an import got slower.
+"""
+import os
+import subprocess
+import sys
+
+REPOSITORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+IMPORT_STATEMENTS = [
+    'import gitma',
+    'from gitma import CatmaProject',
+    'from gitma import Catma',
+    'from gitma import *',
+]
+
+# dependencies that should only be imported by the methods that need them
+HEAVY_DEPENDENCIES = ['pygit2', 'gitlab', 'plotly', 'spacy', 'networkx', 'IPython', 'nltk', 'pygamma_agreement']
+
+MEASUREMENT_SCRIPT = '''
+import sys
+import time
+start = time.perf_counter()
+{statement}
+duration = time.perf_counter() - start
+print(duration)
+print(' '.join(module for module in {heavy_dependencies!r} if module in sys.modules))
+'''
+
+
+def time_import(statement: str, repetitions: int = 5):
+    # the best of several runs in fresh interpreters, the first one also warms up the file system cache
+    timings = []
+    for _ in range(repetitions):
+        output = subprocess.run(
+            [sys.executable, '-c', MEASUREMENT_SCRIPT.format(statement=statement, heavy_dependencies=HEAVY_DEPENDENCIES)],
+            cwd=REPOSITORY_PATH,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.splitlines()
+        timings.append(float(output[0]))
+    loaded_dependencies = output[1].split() if len(output) > 1 else []
+    return min(timings), loaded_dependencies
+
+
+def main(repetitions: int) -> None:
+    print(f'{"statement":>32}  {"time":>7}  heavy dependencies loaded')
+    for statement in IMPORT_STATEMENTS:
+        duration, loaded_dependencies = time_import(statement, repetitions=repetitions)
+        print(f'{statement:>32}  {duration:6.3f}s  {", ".join(loaded_dependencies) or "-"}')
+
+
+if __name__ == '__main__':
+    main(repetitions=int(sys.argv[1]) if len(sys.argv) == 2 else 5)
@@ -0,0 +1,70 @@
+"""
+Compares the time it takes to load a large CATMA project with each installed JSON backend,
+and the time spent on parsing its JSON files alone.
+
+Usage: python benchmarks/json_backends.py [<projects directory> <project name>]
+
+Without arguments a synthetic project gets generated in a temporary directory, see synthetic_project.py.
+"""
+import contextlib
+import glob
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from gitma import CatmaProject
+from gitma import _json
+from gitma._json import get_available_json_backends, set_json_backend
+from synthetic_project import DEMO_PROJECT_NAME, create_synthetic_project
+
+
+def time_project_loading(projects_directory: str, project_name: str, repetitions: int = 3) -> float:
+    # the best of several runs, the first one also warms up the file system cache
+    timings = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            CatmaProject(projects_directory=projects_directory, project_name=project_name)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def time_json_parsing(projects_directory: str, project_name: str, repetitions: int = 3) -> float:
+    json_file_paths = glob.glob(f'{projects_directory}{project_name}/**/*.json', recursive=True)
+    timings = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        for json_file_path in json_file_paths:
+            with open(json_file_path, 'rb') as json_file:
+                _json.load(json_file)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(projects_directory: str, project_name: str) -> None:
+    parsing_timings = {}
+    loading_timings = {}
+    for backend in get_available_json_backends():
+        set_json_backend(backend)
+        parsing_timings[backend] = time_json_parsing(projects_directory, project_name)
+        loading_timings[backend] = time_project_loading(projects_directory, project_name)
+
+    print(f'{"backend":>10}  {"parsing":>16}  {"project loading":>16}')
+    for backend in parsing_timings:
+        print(
+            f'{backend:>10}  '
+            f'{parsing_timings[backend]:6.2f}s ({parsing_timings["json"] / parsing_timings[backend]:4.1f}x)  '
+            f'{loading_timings[backend]:6.2f}s ({loading_timings["json"] / loading_timings[backend]:4.1f}x)'
+        )
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        main(projects_directory=sys.argv[1], project_name=sys.argv[2])
+    else:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            main(projects_directory=create_synthetic_project(temp_dir), project_name=DEMO_PROJECT_NAME)
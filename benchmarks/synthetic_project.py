@@ -0,0 +1,86 @@
+"""
+Generates a large synthetic CATMA project from the demo project, for benchmarking.
+
+Usage: python benchmarks/synthetic_project.py <target directory> [<annotation collections> <annotations per collection>]
+"""
+import json
+import os
+import random
+import shutil
+import sys
+import uuid
+
+
+DEMO_PROJECT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'demo', 'projects')
+DEMO_PROJECT_NAME = 'CATMA_9385E190-13CD-44BE-8A06-32FA95B7EEFA_GitMA_Demo_Project'
+DEMO_DOCUMENT_UUID = 'D_A00D3E7F-06B0-4BB6-BF1F-58FCADFC60D4'
+DEMO_PAGE_FILE = 'collections/C_F8552E35-F9BD-4544-A8C5-BD9114C80E43/annotations/MVauth_0.json'
+
+# like CATMA, which starts a new page file at roughly 200 KB
+ANNOTATIONS_PER_PAGE_FILE = 150
+
+
+def create_synthetic_project(
+        projects_directory: str,
+        ac_count: int = 16,
+        annotations_per_ac: int = 3000,
+        seed: int = 1) -> str:
+    """Copies the demo project into `projects_directory` and adds annotation collections with random annotations
+    on the demo document, copied from the demo annotations.
+
+    Args:
+        projects_directory (str): Directory the project gets created in. Existing content gets removed.
+        ac_count (int, optional): Number of added annotation collections. Defaults to 16.
+        annotations_per_ac (int, optional): Number of annotations per added collection. Defaults to 3000.
+        seed (int, optional): Random seed. Defaults to 1.
+
+    Returns:
+        str: The projects directory with a trailing slash, to be passed to `CatmaProject`.
+    """
+    random.seed(seed)
+
+    projects_directory = os.path.abspath(projects_directory)
+    shutil.rmtree(projects_directory, ignore_errors=True)
+    project_path = os.path.join(projects_directory, DEMO_PROJECT_NAME)
+    shutil.copytree(os.path.join(DEMO_PROJECT_DIRECTORY, DEMO_PROJECT_NAME), project_path)
+
+    with open(os.path.join(project_path, DEMO_PAGE_FILE), 'r', encoding='utf-8') as page_file:
+        demo_annotations = json.load(page_file)
+    with open(f'{project_path}/documents/{DEMO_DOCUMENT_UUID}/{DEMO_DOCUMENT_UUID}.txt', 'r', encoding='utf-8', newline='') as document:
+        text_length = len(document.read())
+
+    for ac_index in range(ac_count):
+        ac_uuid = f'C_{str(uuid.UUID(int=ac_index + 1)).upper()}'
+        annotations_directory = f'{project_path}/collections/{ac_uuid}/annotations'
+        os.makedirs(annotations_directory)
+        with open(f'{project_path}/collections/{ac_uuid}/header.json', 'w', encoding='utf-8') as header:
+            json.dump({'name': f'synthetic_ac_{ac_index}', 'sourceDocumentId': DEMO_DOCUMENT_UUID}, header, indent=2)
+
+        annotations = []
+        for annotation_index in range(annotations_per_ac):
+            annotation = json.loads(json.dumps(random.choice(demo_annotations)))
+            annotation_uuid = str(uuid.UUID(int=ac_index * 10 ** 7 + annotation_index)).upper()
+            annotation['id'] = f'collections/{ac_uuid}/annotations/CATMA_{annotation_uuid}'
+            start_point = random.randrange(0, text_length - 200)
+            annotation['target']['items'] = [{
+                'source': DEMO_DOCUMENT_UUID,
+                'selector': {
+                    'start': start_point,
+                    'end': start_point + random.randrange(1, 150),
+                    'type': 'TextPositionSelector'
+                }
+            }]
+            annotations.append(annotation)
+
+        for page_number, page_start in enumerate(range(0, len(annotations), ANNOTATIONS_PER_PAGE_FILE)):
+            with open(f'{annotations_directory}/user{ac_index % 3}_{page_number}.json', 'w', encoding='utf-8') as page_file:
+                json.dump(annotations[page_start:page_start + ANNOTATIONS_PER_PAGE_FILE], page_file, indent=2)
+
+    return projects_directory + '/'
+
+
+if __name__ == '__main__':
+    if len(sys.argv) not in (2, 4):
+        print(__doc__)
+        sys.exit(1)
+    create_synthetic_project(sys.argv[1], *(int(arg) for arg in sys.argv[2:]))
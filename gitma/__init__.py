@@ -1,9 +1,52 @@
-from .tag import Tag
-from .tagset import Tagset
-from .annotation import Annotation
-from .project import CatmaProject
-from .catma import Catma
-from .property import Property
-from .text import Text
-from .annotation_collection import AnnotationCollection
-from .selector import Selector
+"""
+GitMA's classes are imported on first access, so that `import gitma` stays fast and only the modules
+(and their dependencies) that are actually used get loaded.
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .tag import Tag
+    from .tagset import Tagset
+    from .annotation import Annotation
+    from .project import CatmaProject
+    from .catma import Catma
+    from .property import Property
+    from .text import Text
+    from .annotation_collection import AnnotationCollection
+    from .annotation_columns import AnnotationColumns
+    from .annotation_record import AnnotationRecord
+    from .annotation_filter import AnnotationFilter
+    from .selector import Selector
+
+
+# the public classes with the modules they are defined in
+_CLASS_MODULES = {
+    'Tag': '.tag',
+    'Tagset': '.tagset',
+    'Annotation': '.annotation',
+    'CatmaProject': '.project',
+    'Catma': '.catma',
+    'Property': '.property',
+    'Text': '.text',
+    'AnnotationCollection': '.annotation_collection',
+    'AnnotationColumns': '.annotation_columns',
+    'AnnotationRecord': '.annotation_record',
+    'AnnotationFilter': '.annotation_filter',
+    'Selector': '.selector',
+}
+
+__all__ = list(_CLASS_MODULES)
+
+
+def __getattr__(name: str):
+    if name not in _CLASS_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_CLASS_MODULES[name], __name__), name)
+    # later accesses don't go through __getattr__ anymore
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,100 @@
+"""
+Buffering of annotation modifications, so that each page file gets rewritten once per batch instead of once per modification.
+"""
+import os
+from typing import Dict, List
+
+from gitma import _json
+from gitma.annotation import get_uuid
+from gitma._page_files import PageFileTransaction, write_file_atomically
+
+
+class AnnotationBatch:
+    """Collects modified and removed annotations per page file until `flush` is called, see `CatmaProject.batch`."""
+    def __init__(self):
+        # the new data of modified annotations and None for removed ones, by page file path and annotation UUID
+        self._changes: Dict[str, Dict[str, dict]] = {}
+        # the annotation data of the page files read by compact annotations, by page file path and annotation UUID
+        self._pages: Dict[str, Dict[str, dict]] = {}
+
+    def __len__(self):
+        return sum(len(changes) for changes in self._changes.values())
+
+    @property
+    def page_file_paths(self) -> List[str]:
+        """The paths of the page files with pending changes."""
+        return list(self._changes)
+
+    def modify(self, page_file_path: str, uuid: str, annotation_data: dict) -> None:
+        """Records that an annotation in a page file has to be replaced with the given data.
+        The data is written as it is when the batch gets flushed, so later changes to it are included.
+        """
+        self._changes.setdefault(page_file_path, {})[uuid] = annotation_data
+
+    def remove(self, page_file_path: str, uuid: str) -> None:
+        """Records that an annotation has to be removed from a page file."""
+        self._changes.setdefault(page_file_path, {})[uuid] = None
+
+    def read_page(self, page_file_path: str, storage) -> Dict[str, dict]:
+        """Returns the annotation data in a page file by annotation UUID. Each page file gets read and parsed once per batch,
+        so that compact annotations of the same page file don't parse it again each when they rehydrate their data.
+
+        Args:
+            page_file_path (str): The path of the page file.
+            storage: The storage the project is read from, see `gitma._storage`.
+        """
+        if page_file_path not in self._pages:
+            self._pages[page_file_path] = read_page(page_file_path, storage)
+        return self._pages[page_file_path]
+
+    def flush(self) -> None:
+        """Rewrites each page file with pending changes once and removes its changes from the batch.
+
+        The flush is atomic per page file, not as a whole: each page file is rewritten atomically, and the page files of
+        each annotation collection are rewritten together within one `PageFileTransaction`, so that other writers don't
+        interleave with them. If rewriting a page file fails, the page files rewritten before keep their changes and the
+        changes of the page files that were not rewritten stay in the batch.
+        """
+        page_file_paths_by_directory = {}
+        for page_file_path in self._changes:
+            page_file_paths_by_directory.setdefault(os.path.dirname(page_file_path), []).append(page_file_path)
+
+        for annotations_directory, page_file_paths in page_file_paths_by_directory.items():
+            with PageFileTransaction(annotations_directory):
+                for page_file_path in page_file_paths:
+                    rewrite_page_file(page_file_path, self._changes[page_file_path])
+                    del self._changes[page_file_path]
+
+
+def read_page(page_file_path: str, storage) -> Dict[str, dict]:
+    """Reads a page file and returns its annotation data by annotation UUID.
+
+    Args:
+        page_file_path (str): The path of the page file.
+        storage: The storage the project is read from, see `gitma._storage`.
+    """
+    return {get_uuid(item): item for item in _json.loads(storage.read_bytes(page_file_path))}
+
+
+def rewrite_page_file(page_file_path: str, changes: Dict[str, dict]) -> None:
+    """Replaces or removes annotations in a page file and writes it atomically.
+    Has to be called within a `PageFileTransaction` on the page file's directory.
+
+    Args:
+        page_file_path (str): The path of the page file.
+        changes (Dict[str, dict]): The new data of the annotations to replace and None for the annotations to remove,\
+            with the annotation UUIDs as keys.
+    """
+    with open(page_file_path, 'rb') as page_file:
+        ac_data = _json.load(page_file)
+
+    new_ac_data = []
+    for item in ac_data:
+        uuid = get_uuid(item)
+        if uuid not in changes:
+            new_ac_data.append(item)
+        elif changes[uuid] is not None:
+            new_ac_data.append(changes[uuid])
+
+    # serialized like `Annotation.modify_annotation` always did
+    write_file_atomically(page_file_path, _json.dumps(new_ac_data).encode('utf-8'))
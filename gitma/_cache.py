@@ -0,0 +1,128 @@
+"""
+On-disk cache for loaded project components, keyed by the Git state of the project clone.
+"""
+import gc
+import hashlib
+import os
+import pickle
+import shutil
+from typing import Any, Union
+
+
+# bump this whenever the pickled classes change in a way that makes older cache entries unusable
+CACHE_FORMAT_VERSION = 7
+
+
+def get_cache_key(project_path: str, commit_id: str = None) -> Union[str, None]:
+    """Computes a key for the Git state of a project clone from its HEAD commit and the commits checked out in its submodules.
+
+    Args:
+        project_path (str): The path of the project clone.
+        commit_id (str, optional): If given, the project is read from this commit with `gitma._git.GitStorage` instead of\
+            the working tree and the key is computed from the commit alone, which also pins the submodules' commits.\
+            Defaults to None.
+
+    Returns:
+        Union[str, None]: The cache key, or `None` if the project can't be cached because it is not a Git repository,\
+            has no commits yet or has uncommitted changes.
+    """
+    if commit_id is not None:
+        key_parts = [f'v{CACHE_FORMAT_VERSION}', os.path.abspath(project_path), f'commit:{commit_id}']
+        return hashlib.sha1('\n'.join(key_parts).encode('utf-8')).hexdigest()
+
+    import pygit2
+    from gitma._git import get_project_prefix
+
+    try:
+        repo = pygit2.Repository(project_path)
+    except pygit2.GitError:
+        return None
+
+    if repo.is_bare or repo.head_is_unborn:
+        return None
+
+    project_prefix = get_project_prefix(repo, project_path)
+
+    # uncommitted changes, e.g. annotations written with GitMA that haven't been pushed yet, are not part of the key
+    if any(path.startswith(project_prefix) for path in repo.status()):
+        return None
+
+    key_parts = [f'v{CACHE_FORMAT_VERSION}', os.path.abspath(project_path), str(repo.head.target)]
+
+    for submodule_path in sorted(repo.listall_submodules()):
+        submodule = repo.submodules[submodule_path]
+        try:
+            submodule_commit = str(submodule.open().head.target)
+        except pygit2.GitError:
+            # not initialized
+            submodule_commit = str(submodule.head_id)
+        key_parts.append(f'{submodule_path}:{submodule_commit}')
+
+    return hashlib.sha1('\n'.join(key_parts).encode('utf-8')).hexdigest()
+
+
+def get_cache_directory(cache_dir: str, project_path: str, commit_id: str = None) -> Union[str, None]:
+    """Returns the directory that holds the cache entries for the current Git state of a project clone.
+    Cache entries for other Git states of the same project get removed.
+
+    Args:
+        cache_dir (str): The base directory of the cache.
+        project_path (str): The path of the project clone.
+        commit_id (str, optional): The commit the project is read from, see `get_cache_key`. Defaults to None.
+
+    Returns:
+        Union[str, None]: The directory, or `None` if the project can't be cached, see `get_cache_key`.
+    """
+    cache_key = get_cache_key(project_path, commit_id=commit_id)
+    if cache_key is None:
+        return None
+
+    project_cache_dir = os.path.join(os.path.abspath(cache_dir), os.path.basename(os.path.abspath(project_path)))
+    cache_directory = os.path.join(project_cache_dir, cache_key)
+
+    if not os.path.isdir(cache_directory):
+        if os.path.isdir(project_cache_dir):
+            for stale_key in os.listdir(project_cache_dir):
+                shutil.rmtree(os.path.join(project_cache_dir, stale_key), ignore_errors=True)
+        os.makedirs(cache_directory, exist_ok=True)
+
+    return cache_directory
+
+
+def read_cache_entry(cache_directory: str, name: str) -> Any:
+    """Reads a pickled cache entry.
+
+    Args:
+        cache_directory (str): A directory returned by `get_cache_directory`.
+        name (str): The name of the cache entry.
+
+    Returns:
+        Any: The cached object or `None` if there is no usable cache entry.
+    """
+    # unpickling creates lots of container objects that would repeatedly trigger the cyclic garbage collector
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(os.path.join(cache_directory, f'{name}.pickle'), 'rb') as cache_file:
+            return pickle.load(cache_file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def write_cache_entry(cache_directory: str, name: str, obj: Any) -> None:
+    """Pickles an object into the cache. The entry is written to a temporary file first,
+    so that concurrent readers never see a partially written entry.
+
+    Args:
+        cache_directory (str): A directory returned by `get_cache_directory`.
+        name (str): The name of the cache entry.
+        obj (Any): The object to be cached.
+    """
+    cache_file_path = os.path.join(cache_directory, f'{name}.pickle')
+    temp_file_path = f'{cache_file_path}.{os.getpid()}.tmp'
+    with open(temp_file_path, 'wb') as cache_file:
+        pickle.dump(obj, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_file_path, cache_file_path)
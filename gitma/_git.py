@@ -0,0 +1,634 @@
+"""
+Helpers to inspect, commit and push the Git repositories of CATMA project clones with pygit2.
+"""
+import os
+import shutil
+import subprocess
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Generator, Iterable, List, Set, Tuple, Union
+
+import pygit2
+
+from gitma._page_files import is_page_file_name
+from gitma._storage import parse_gitmodules
+
+
+# file mode of submodule entries (gitlinks) in Git trees
+GIT_FILEMODE_COMMIT = 0o160000
+
+# the branch CATMA reads projects and annotation collections from
+CATMA_BRANCH = 'master'
+
+# the credentials read from git's credential helper by protocol, host and user name, shared by all pushes
+_helper_credentials: Dict[Tuple[str, str, str], pygit2.UserPass] = {}
+_helper_credentials_lock = threading.Lock()
+
+
+# the errors libgit2 raises when it finds that a push isn't a fast-forward before pushing
+_NON_FAST_FORWARD_MESSAGES = ('non-fastforwardable', 'contains commits that are not present locally')
+
+
+class AuthenticationError(pygit2.GitError):
+    """Raised if no credentials are available for a remote or the remote refused them."""
+
+
+class PushRejectedError(pygit2.GitError):
+    """Raised if a remote rejected a pushed reference, e.g. because the push isn't a fast-forward."""
+
+
+def get_project_prefix(repo: pygit2.Repository, project_path: str) -> str:
+    """Returns the path of a project relative to the working directory of the repository it belongs to.
+
+    Usually this is an empty string, but a project can also be a subdirectory of the repository,
+    e.g. the demo project within the GitMA repository.
+
+    Args:
+        repo (pygit2.Repository): The repository containing the project.
+        project_path (str): The path of the project.
+
+    Returns:
+        str: The relative path with a trailing slash, or an empty string.
+    """
+    project_prefix = os.path.relpath(os.path.abspath(project_path), os.path.abspath(repo.workdir)).replace('\\', '/')
+    return '' if project_prefix == '.' else f'{project_prefix}/'
+
+
+def get_changed_paths(repo: pygit2.Repository, old_commit_id: str, new_commit_id: str, prefix: str = '') -> Set[str]:
+    """Returns the paths of all files that differ between two commits, descending into submodules whose commit changed.
+
+    If a submodule was added or removed, its own path is included instead of the paths of the files it contains.
+
+    Args:
+        repo (pygit2.Repository): The repository.
+        old_commit_id (str): The old commit.
+        new_commit_id (str): The new commit.
+        prefix (str, optional): Prefix for the returned paths, used for submodules. Defaults to ''.
+
+    Returns:
+        Set[str]: The changed paths, relative to the working directory of the top-level repository.
+    """
+    changed_paths = set()
+
+    for delta in repo.diff(str(old_commit_id), str(new_commit_id)).deltas:
+        if GIT_FILEMODE_COMMIT in (delta.old_file.mode, delta.new_file.mode):
+            submodule_path = delta.new_file.path
+            try:
+                if delta.old_file.mode != delta.new_file.mode:
+                    raise KeyError(submodule_path)
+                submodule_repo = repo.submodules[submodule_path].open()
+                changed_paths.update(get_changed_paths(
+                    repo=submodule_repo,
+                    old_commit_id=delta.old_file.id,
+                    new_commit_id=delta.new_file.id,
+                    prefix=f'{prefix}{submodule_path}/'
+                ))
+            except (KeyError, pygit2.GitError):
+                # added, removed or not checked out, the whole submodule has to be treated as changed
+                changed_paths.add(f'{prefix}{submodule_path}')
+        else:
+            changed_paths.add(f'{prefix}{delta.old_file.path}')
+            changed_paths.add(f'{prefix}{delta.new_file.path}')
+
+    return changed_paths
+
+
+def is_local_url(url: str) -> bool:
+    """Whether a clone URL refers to a repository in the local file system."""
+    return url.startswith('file://') or os.path.exists(url)
+
+
+def fast_forward(repo: pygit2.Repository) -> bool:
+    """Fast-forwards the checked out branch of a repository to its upstream branch, like `git merge --ff-only`.
+
+    Args:
+        repo (pygit2.Repository): The repository.
+
+    Raises:
+        pygit2.GitError: If the branch and its upstream branch have diverged or the working tree has conflicting changes.
+
+    Returns:
+        bool: Whether the branch has been moved.
+    """
+    if repo.head_is_unborn or repo.head_is_detached:
+        return False
+    branch = repo.branches.local[repo.head.shorthand]
+    upstream = branch.upstream
+    if upstream is None:
+        return False
+
+    analysis, _ = repo.merge_analysis(upstream.target)
+    if analysis & pygit2.enums.MergeAnalysis.UP_TO_DATE:
+        return False
+    if not analysis & pygit2.enums.MergeAnalysis.FASTFORWARD:
+        raise pygit2.GitError(f'The branch "{branch.branch_name}" has diverged from "{upstream.branch_name}".')
+
+    # the default safe checkout strategy refuses to overwrite local changes
+    repo.checkout_tree(repo.get(upstream.target))
+    branch.set_target(upstream.target)
+    return True
+
+
+def clone_or_fetch(url: str, path: str, depth: int = 0, credentials=None) -> str:
+    """Clones a repository, or fetches and fast-forwards it if a clone already exists at the given path.
+
+    Args:
+        url (str): The clone URL.
+        path (str): The path of the clone.
+        depth (int, optional): If greater than 0, a shallow clone with this many commits gets created and shallow clones are\
+            fetched with this depth. libgit2 can't create shallow clones of local repositories, they are always cloned fully.\
+            Defaults to 0.
+        credentials (optional): pygit2 credentials, e.g. `pygit2.UserPass`. Defaults to None.
+
+    Raises:
+        pygit2.GitError: If cloning, fetching or fast-forwarding fails.
+
+    Returns:
+        str: 'cloned', 'updated' or 'up to date'.
+    """
+    # callbacks hold state, so every clone gets its own
+    callbacks = pygit2.RemoteCallbacks(credentials=credentials)
+    if depth and is_local_url(url):
+        depth = 0
+
+    if not os.path.isdir(path):
+        pygit2.clone_repository(url=url, path=path, bare=False, callbacks=callbacks, depth=depth)
+        return 'cloned'
+
+    repo = pygit2.Repository(path)
+    repo.remotes['origin'].fetch(callbacks=callbacks, depth=depth if repo.is_shallow else 0)
+    return 'updated' if fast_forward(repo) else 'up to date'
+
+
+def clone_or_fetch_all(
+        clone_urls: Dict[str, str],
+        workers: int = None,
+        depth: int = 0,
+        credentials=None) -> Dict[str, Union[str, Exception]]:
+    """Runs `clone_or_fetch` for many repositories in a pool of threads.
+    libgit2 releases the GIL during network and disk operations, so the clones proceed concurrently.
+
+    Args:
+        clone_urls (Dict[str, str]): The clone URLs with the paths of the clones as keys.
+        workers (int, optional): The maximum number of concurrent clones. If `None` the repositories are cloned\
+            one after another. Defaults to None.
+        depth (int, optional): See `clone_or_fetch`. Defaults to 0.
+        credentials (optional): pygit2 credentials used for all repositories. Defaults to None.
+
+    Returns:
+        Dict[str, Union[str, Exception]]: The result of `clone_or_fetch` or the raised exception for every path.
+    """
+    def run(path: str) -> Union[str, Exception]:
+        try:
+            return clone_or_fetch(url=clone_urls[path], path=path, depth=depth, credentials=credentials)
+        except (pygit2.GitError, KeyError, OSError) as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=workers or 1) as executor:
+        return dict(zip(clone_urls, executor.map(run, clone_urls)))
+
+
+def get_signature(repo: pygit2.Repository) -> pygit2.Signature:
+    """Returns the signature for new commits from the Git configuration, like `git commit` does,
+    or a GitMA signature if no user is configured."""
+    try:
+        return repo.default_signature
+    except KeyError:
+        return pygit2.Signature('GitMA', 'gitma@localhost')
+
+
+def stage_page_files(repo: pygit2.Repository, annotations_path: str) -> bool:
+    """Stages the added, modified and deleted page files in an annotations directory, like `git add` would,
+    but leaves all other changes in the working tree alone.
+
+    Args:
+        repo (pygit2.Repository): The repository the annotations directory belongs to.
+        annotations_path (str): The path of the annotations directory relative to the repository's working directory.
+
+    Returns:
+        bool: Whether any page files were staged.
+    """
+    annotations_path = annotations_path.rstrip('/') + '/'
+    staged = False
+    for path, flags in repo.status().items():
+        if not path.startswith(annotations_path) or not is_page_file_name(os.path.basename(path)):
+            continue
+        if flags & pygit2.enums.FileStatus.WT_DELETED:
+            repo.index.remove(path)
+        elif flags & (pygit2.enums.FileStatus.WT_NEW | pygit2.enums.FileStatus.WT_MODIFIED):
+            repo.index.add(path)
+        else:
+            continue
+        staged = True
+    if staged:
+        repo.index.write()
+    return staged
+
+
+def commit_index(repo: pygit2.Repository, message: str) -> Union[pygit2.Oid, None]:
+    """Commits the index onto HEAD, also if HEAD is detached like in submodules.
+
+    Args:
+        repo (pygit2.Repository): The repository.
+        message (str): The commit message.
+
+    Returns:
+        Union[pygit2.Oid, None]: The ID of the new commit, or `None` if the index doesn't differ from HEAD.
+    """
+    tree_id = repo.index.write_tree()
+    parents = [] if repo.head_is_unborn else [repo.head.target]
+    if parents and repo[parents[0]].peel(pygit2.Commit).tree_id == tree_id:
+        return None
+    signature = get_signature(repo)
+    return repo.create_commit('HEAD', signature, signature, message, tree_id, parents)
+
+
+def get_helper_credentials(url: str, username: str = None) -> pygit2.UserPass:
+    """Returns the user name and password that git's credential helper stores for a remote, e.g. the CATMA access token
+    held by the Git Credential Manager, like `git push` would use them. The helper gets asked once per host and user name,
+    not once per repository, and never prompts on the terminal.
+
+    Args:
+        url (str): The remote URL.
+        username (str, optional): The user name, if the URL doesn't contain it. Defaults to None.
+
+    Raises:
+        AuthenticationError: If git isn't installed or its credential helper has no credentials for the remote.
+
+    Returns:
+        pygit2.UserPass: The credentials.
+    """
+    parsed_url = urllib.parse.urlsplit(url)
+    username = username or parsed_url.username or ''
+    host = parsed_url.netloc.rpartition('@')[2]
+    key = (parsed_url.scheme, host, username)
+
+    with _helper_credentials_lock:
+        if key not in _helper_credentials:
+            if shutil.which('git') is None:
+                raise AuthenticationError(f'No credentials were given for {url} and git is not installed to look them up.')
+            request = f'protocol={parsed_url.scheme}\nhost={host}\n' + (f'username={username}\n' if username else '')
+            result = subprocess.run(
+                ['git', 'credential', 'fill'],
+                input=request + '\n',
+                capture_output=True,
+                text=True,
+                env={**os.environ, 'GIT_TERMINAL_PROMPT': '0'}
+            )
+            fields = dict(line.split('=', 1) for line in result.stdout.splitlines() if '=' in line)
+            if result.returncode != 0 or not fields.get('password'):
+                raise AuthenticationError(
+                    f'No credentials were given for {url} and git\'s credential helper has none stored for {host}.'
+                )
+            _helper_credentials[key] = pygit2.UserPass(fields.get('username', username), fields['password'])
+        return _helper_credentials[key]
+
+
+class PushCallbacks(pygit2.RemoteCallbacks):
+    """Remote callbacks for `push`.
+
+    If no credentials are given, the ones stored by git's credential helper are used for HTTPS remotes, see
+    `get_helper_credentials`, and the SSH agent for SSH remotes. Rejected reference updates raise a `PushRejectedError`,
+    which libgit2 doesn't do on its own.
+
+    Args:
+        credentials (optional): pygit2 credentials, e.g. `pygit2.UserPass`. Defaults to None.
+    """
+    def __init__(self, credentials=None):
+        super().__init__()
+        self._given_credentials = credentials
+        self._credentials_requested = False
+
+    def credentials(self, url: str, username_from_url: str, allowed_types: pygit2.enums.CredentialType):
+        # libgit2 asks again if the remote refused the credentials
+        if self._credentials_requested:
+            raise AuthenticationError(f'The remote {url} refused the credentials.')
+        self._credentials_requested = True
+
+        if self._given_credentials is not None:
+            return self._given_credentials(url, username_from_url, allowed_types)
+        if allowed_types & pygit2.enums.CredentialType.USERPASS_PLAINTEXT:
+            return get_helper_credentials(url, username=username_from_url)
+        if allowed_types & pygit2.enums.CredentialType.SSH_KEY:
+            return pygit2.KeypairFromAgent(username_from_url or 'git')
+        raise AuthenticationError(f'No credentials were given for {url}.')
+
+    def push_update_reference(self, refname: str, message: str) -> None:
+        if message is not None:
+            raise PushRejectedError(f'The remote rejected {refname}: {message}')
+
+
+def push(repo: pygit2.Repository, credentials=None, remote_name: str = 'origin', branch: str = CATMA_BRANCH) -> None:
+    """Pushes HEAD to a branch of a remote, like `git push origin HEAD:master`.
+
+    Without `credentials` the ones stored by git's credential helper are used, see `PushCallbacks`. Only if libgit2
+    can't authenticate or doesn't support the remote's URL, the git command is run instead. Rejected pushes are never
+    pushed again.
+
+    Args:
+        repo (pygit2.Repository): The repository.
+        credentials (optional): pygit2 credentials, e.g. `pygit2.UserPass`. Defaults to None.
+        remote_name (str, optional): The remote. Defaults to 'origin'.
+        branch (str, optional): The remote branch. Defaults to 'master'.
+
+    Raises:
+        PushRejectedError: If the remote rejected the push, e.g. because it isn't a fast-forward.
+        pygit2.GitError: If pushing fails, with libgit2 and, where it is tried, with git.
+    """
+    refspec = f'HEAD:refs/heads/{branch}'
+    try:
+        repo.remotes[remote_name].push([refspec], callbacks=PushCallbacks(credentials=credentials))
+    except PushRejectedError:
+        raise
+    except pygit2.GitError as e:
+        if any(message in str(e) for message in _NON_FAST_FORWARD_MESSAGES):
+            raise PushRejectedError(str(e)) from e
+        if not (isinstance(e, AuthenticationError) or 'unsupported URL protocol' in str(e)) or shutil.which('git') is None:
+            raise
+        result = subprocess.run(['git', 'push', remote_name, refspec], cwd=repo.workdir, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise pygit2.GitError(f'{e}; git push: {result.stderr.strip()}')
+
+
+def commit_and_push_collections(
+        project_path: str,
+        collection_uuids: Iterable[str],
+        message: str,
+        commit_project: bool = True,
+        push_to_remote: bool = True,
+        credentials=None,
+        workers: int = None) -> Dict[str, Union[str, Exception]]:
+    """Commits the changed page files of annotation collections, their submodules in the project and, optionally,
+    the project itself, and pushes the new commits.
+
+    Only the page files in the collections' annotations directories get staged. Submodules are committed and pushed
+    before the project, whose commit records their new commits. The pushes run in a pool of threads.
+
+    Args:
+        project_path (str): The path of the project.
+        collection_uuids (Iterable[str]): The UUIDs of the annotation collections.
+        message (str): The commit message.
+        commit_project (bool, optional): Whether the project's repository gets committed and pushed as well. Defaults to True.
+        push_to_remote (bool, optional): Whether the commits get pushed. Defaults to True.
+        credentials (optional): pygit2 credentials used for all repositories, see `push`. Defaults to None.
+        workers (int, optional): The maximum number of concurrent pushes. If `None` the repositories are pushed\
+            one after another. Defaults to None.
+
+    Raises:
+        FileNotFoundError: If no repository is found at project_path.
+
+    Returns:
+        Dict[str, Union[str, Exception]]: 'pushed', 'committed' or 'up to date' or the raised exception for the working\
+            directory of every repository, the project's last.
+    """
+    project_path = os.path.abspath(project_path)
+    project_repository_path = pygit2.discover_repository(project_path)
+    if project_repository_path is None:
+        raise FileNotFoundError(f'No Git repository found at this path: {project_path}')
+    project_repo = pygit2.Repository(project_repository_path)
+    project_prefix = get_project_prefix(project_repo, project_path)
+
+    results = {}
+    committed_repos = []
+    project_changed = False
+    for uuid in collection_uuids:
+        collection_path = f'{project_path}/collections/{uuid}'
+        repo = pygit2.Repository(pygit2.discover_repository(collection_path))
+        if os.path.abspath(repo.workdir) == os.path.abspath(project_repo.workdir):
+            # the collection is part of the project's repository, not a submodule
+            project_changed |= stage_page_files(project_repo, f'{project_prefix}collections/{uuid}/annotations')
+            continue
+
+        try:
+            stage_page_files(repo, 'annotations')
+            committed = commit_index(repo, message) is not None
+        except pygit2.GitError as e:
+            results[repo.workdir] = e
+            continue
+        results[repo.workdir] = 'committed' if committed else 'up to date'
+        if committed:
+            committed_repos.append(repo)
+            if commit_project:
+                project_repo.index.add(f'{project_prefix}collections/{uuid}')
+                project_changed = True
+
+    if project_changed:
+        project_repo.index.write()
+        if commit_index(project_repo, message) is not None:
+            results[project_repo.workdir] = 'committed'
+
+    if push_to_remote:
+        def run(repo: pygit2.Repository) -> Union[str, Exception]:
+            try:
+                push(repo, credentials=credentials)
+                return 'pushed'
+            except pygit2.GitError as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=workers or 1) as executor:
+            for repo, result in zip(committed_repos, executor.map(run, committed_repos)):
+                results[repo.workdir] = result
+        # the project's commit refers to the submodule commits, so it only gets pushed if they were
+        if results.get(project_repo.workdir) == 'committed' and all(
+                results[repo.workdir] == 'pushed' for repo in committed_repos):
+            results[project_repo.workdir] = run(project_repo)
+
+    return results
+
+
+class GitStorage:
+    """Reads the files of a CATMA project from the Git object database of its repository at a given commit,
+    without a checked out working tree. This works for bare repositories like mirrors, too.
+
+    Submodules are read from the commits recorded in the trees. Their repositories are looked up in the `modules` directory
+    of the Git directory, where `git submodule update` puts them, and at the submodule URL if it is a local path.
+    Relative URLs of submodules of bare repositories are resolved against the repository's directory, so that mirrors
+    of a project and its submodules can be placed side by side.
+
+    Paths are given like for the file system and interpreted relative to the current working directory,
+    they have to point into the project directory.
+
+    Args:
+        project_path (str): The path of the project, the repository or a subdirectory of its working tree.
+        ref (str, optional): The commit, branch or tag to read the project from. Defaults to 'HEAD'.
+
+    Raises:
+        FileNotFoundError: If no repository is found at project_path.
+        KeyError: If the ref can't be resolved.
+    """
+    def __init__(self, project_path: str, ref: str = 'HEAD'):
+        #: The absolute path of the project.
+        self.project_path: str = os.path.abspath(project_path)
+
+        repository_path = pygit2.discover_repository(self.project_path)
+        if repository_path is None:
+            raise FileNotFoundError(f'No Git repository found at this path: {self.project_path}')
+
+        #: The repository the project is read from.
+        self.repository: pygit2.Repository = pygit2.Repository(repository_path)
+
+        if self.repository.is_bare:
+            project_prefix = os.path.relpath(self.project_path, os.path.abspath(self.repository.path)).replace('\\', '/')
+            project_prefix = '' if project_prefix == '.' else f'{project_prefix}/'
+        else:
+            project_prefix = get_project_prefix(self.repository, self.project_path)
+
+        #: The path of the project within the repository with a trailing slash, or an empty string.
+        self.project_prefix: str = project_prefix
+
+        #: The ref the project is read from.
+        self.ref: str = ref
+
+        #: The ID of the commit the project is read from.
+        self.commit_id: str = None
+
+        self._submodule_repos: Dict[str, pygit2.Repository] = {}
+        self._directories: Dict[tuple, tuple] = {}
+        self.checkout(ref)
+
+    def __repr__(self):
+        return f'GitStorage(Path: {self.project_path}, Ref: {self.ref}, Commit: {self.commit_id})'
+
+    def __getstate__(self) -> dict:
+        # repositories can't be pickled, e.g. to send the storage to worker processes, they get opened again
+        return {'project_path': self.project_path, 'ref': self.ref, 'commit_id': self.commit_id}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(project_path=state['project_path'], ref=state['commit_id'])
+        self.ref = state['ref']
+
+    def checkout(self, ref: str) -> None:
+        """Points the storage at another commit, e.g. after new commits have been fetched.
+
+        Args:
+            ref (str): The commit, branch or tag.
+
+        Raises:
+            KeyError: If the ref can't be resolved.
+        """
+        commit = self.repository.revparse_single(ref).peel(pygit2.Commit)
+        self.ref = ref
+        self.commit_id = str(commit.id)
+        self._directories = {(): (self.repository, commit.tree, (), commit.tree)}
+
+    def _get_path_parts(self, path: str) -> tuple:
+        relative_path = os.path.relpath(os.path.abspath(path), self.project_path).replace('\\', '/')
+        if relative_path == '..' or relative_path.startswith('../'):
+            raise FileNotFoundError(f'The path is not within the project {self.project_path}: {path}')
+        path = self.project_prefix + ('' if relative_path == '.' else relative_path)
+        return tuple(part for part in path.split('/') if part)
+
+    def _open_submodule(
+            self,
+            repo: pygit2.Repository,
+            root_tree: pygit2.Tree,
+            submodule_path: str,
+            commit_id: pygit2.Oid) -> pygit2.Repository:
+        # finds a repository that contains the commit of a submodule
+        try:
+            submodules = parse_gitmodules(root_tree['.gitmodules'].data)
+        except KeyError:
+            submodules = {}
+        name, url = submodules.get(submodule_path, (submodule_path, None))
+
+        candidates = [os.path.join(repo.path, 'modules', name)]
+        if url and (url.startswith('./') or url.startswith('../')):
+            base_path = repo.path if repo.is_bare else repo.workdir
+            candidates.append(os.path.normpath(os.path.join(base_path.rstrip('/\\'), url)))
+        elif url and os.path.isdir(url):
+            candidates.append(url)
+
+        for candidate in candidates:
+            candidate = os.path.abspath(candidate)
+            if candidate not in self._submodule_repos:
+                try:
+                    self._submodule_repos[candidate] = pygit2.Repository(candidate)
+                except pygit2.GitError:
+                    continue
+            if commit_id in self._submodule_repos[candidate]:
+                return self._submodule_repos[candidate]
+
+        # some mirrors fetch the submodule commits into the superproject
+        if commit_id in repo:
+            return repo
+
+        raise FileNotFoundError(
+            f'The commit {commit_id} of the submodule "{submodule_path}" could not be found in any of these repositories: '
+            f'{candidates}')
+
+    def _get_directory(self, path_parts: tuple) -> tuple:
+        # returns the repository, its root tree, the path within it and the tree of a directory, descending into submodules
+        if path_parts in self._directories:
+            return self._directories[path_parts]
+
+        repo, root_tree, repo_path_parts, parent_tree = self._get_directory(path_parts[:-1])
+        try:
+            entry = parent_tree[path_parts[-1]]
+        except KeyError:
+            raise FileNotFoundError(f'No such directory in commit {self.commit_id}: {"/".join(path_parts)}')
+
+        if entry.filemode == GIT_FILEMODE_COMMIT:
+            repo = self._open_submodule(
+                repo=repo,
+                root_tree=root_tree,
+                submodule_path='/'.join(repo_path_parts + path_parts[-1:]),
+                commit_id=entry.id
+            )
+            root_tree = repo[entry.id].peel(pygit2.Tree)
+            directory = (repo, root_tree, (), root_tree)
+        elif entry.type_str == 'tree':
+            directory = (repo, root_tree, repo_path_parts + path_parts[-1:], repo[entry.id])
+        else:
+            raise FileNotFoundError(f'Not a directory in commit {self.commit_id}: {"/".join(path_parts)}')
+
+        self._directories[path_parts] = directory
+        return directory
+
+    def read_bytes(self, path: str) -> bytes:
+        """Returns the content of a file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist in the commit.
+        """
+        path_parts = self._get_path_parts(path)
+        if not path_parts:
+            raise FileNotFoundError(f'Not a file: {path}')
+        tree = self._get_directory(path_parts[:-1])[3]
+        try:
+            entry = tree[path_parts[-1]]
+        except KeyError:
+            raise FileNotFoundError(f'No such file in commit {self.commit_id}: {"/".join(path_parts)}')
+        if entry.type_str != 'blob':
+            raise FileNotFoundError(f'Not a file in commit {self.commit_id}: {"/".join(path_parts)}')
+        return entry.data
+
+    def listdir(self, path: str) -> List[str]:
+        """Returns the names of the entries of a directory."""
+        return [entry.name for entry in self._get_directory(self._get_path_parts(path))[3]]
+
+    def isdir(self, path: str) -> bool:
+        try:
+            self._get_directory(self._get_path_parts(path))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def isfile(self, path: str) -> bool:
+        try:
+            path_parts = self._get_path_parts(path)
+            return bool(path_parts) and self._get_directory(path_parts[:-1])[3][path_parts[-1]].type_str == 'blob'
+        except (FileNotFoundError, KeyError):
+            return False
+
+    def walk(self, path: str) -> Generator[Tuple[str, List[str], List[str]], None, None]:
+        """Walks a directory tree like `os.walk`, top-down."""
+        tree = self._get_directory(self._get_path_parts(path))[3]
+        dirnames = [
+            entry.name for entry in tree
+            if entry.type_str == 'tree' or entry.filemode == GIT_FILEMODE_COMMIT
+        ]
+        filenames = [entry.name for entry in tree if entry.type_str == 'blob']
+        yield path, dirnames, filenames
+        for dirname in dirnames:
+            yield from self.walk(os.path.join(path, dirname))
@@ -1,9 +1,10 @@
 import os
-import subprocess
 import textwrap
 from typing import List, Union
 from gitma.annotation import Annotation, get_annotation_segments
-from gitma._metrics import test_overlap, test_max_overlap, get_overlap_percentage
+from gitma._metrics import test_max_overlap, get_overlap_percentage, get_overlapping_annotations
+from gitma._page_files import PageFileTransaction, is_page_file_name
+from gitma._write_annotation import write_annotations
 
 
 def compare_annotations(
@@ -46,6 +47,37 @@ def compare_annotations(
         return False
 
 
+def _clear_gold_annotation_collection(project, gold_ac_name: str) -> str:
+    # removes all page files in the gold annotation collection to prevent double gold annotations, returns its UUID
+    gold_uuid = project.ac_dict[gold_ac_name].uuid
+    annotations_directory = f'{project.project_path}/collections/{gold_uuid}/annotations/'
+
+    if not os.path.isdir(annotations_directory):
+        os.mkdir(annotations_directory)
+    else:
+        with PageFileTransaction(annotations_directory):
+            for f in os.listdir(annotations_directory):
+                if is_page_file_name(f):
+                    os.remove(f'{annotations_directory}{f}')
+
+    return gold_uuid
+
+
+def _push_gold_annotations(project, gold_uuid: str) -> None:
+    # upload gold annotations via git
+    from gitma._git import commit_and_push_collections
+
+    results = commit_and_push_collections(
+        project_path=project.project_path,
+        collection_uuids=[gold_uuid],
+        message='new gold annotations',
+        commit_project=False
+    )
+    for result in results.values():
+        if isinstance(result, Exception):
+            print(f'WARNING: Failed to push the gold annotations: {result}')
+
+
 def create_gold_annotations(
         project,
         ac_1_name: str,
@@ -74,34 +106,17 @@ def create_gold_annotations(
 
     if excluded_tags is None:
         excluded_tags = []
-        
-    cwd = os.getcwd()
 
     ac1 = project.ac_dict[ac_1_name]
     ac2 = project.ac_dict[ac_2_name]
 
-    gold_uuid = project.ac_dict[gold_ac_name].uuid
+    gold_uuid = _clear_gold_annotation_collection(project, gold_ac_name)
 
-    if not os.path.isdir(f'{project.projects_directory}{project.uuid}/collections/{gold_uuid}/annotations/'):
-        os.mkdir(f'{project.projects_directory}{project.uuid}/collections/{gold_uuid}/annotations/')
-    else:
-        for f in os.listdir(f'{project.projects_directory}{project.uuid}/collections/{gold_uuid}/annotations/'):
-            # removes all files in gold annotation collection to prevent double gold annotations:
-            os.remove(f'{project.projects_directory}{project.uuid}/collections/{gold_uuid}/annotations/{f}')
-
-    al1 = [an for an in ac1.annotations if an not in excluded_tags]
-    al2 = [an for an in ac2.annotations if an not in excluded_tags]
-
-    copied_annotations = 0
-    for an in al1:
-        # get all overlapping annotations
-        overlapping_annotations = [
-            a for a in al2 if test_overlap(
-                an1=an,
-                an2=a
-            )
-        ]
+    al1 = [an for an in ac1.annotations if an.tag.name not in excluded_tags]
+    al2 = [an for an in ac2.annotations if an.tag.name not in excluded_tags]
 
+    gold_annotations = []
+    for an, overlapping_annotations in zip(al1, get_overlapping_annotations(al1, al2)):
         # test if any annotation from ac2 matches the annotation from ac1
         if len(overlapping_annotations) > 0:
             an2 = compare_annotations(
@@ -114,27 +129,124 @@ def create_gold_annotations(
             # get best matching annotation and compare tag
             compare_annotation = an2 if copy_property_values_if_equal else None
             if an2:
-                copied_annotations += 1
-
                 # copy annotation
-                an.copy(
+                gold_annotations.append(an._get_copy_parameters(
                     annotation_collection_name=gold_ac_name,
-                    compare_annotation=compare_annotation
-                )
+                    compare_annotation=compare_annotation,
+                    text_title=ac1.text.title
+                ))
+
+    write_annotations(project, gold_annotations)
 
     if push_to_gitlab:
-        # upload gold annotations via git
-        os.chdir(f'{project.projects_directory}{project.uuid}/collections/{gold_uuid}')
-        subprocess.run(['git', 'add', '.'])
-        subprocess.run(['git', 'commit', '-m', 'new gold annotations'])
-        subprocess.run(['git', 'push', 'origin', 'HEAD:master'])
+        _push_gold_annotations(project, gold_uuid)
 
     print(textwrap.dedent(
         f"""
             Found {len(al1)} annotations in annotation collection: '{ac_1_name}'.
             Found {len(al2)} annotations in annotation collection: '{ac_2_name}'.
             -------------
-            Wrote {copied_annotations} gold annotations into annotation collection '{gold_ac_name}'.
+            Wrote {len(gold_annotations)} gold annotations into annotation collection '{gold_ac_name}'.
+        """
+    ))
+
+
+def create_majority_vote_annotations(
+        project,
+        ac_names: List[str],
+        gold_ac_name: str,
+        min_votes: int = None,
+        excluded_tags: List[str] = None,
+        min_overlap: float = 1.0,
+        same_tag: bool = True,
+        copy_property_values_if_equal: bool = True,
+        push_to_gitlab: bool = False) -> None:
+    """Searches for annotations that match in at least `min_votes` of the given annotation collections and copies them into
+    another annotation collection.
+
+    An annotation and the best matching annotation from each of the other collections, as found by `compare_annotations`,
+    count as one vote each. Every group of matching annotations is copied once, taking the annotation from the collection
+    that comes first in `ac_names`. By default, property values are copied when they are exactly the same for all
+    matching annotations.
+
+    Args:
+        project (CatmaProject): A `CatmaProject` object.
+        ac_names (List[str]): The names of the annotation collections that vote.
+        gold_ac_name (str): The name of the annotation collection, into which gold annotations will be written.
+        min_votes (int, optional): The number of collections that have to agree on an annotation. Defaults to `None`, which\
+            means more than half of the collections.
+        excluded_tags (list, optional): Annotations with these tags will not be included in the gold annotations. Defaults to `None`.
+        min_overlap (float, optional): The minimal overlap for annotations to match. Defaults to 1.0.
+        same_tag (bool, optional): Whether matching annotations have to use the same tag. Defaults to `True`.
+        copy_property_values_if_equal (bool, optional): Whether property values should be copied when they are exactly the same for all\
+            matching annotations. Defaults to `True`. If `False` or property values are not exactly the same, no property values are copied.
+        push_to_gitlab (bool, optional): Whether the gold annotations should be uploaded to the CATMA GitLab backend. Defaults to `False`.
+    """
+
+    if excluded_tags is None:
+        excluded_tags = []
+
+    if min_votes is None:
+        min_votes = len(ac_names) // 2 + 1
+
+    acs = [project.ac_dict[ac_name] for ac_name in ac_names]
+
+    gold_uuid = _clear_gold_annotation_collection(project, gold_ac_name)
+
+    annotation_lists = [[an for an in ac.annotations if an.tag.name not in excluded_tags] for ac in acs]
+
+    # the annotations of the groups that were copied, by id as annotations are not hashable
+    grouped_annotations = set()
+    gold_annotations = []
+    for index, (ac, al) in enumerate(zip(acs, annotation_lists)):
+        overlapping_annotation_lists = [
+            get_overlapping_annotations(al, other_al)
+            for other_index, other_al in enumerate(annotation_lists) if other_index != index
+        ]
+
+        for an_index, an in enumerate(al):
+            if id(an) in grouped_annotations:
+                continue
+
+            matching_annotations = []
+            for overlapping_annotations in overlapping_annotation_lists:
+                if len(overlapping_annotations[an_index]) > 0:
+                    matching_annotation = compare_annotations(
+                        an1=an,
+                        al2=overlapping_annotations[an_index],
+                        min_overlap=min_overlap,
+                        same_tag=same_tag
+                    )
+                    if matching_annotation:
+                        matching_annotations.append(matching_annotation)
+
+            # the group was copied already, from another annotation
+            if any(id(matching_annotation) in grouped_annotations for matching_annotation in matching_annotations):
+                continue
+
+            if len(matching_annotations) + 1 >= min_votes:
+                grouped_annotations.add(id(an))
+                grouped_annotations.update(id(matching_annotation) for matching_annotation in matching_annotations)
+
+                gold_annotation = an._get_copy_parameters(
+                    annotation_collection_name=gold_ac_name,
+                    compare_annotation=(matching_annotations[0] if matching_annotations else an) if copy_property_values_if_equal else None,
+                    text_title=ac.text.title
+                )
+                for property_name, values in gold_annotation['property_annotations'].items():
+                    if any(values != matching_annotation.properties.get(property_name, []) for matching_annotation in matching_annotations):
+                        gold_annotation['property_annotations'][property_name] = []
+                gold_annotations.append(gold_annotation)
+
+    write_annotations(project, gold_annotations)
+
+    if push_to_gitlab:
+        _push_gold_annotations(project, gold_uuid)
+
+    print(textwrap.dedent(
+        f"""
+            Found {sum(len(al) for al in annotation_lists)} annotations in {len(acs)} annotation collections.
+            -------------
+            Wrote {len(gold_annotations)} gold annotations with at least {min_votes} votes into annotation collection '{gold_ac_name}'.
         """
     ))
-    os.chdir(cwd)
@@ -0,0 +1,153 @@
+"""
+Pluggable JSON codec used to read and write the JSON files of CATMA projects.
+
+By default the fastest installed backend is used: [orjson](https://github.com/ijl/orjson),
+[pysimdjson](https://github.com/TkTech/pysimdjson) or the `json` module of the standard library.
+The backend can be chosen with the environment variable `GITMA_JSON_BACKEND` or with `set_json_backend`.
+"""
+import json
+import os
+from typing import Any, BinaryIO, List, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+
+#: Raised if a JSON document can't be decoded, regardless of the backend.
+JSONDecodeError = json.JSONDecodeError
+
+# largest integer orjson serializes
+_MAX_ORJSON_INT = 2 ** 64 - 1
+_MIN_ORJSON_INT = -2 ** 63
+
+
+def get_available_json_backends() -> List[str]:
+    """Returns the names of the installed JSON backends, the fastest first.
+
+    Returns:
+        List[str]: Backend names out of 'orjson', 'simdjson' and 'json'.
+    """
+    backends = []
+    if orjson is not None:
+        backends.append('orjson')
+    if simdjson is not None:
+        backends.append('simdjson')
+    backends.append('json')
+    return backends
+
+
+def set_json_backend(backend: Union[str, None] = None) -> None:
+    """Selects the JSON backend used by GitMA.
+
+    Args:
+        backend (Union[str, None], optional): 'orjson', 'simdjson' or 'json'. If `None` the fastest installed backend\
+            gets used. Defaults to None.
+
+    Raises:
+        ValueError: If the backend is unknown or not installed.
+    """
+    global _backend
+
+    available_backends = get_available_json_backends()
+    if backend is None:
+        backend = available_backends[0]
+    elif backend not in available_backends:
+        raise ValueError(
+            f'The JSON backend "{backend}" is not available. Available backends: {", ".join(available_backends)}'
+        )
+    _backend = backend
+
+
+def get_json_backend() -> str:
+    """Returns the name of the JSON backend currently used by GitMA.
+
+    Returns:
+        str: 'orjson', 'simdjson' or 'json'.
+    """
+    return _backend
+
+
+def loads(document: Union[bytes, str]) -> Any:
+    """Decodes a JSON document.
+
+    Args:
+        document (Union[bytes, str]): The JSON document, UTF-8 encoded if given as bytes.
+
+    Raises:
+        JSONDecodeError: If the document isn't valid JSON.
+
+    Returns:
+        Any: The decoded Python object.
+    """
+    if _backend == 'orjson':
+        # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+        return orjson.loads(document)
+    if _backend == 'simdjson':
+        try:
+            return simdjson.loads(document)
+        except ValueError as e:
+            raise JSONDecodeError(str(e), document if isinstance(document, str) else '', 0) from e
+    return json.loads(document)
+
+
+def load(file: BinaryIO) -> Any:
+    """Decodes the JSON document in a file, preferably opened in binary mode.
+
+    Args:
+        file (BinaryIO): The file object.
+
+    Raises:
+        JSONDecodeError: If the file content isn't valid JSON.
+
+    Returns:
+        Any: The decoded Python object.
+    """
+    return loads(file.read())
+
+
+def _is_orjson_compatible(obj: Any) -> bool:
+    # whether orjson serializes obj exactly like the json module, apart from non-ASCII characters
+    if isinstance(obj, str) or obj is None or isinstance(obj, bool):
+        return True
+    if isinstance(obj, int):
+        return _MIN_ORJSON_INT <= obj <= _MAX_ORJSON_INT
+    if isinstance(obj, list):
+        return all(_is_orjson_compatible(item) for item in obj)
+    if isinstance(obj, dict):
+        return all(
+            type(key) is str and _is_orjson_compatible(value) for key, value in obj.items()
+        )
+    # floats are formatted differently, tuples and other types are left to the json module
+    return False
+
+
+def dumps(obj: Any, indent: Union[int, None] = None) -> str:
+    """Encodes a Python object as JSON.
+
+    The output is always identical to `json.dumps(obj, indent=indent)`, so that files written by GitMA don't depend on
+    the installed backend. orjson is only used for indented output of objects that it serializes the same way.
+
+    Args:
+        obj (Any): The Python object.
+        indent (Union[int, None], optional): Indentation like in `json.dumps`. Defaults to None.
+
+    Returns:
+        str: The JSON document.
+    """
+    if _backend == 'orjson' and indent == 2 and _is_orjson_compatible(obj):
+        document = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        if document.isascii():
+            # the json module escapes non-ASCII characters
+            return document.decode('ascii')
+    return json.dumps(obj, indent=indent)
+
+
+_backend: str = None
+set_json_backend(os.environ.get('GITMA_JSON_BACKEND') or None)
@@ -1,3 +1,4 @@
+import heapq
 import os
 import numpy as np
 import pandas as pd
@@ -106,6 +107,168 @@ def test_overlap(an1: Annotation, an2: Annotation) -> bool:
         return True
 
 
+def get_overlapping_index_pairs(
+        annotation_list1: List[Annotation],
+        annotation_list2: List[Annotation]) -> Tuple[np.ndarray, np.ndarray]:
+    """Finds all pairs of annotations from two lists that overlap according to `test_overlap`, see `get_overlapping_span_pairs`.
+
+    Args:
+        annotation_list1 (List[Annotation]): The first annotations.
+        annotation_list2 (List[Annotation]): The second annotations.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The indices of the overlapping annotations in the first and in the second list,\
+            sorted by the first and then by the second indices.
+    """
+    return get_overlapping_span_pairs(*_get_span_arrays(annotation_list1), *_get_span_arrays(annotation_list2))
+
+
+def get_overlapping_span_pairs(
+        start_points1: np.ndarray,
+        end_points1: np.ndarray,
+        start_points2: np.ndarray,
+        end_points2: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Finds all pairs of spans from two sets of spans that overlap according to `test_overlap`, e.g. the spans of the
+    annotations of two annotation collections as given by `AnnotationCollection.columns`.
+
+    Both sets get swept once in the order of their start points, so the time needed grows with the number of
+    spans and overlapping pairs instead of with the product of the numbers of spans.
+
+    Args:
+        start_points1 (np.ndarray): The start points of the first spans.
+        end_points1 (np.ndarray): The end points of the first spans.
+        start_points2 (np.ndarray): The start points of the second spans.
+        end_points2 (np.ndarray): The end points of the second spans.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The indices of the overlapping spans in the first and in the second spans,\
+            sorted by the first and then by the second indices.
+    """
+    start_points = (start_points1.tolist(), start_points2.tolist())
+    end_points = (end_points1.tolist(), end_points2.tolist())
+
+    # start events, at equal start points the span processed second finds the first one among the active ones
+    events = sorted(
+        [(start_point, 0, index) for index, start_point in enumerate(start_points[0])]
+        + [(start_point, 1, index) for index, start_point in enumerate(start_points[1])]
+    )
+
+    # the spans that have started but not ended yet, with heaps of their end points to drop them
+    active = ({}, {})
+    ends = ([], [])
+    indices1 = []
+    indices2 = []
+
+    for start_point, side, index in events:
+        other_side = 1 - side
+        while ends[other_side] and ends[other_side][0][0] < start_point:
+            active[other_side].pop(heapq.heappop(ends[other_side])[1])
+
+        if side == 0:
+            indices1.extend([index] * len(active[1]))
+            indices2.extend(active[1])
+        else:
+            indices1.extend(active[0])
+            indices2.extend([index] * len(active[0]))
+
+        active[side][index] = None
+        heapq.heappush(ends[side], (end_points[side][index], index))
+
+    indices1 = np.array(indices1, dtype=np.int64)
+    indices2 = np.array(indices2, dtype=np.int64)
+
+    # the sweep finds all pairs whose spans touch, the conditions of test_overlap decide about the boundary cases
+    start1, end1 = start_points1[indices1], end_points1[indices1]
+    start2, end2 = start_points2[indices2], end_points2[indices2]
+    overlapping = (
+        ((start1 <= start2) & (start2 < end1))
+        | ((start1 < end2) & (end2 <= end1))
+        | ((start2 < start1) & (end2 > end1))
+    )
+    indices1, indices2 = indices1[overlapping], indices2[overlapping]
+
+    order = np.lexsort((indices2, indices1))
+    return indices1[order], indices2[order]
+
+
+def _get_span_arrays(annotation_list: List[Annotation]) -> Tuple[np.ndarray, np.ndarray]:
+    return (
+        np.array([an.start_point for an in annotation_list], dtype=np.int64),
+        np.array([an.end_point for an in annotation_list], dtype=np.int64)
+    )
+
+
+def get_overlapping_annotations(
+        annotation_list1: List[Annotation],
+        annotation_list2: List[Annotation]) -> List[List[Annotation]]:
+    """For each annotation in `annotation_list1`, finds the annotations in `annotation_list2` that overlap with it
+    according to `test_overlap`, see `get_overlapping_index_pairs`.
+
+    Args:
+        annotation_list1 (List[Annotation]): The annotations to find overlapping annotations for.
+        annotation_list2 (List[Annotation]): The annotations to search.
+
+    Returns:
+        List[List[Annotation]]: The overlapping annotations for each annotation in `annotation_list1`, in the order of\
+            `annotation_list2`.
+    """
+    overlapping_annotations = [[] for _ in annotation_list1]
+    for index1, index2 in zip(*get_overlapping_index_pairs(annotation_list1, annotation_list2)):
+        overlapping_annotations[index1].append(annotation_list2[index2])
+    return overlapping_annotations
+
+
+def get_best_overlapping_annotations(
+        annotation_list1: List[Annotation],
+        annotation_list2: List[Annotation]) -> List[Union[Annotation, None]]:
+    """For each annotation in `annotation_list1`, finds the best matching overlapping annotation in `annotation_list2`,
+    like `test_max_overlap` does for the annotations found by `test_overlap`, see `get_best_overlapping_spans`.
+
+    Args:
+        annotation_list1 (List[Annotation]): The annotations to find matching annotations for.
+        annotation_list2 (List[Annotation]): The annotations to search.
+
+    Returns:
+        List[Union[Annotation, None]]: The best matching annotation for each annotation in `annotation_list1`, or `None`\
+            if no annotation overlaps with it.
+    """
+    best_indices = get_best_overlapping_spans(*_get_span_arrays(annotation_list1), *_get_span_arrays(annotation_list2))
+    return [annotation_list2[index] if index >= 0 else None for index in best_indices.tolist()]
+
+
+def get_best_overlapping_spans(
+        start_points1: np.ndarray,
+        end_points1: np.ndarray,
+        start_points2: np.ndarray,
+        end_points2: np.ndarray) -> np.ndarray:
+    """For each of the first spans, finds the best matching overlapping span among the second spans, like
+    `test_max_overlap` does for the annotations found by `test_overlap`, but scoring all candidates at once.
+
+    Args:
+        start_points1 (np.ndarray): The start points of the spans to find matching spans for.
+        end_points1 (np.ndarray): The end points of the spans to find matching spans for.
+        start_points2 (np.ndarray): The start points of the spans to search.
+        end_points2 (np.ndarray): The end points of the spans to search.
+
+    Returns:
+        np.ndarray: The index of the best matching second span for each first span, or -1 if no second span overlaps with it.
+    """
+    indices1, indices2 = get_overlapping_span_pairs(start_points1, end_points1, start_points2, end_points2)
+    best_indices = np.full(len(start_points1), -1, dtype=np.int64)
+    if len(indices1) == 0:
+        return best_indices
+
+    sum_span = (
+        np.abs(start_points2[indices2] - start_points1[indices1]) + np.abs(end_points2[indices2] - end_points1[indices1])
+    )
+
+    # the minimal sum span for each span, the first one in the order of the second spans like list.index
+    order = np.lexsort((indices2, sum_span, indices1))
+    _, first_positions = np.unique(indices1[order], return_index=True)
+    best_indices[indices1[order[first_positions]]] = indices2[order[first_positions]]
+    return best_indices
+
+
 def get_overlap_percentage(an_pair: List[Annotation]) -> float:
     """Computes the overlap percentage of two annotations by averaging
     the overlapping proportion of both annotation spans.
@@ -217,34 +380,47 @@ def get_annotation_pairs(
     Returns:
         List[Union[Tuple[Annotation, EmptyAnnotation], Tuple[Annotation, Annotation]]]: List of paired annotation tuples.
     """
-    ac1_annotations, ac2_annotations = filter_ac_by_tag(ac1=ac1, ac2=ac2, tag_filter=tag_filter,
-                                                        filter_both_ac=filter_both_ac)
-    ac1_annotations, ac2_annotations = get_same_text(
-        ac1_annotations, ac2_annotations)
+    # the annotations are selected on the collections' columns, like filter_ac_by_tag and get_same_text do on the objects
+    columns1, columns2 = ac1.columns, ac2.columns
+    indices1, indices2 = np.arange(len(columns1)), np.arange(len(columns2))
+    if tag_filter:
+        tag_uuids = {
+            tag.id for tagset in ac1._catma_project.tagsets for tag in tagset.tags if tag.name in tag_filter
+        }
+        indices1 = np.flatnonzero(ac1._get_tag_mask(tag_uuids))
+        if filter_both_ac:
+            indices2 = np.flatnonzero(ac2._get_tag_mask(tag_uuids))
+    start_points1, end_points1 = columns1.start_points[indices1], columns1.end_points[indices1]
+    start_points2, end_points2 = columns2.start_points[indices2], columns2.end_points[indices2]
+    same_text1 = start_points1 <= start_points2[-1]
+    same_text2 = start_points2 <= end_points1[-1]
+    indices1, indices2 = indices1[same_text1], indices2[same_text2]
+
+    ac1_annotations = [ac1.annotations[index] for index in indices1.tolist()]
+    ac2_annotations = [ac2.annotations[index] for index in indices2.tolist()]
 
     # removes all annotations without the given property
     if property_filter:
-        ac1_annotations = [
-            an for an in ac1_annotations
-            if property_filter in an.properties             # test if property exists
-            and len(an.properties[property_filter]) > 0     # test if property has values
-        ]
-        ac2_annotations = [
-            an for an in ac2_annotations
-            if property_filter in an.properties             # test if property exists
-            and len(an.properties[property_filter]) > 0     # test if property has values
-        ]
+        def has_property(an: Annotation) -> bool:
+            return property_filter in an.properties and len(an.properties[property_filter]) > 0
+
+        has_property1 = np.array([has_property(an) for an in ac1_annotations], dtype=bool)
+        has_property2 = np.array([has_property(an) for an in ac2_annotations], dtype=bool)
+        indices1, indices2 = indices1[has_property1], indices2[has_property2]
+        ac1_annotations = [ac1.annotations[index] for index in indices1.tolist()]
+        ac2_annotations = [ac2.annotations[index] for index in indices2.tolist()]
 
     pair_list = []
     missing_an2_annotations = 0
 
-    for an1 in ac1_annotations:
-        # collect all overlapping annotations
-        overlapping_annotations = [
-            an2 for an2 in ac2_annotations if test_overlap(an1, an2)]
-
+    best_indices = get_best_overlapping_spans(
+        columns1.start_points[indices1], columns1.end_points[indices1],
+        columns2.start_points[indices2], columns2.end_points[indices2]
+    )
+    best_matching_annotations = [ac2_annotations[index] if index >= 0 else None for index in best_indices.tolist()]
+    for an1, best_matching_annotation in zip(ac1_annotations, best_matching_annotations):
         # test if any overlapping annotations were found in ac2_annotations
-        if len(overlapping_annotations) < 1:
+        if best_matching_annotation is None:
             missing_an2_annotations += 1
             pair_list.append(
                 (
@@ -257,10 +433,6 @@ def get_annotation_pairs(
                 )
             )
         else:
-            best_matching_annotation = test_max_overlap(
-                silver_annotation=an1,
-                second_annotator_annotations=overlapping_annotations
-            )
             pair_list.append(
                 (an1, best_matching_annotation)
             )
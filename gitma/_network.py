@@ -4,7 +4,8 @@ import plotly.graph_objects as go
 from typing import List, Dict
 from dataclasses import dataclass
 from IPython.display import display
-from gitma.annotation_collection import AnnotationCollection, duplicate_rows
+from gitma.annotation_collection import AnnotationCollection
+from gitma._vizualize import duplicate_rows
 
 
 # define CATMA related 
@@ -86,7 +87,8 @@ def cooccurrent_annotations(
             (ac_df['document'] == row['document'])
         ].copy()
 
-        tag_count = dict(filtered_df[level].value_counts())
+        # only the observed values, categorical columns also count the categories that were filtered out
+        tag_count = dict(filtered_df[level].value_counts()[lambda counts: counts > 0])
 
         for tag in tag_count:
             tag_dict[row[level]][tag] += tag_count[tag]
@@ -150,7 +152,8 @@ def overlapping_annotations(
                 filtered_df['annotation collection'] != row['annotation collection']
             ]
 
-        tag_count = dict(filtered_df[level].value_counts())
+        # only the observed values, categorical columns also count the categories that were filtered out
+        tag_count = dict(filtered_df[level].value_counts()[lambda counts: counts > 0])
 
         for tag in tag_count:
             tag_dict[row[level]][tag] += tag_count[tag]
@@ -0,0 +1,192 @@
+"""
+Crash-safe and concurrent-writer-safe changes to the annotation page files of annotation collections.
+
+All writes to the page files of an annotation collection happen within a `PageFileTransaction`, which holds an exclusive
+advisory lock on the annotations directory, so that several processes and threads can write to one project at the same time.
+Page files are either rewritten atomically with `write_file_atomically`, or patched in place after their original bytes have
+been recorded in a journal file. The changes recorded in a journal that is left behind by an interrupted write are rolled
+back by the next transaction on the directory or by `CatmaProject.recover`. Loading page files never changes them, it only
+warns about a journal, see `warn_about_journal`.
+
+The journal and temporary files are hidden files in the annotations directory, files starting with a dot are never page files.
+"""
+import base64
+import os
+import tempfile
+from typing import List
+
+from gitma import _json
+
+try:
+    import fcntl
+except ImportError:
+    # not available on Windows, page files are written without locking there
+    fcntl = None
+
+
+# the journal of the in-place changes of the current transaction, in the annotations directory
+JOURNAL_FILE_NAME = '.gitma_journal.json'
+
+
+def is_page_file_name(file_name: str) -> bool:
+    """Tests whether a file in an annotations directory is a page file, as opposed to a journal or temporary file."""
+    return not file_name.startswith('.')
+
+
+def write_file_atomically(file_path: str, content: bytes) -> None:
+    """Writes a file by writing a temporary file in the same directory and renaming it,
+    so that the file is never left half-written, e.g. if the process gets killed.
+
+    Args:
+        file_path (str): The path of the file.
+        content (bytes): The new content.
+    """
+    directory, file_name = os.path.split(os.path.abspath(file_path))
+    file_descriptor, temp_file_path = tempfile.mkstemp(dir=directory, prefix=f'.{file_name}.', suffix='.tmp')
+    try:
+        with os.fdopen(file_descriptor, 'wb') as temp_file:
+            temp_file.write(content)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        os.replace(temp_file_path, file_path)
+    except BaseException:
+        os.remove(temp_file_path)
+        raise
+
+
+def warn_about_journal(annotations_directory: str, storage) -> None:
+    """Prints a warning if an interrupted write left a journal in an annotations directory, as its page files may be
+    partly written. Loading doesn't roll the changes back, so that reading a project never takes locks or changes files.
+
+    Args:
+        annotations_directory (str): The annotations directory of an annotation collection.
+        storage: The storage the page files are read from, see `gitma._storage`.
+    """
+    if storage.isfile(os.path.join(annotations_directory, JOURNAL_FILE_NAME)):
+        print(
+            f"WARNING: An interrupted write left partly written page files in {annotations_directory}, "
+            "they get rolled back by the next write to the annotation collection or by CatmaProject.recover()"
+        )
+
+
+def recover_page_files(annotations_directory: str) -> List[str]:
+    """Rolls back the changes of an interrupted write to the page files in an annotations directory, if there is one.
+    If the page files are being written at the moment, it waits until the write is finished.
+
+    Args:
+        annotations_directory (str): The annotations directory of an annotation collection.
+
+    Returns:
+        List[str]: The file names of the page files that were restored or removed.
+    """
+    if not os.path.isfile(os.path.join(annotations_directory, JOURNAL_FILE_NAME)):
+        return []
+    with PageFileTransaction(annotations_directory) as transaction:
+        return transaction.recovered_page_files
+
+
+class PageFileTransaction:
+    """Context manager for changes to the page files in an annotations directory.
+
+    On entering, it waits for an exclusive lock on the directory and rolls back the changes of interrupted transactions.
+    Page files have to be passed to `record` before they are changed in place. If the with block raises an exception the
+    recorded page files are restored, otherwise the journal gets removed.
+
+    Args:
+        annotations_directory (str): The annotations directory of an annotation collection.
+    """
+    def __init__(self, annotations_directory: str):
+        #: The annotations directory.
+        self.annotations_directory: str = annotations_directory
+
+        #: The file names of the page files that were restored or removed on entering, rolling back an interrupted transaction.
+        self.recovered_page_files: List[str] = []
+
+        self._journal_path: str = os.path.join(annotations_directory, JOURNAL_FILE_NAME)
+        self._journal: List[dict] = []
+        self._lock_file_descriptor: int = None
+
+    def __enter__(self) -> 'PageFileTransaction':
+        if fcntl is not None:
+            # directories can be locked like files, so no lock file gets added to the project
+            self._lock_file_descriptor = os.open(self.annotations_directory, os.O_RDONLY)
+            fcntl.flock(self._lock_file_descriptor, fcntl.LOCK_EX)
+        try:
+            self._recover()
+        except BaseException:
+            self._unlock()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        try:
+            if exc_type is None:
+                self._commit()
+            else:
+                self._rollback(self._journal)
+        finally:
+            self._unlock()
+
+    def _unlock(self) -> None:
+        if self._lock_file_descriptor is not None:
+            os.close(self._lock_file_descriptor)
+            self._lock_file_descriptor = None
+
+    def _recover(self) -> None:
+        # rolls back the changes of an interrupted transaction and removes its temporary files
+        if os.path.isfile(self._journal_path):
+            with open(self._journal_path, 'rb') as journal_file:
+                try:
+                    journal = _json.load(journal_file)
+                except _json.JSONDecodeError:
+                    # the journal is written atomically, this only happens if it was changed by someone else
+                    journal = []
+            self._rollback(journal)
+            self.recovered_page_files = sorted({entry['page_file'] for entry in journal})
+            print(f"WARNING: Rolled back an interrupted write to the page files in {self.annotations_directory}")
+
+        for file_name in os.listdir(self.annotations_directory):
+            if file_name.startswith('.') and file_name.endswith('.tmp'):
+                os.remove(os.path.join(self.annotations_directory, file_name))
+
+    def _rollback(self, journal: List[dict]) -> None:
+        for entry in reversed(journal):
+            page_file_path = os.path.join(self.annotations_directory, entry['page_file'])
+            if entry['offset'] is None:
+                # the page file was created by the transaction
+                if os.path.isfile(page_file_path):
+                    os.remove(page_file_path)
+            else:
+                with open(page_file_path, 'r+b') as page_file:
+                    page_file.truncate(entry['offset'])
+                    page_file.seek(entry['offset'])
+                    page_file.write(base64.b64decode(entry['original_bytes']))
+        self._journal = []
+        if os.path.isfile(self._journal_path):
+            os.remove(self._journal_path)
+
+    def _commit(self) -> None:
+        self._journal = []
+        if os.path.isfile(self._journal_path):
+            os.remove(self._journal_path)
+
+    def record(self, page_file_path: str, offset: int = None) -> None:
+        """Records the current state of a page file in the journal, before it gets changed in place.
+
+        Args:
+            page_file_path (str): The path of a page file in the annotations directory.
+            offset (int, optional): The position from which on the page file gets overwritten. If `None` the page file doesn't\
+                exist yet and gets created. Defaults to None.
+        """
+        original_bytes = b''
+        if offset is not None:
+            with open(page_file_path, 'rb') as page_file:
+                page_file.seek(offset)
+                original_bytes = page_file.read()
+
+        self._journal.append({
+            'page_file': os.path.basename(page_file_path),
+            'offset': offset,
+            'original_bytes': base64.b64encode(original_bytes).decode('ascii')
+        })
+        write_file_atomically(self._journal_path, _json.dumps(self._journal).encode('utf-8'))
@@ -0,0 +1,180 @@
+"""
+Batched changes to the property definitions of tags and the property values of annotations, see `CatmaProject.migrate_schema`.
+"""
+import os
+from typing import Dict, Iterable, List
+
+from gitma import _json
+from gitma.annotation import get_user_properties
+from gitma.tag import Tag
+from gitma._page_files import PageFileTransaction, is_page_file_name, write_file_atomically
+
+
+class SchemaMigration:
+    """Collects renames of properties and remaps of property values and applies them to the project in one pass, so that
+    each tag file and each page file gets read and written at most once, however many changes there are.
+
+    The changes are applied in the order they were added, a property renamed by one change is found by its new name in
+    later changes.
+
+    Args:
+        project (CatmaProject): The project to migrate.
+    """
+    def __init__(self, project):
+        #: The project to migrate.
+        self.project = project
+
+        self._operations: List[tuple] = []
+
+    def __len__(self):
+        return len(self._operations)
+
+    def rename_property(
+            self,
+            old_name: str,
+            new_name: str,
+            tags: Iterable[str] = None,
+            tagsets: Iterable[str] = None) -> 'SchemaMigration':
+        """Renames a property of tags. Annotations store property values by property UUID, so only tag files are changed.
+
+        Args:
+            old_name (str): The property's name.
+            new_name (str): The new name.
+            tags (Iterable[str], optional): The names, full paths or UUIDs of the tags. Defaults to None, which means all tags.
+            tagsets (Iterable[str], optional): The names or UUIDs of the tagsets. Defaults to None, which means all tagsets.
+
+        Returns:
+            SchemaMigration: The migration, so that changes can be chained.
+        """
+        self._operations.append(('rename', old_name, new_name, _to_set(tags), _to_set(tagsets)))
+        return self
+
+    def remap_property_values(
+            self,
+            prop: str,
+            value_map: Dict[str, str],
+            tags: Iterable[str] = None,
+            tagsets: Iterable[str] = None) -> 'SchemaMigration':
+        """Replaces values of a property, both in the possible values of tags and in the values of annotations.
+
+        Args:
+            prop (str): The property's name.
+            value_map (Dict[str, str]): The new values with the old values as keys.
+            tags (Iterable[str], optional): The names, full paths or UUIDs of the tags. Defaults to None, which means all tags.
+            tagsets (Iterable[str], optional): The names or UUIDs of the tagsets. Defaults to None, which means all tagsets.
+
+        Returns:
+            SchemaMigration: The migration, so that changes can be chained.
+        """
+        self._operations.append(('remap', prop, dict(value_map), _to_set(tags), _to_set(tagsets)))
+        return self
+
+    def _resolve(self) -> Dict[str, dict]:
+        # the new names and composed value maps of the changed properties, by property UUID
+        tags = [
+            (tagset, tag) for tagset in self.project.tagsets for tag in tagset.tags
+        ]
+        names = {
+            prop_uuid: definition['name']
+            for _, tag in tags for prop_uuid, definition in tag.properties_data.items()
+        }
+        changes = {}
+
+        for kind, prop, argument, tag_names, tagset_names in self._operations:
+            for tagset, tag in tags:
+                if tagset_names is not None and tagset.name not in tagset_names and tagset.uuid not in tagset_names:
+                    continue
+                if tag_names is not None and not {tag.name, tag.full_path, tag.id} & tag_names:
+                    continue
+                for prop_uuid in tag.properties_data:
+                    if names[prop_uuid] != prop:
+                        continue
+                    change = changes.setdefault(prop_uuid, {'tag': tag, 'name': None, 'value_map': {}})
+                    if kind == 'rename':
+                        names[prop_uuid] = change['name'] = argument
+                    else:
+                        value_map = change['value_map']
+                        change['value_map'] = {
+                            **{value: argument.get(value, value) for value in argument},
+                            **{value: argument.get(new_value, new_value) for value, new_value in value_map.items()}
+                        }
+
+        # renames must not give a tag two properties with the same name
+        for _, tag in tags:
+            tag_names = [names[prop_uuid] for prop_uuid in tag.properties_data]
+            duplicate_names = {name for name in tag_names if tag_names.count(name) > 1}
+            if duplicate_names:
+                raise ValueError(f'The tag "{tag.name}" would have several properties named {sorted(duplicate_names)}.')
+
+        return changes
+
+    def apply(self) -> List[str]:
+        """Writes the changed tag files and page files and updates the loaded tagsets and annotation collections.
+        The page files of all annotation collections are changed, including those that were not loaded, e.g. because of
+        `excluded_acs`, and the annotations that were filtered out by an `annotation_filter`.
+
+        Raises:
+            ValueError: If a tag would end up with two properties with the same name. Nothing is written then.
+
+        Returns:
+            List[str]: The project-relative paths of the changed files.
+        """
+        changes = self._resolve()
+        self._operations = []
+        project_path = self.project.project_path
+        changed_paths = []
+
+        # tag files
+        changes_by_tag: Dict[str, List[str]] = {}
+        for prop_uuid, change in changes.items():
+            changes_by_tag.setdefault(change['tag'].id, []).append(prop_uuid)
+        for prop_uuids in changes_by_tag.values():
+            tag: Tag = changes[prop_uuids[0]]['tag']
+            for prop_uuid in prop_uuids:
+                definition = tag.json['userDefinedPropertyDefinitions'][prop_uuid]
+                if changes[prop_uuid]['name'] is not None:
+                    definition['name'] = changes[prop_uuid]['name']
+                value_map = changes[prop_uuid]['value_map']
+                definition['possibleValueList'] = [value_map.get(value, value) for value in definition['possibleValueList']]
+            write_file_atomically(tag.path, _json.dumps(tag.json).encode('utf-8'))
+            changed_paths.append(tag.path[len(project_path) + 1:])
+
+        # page files, which only need to be parsed if they contain one of the properties with new values,
+        # of all annotation collections, as the tag files are changed for the whole project whatever was loaded
+        value_maps = {prop_uuid: change['value_map'] for prop_uuid, change in changes.items() if change['value_map']}
+        prop_uuids = [prop_uuid.encode('utf-8') for prop_uuid in value_maps]
+        collections_directory = f'{project_path}/collections/'
+        for ac_uuid in sorted(os.listdir(collections_directory)) if value_maps and os.path.isdir(collections_directory) else []:
+            annotations_directory = f'{collections_directory}{ac_uuid}/annotations/'
+            if not os.path.isdir(annotations_directory):
+                continue
+            with PageFileTransaction(annotations_directory):
+                for page_file_name in sorted(os.listdir(annotations_directory)):
+                    if not is_page_file_name(page_file_name):
+                        continue
+                    with open(annotations_directory + page_file_name, 'rb') as page_file:
+                        content = page_file.read()
+                    if not any(prop_uuid in content for prop_uuid in prop_uuids):
+                        continue
+
+                    page_file_changed = False
+                    ac_data = _json.loads(content)
+                    for annotation_data in ac_data:
+                        user_properties = get_user_properties(annotation_data)
+                        for prop_uuid in user_properties.keys() & value_maps.keys():
+                            values = [value_maps[prop_uuid].get(value, value) for value in user_properties[prop_uuid]]
+                            if values != user_properties[prop_uuid]:
+                                user_properties[prop_uuid] = values
+                                page_file_changed = True
+
+                    if page_file_changed:
+                        # serialized like `rewrite_page_file` does
+                        write_file_atomically(annotations_directory + page_file_name, _json.dumps(ac_data).encode('utf-8'))
+                        changed_paths.append(f'collections/{ac_uuid}/annotations/{page_file_name}')
+
+        self.project._reload_changed_paths(changed_paths)
+        return changed_paths
+
+
+def _to_set(values: Iterable[str]) -> set:
+    return None if values is None else set(values)
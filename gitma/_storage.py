@@ -0,0 +1,69 @@
+"""
+Read access to the files of CATMA projects, either in the file system or in the Git object database of the project's repository.
+
+The storage for the Git object database, `gitma._git.GitStorage`, lives in `gitma._git` so that pygit2 only gets imported
+when projects are read from Git.
+"""
+import configparser
+import os
+from typing import Dict, Generator, List, Tuple
+
+
+class FileSystemStorage:
+    """Reads the files of a CATMA project from the file system, i.e. from a checked out working tree.
+    Paths are interpreted like in the `os` module.
+    """
+    def __repr__(self):
+        return 'FileSystemStorage()'
+
+    def read_bytes(self, path: str) -> bytes:
+        """Returns the content of a file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        with open(path, 'rb') as file:
+            return file.read()
+
+    def listdir(self, path: str) -> List[str]:
+        """Returns the names of the entries of a directory."""
+        return os.listdir(path)
+
+    def isdir(self, path: str) -> bool:
+        return os.path.isdir(path)
+
+    def isfile(self, path: str) -> bool:
+        return os.path.isfile(path)
+
+    def walk(self, path: str) -> Generator[Tuple[str, List[str], List[str]], None, None]:
+        """Walks a directory tree like `os.walk`."""
+        yield from os.walk(path)
+
+
+#: The storage used if no other storage is given.
+file_system_storage = FileSystemStorage()
+
+
+def get_storage(storage) -> FileSystemStorage:
+    """Returns the given storage or `file_system_storage` if it is `None`."""
+    return file_system_storage if storage is None else storage
+
+
+def parse_gitmodules(gitmodules: bytes) -> Dict[str, Tuple[str, str]]:
+    """Parses the content of a .gitmodules file.
+
+    Args:
+        gitmodules (bytes): The file content.
+
+    Returns:
+        Dict[str, Tuple[str, str]]: The submodules' names and URLs with their paths as keys.
+    """
+    parser = configparser.ConfigParser(interpolation=None)
+    # configparser would treat the indented lines of Git config files as continuation lines
+    parser.read_string('\n'.join(line.strip() for line in gitmodules.decode('utf-8').splitlines()))
+
+    submodules = {}
+    for section in parser.sections():
+        if section.startswith('submodule "') and section.endswith('"') and 'path' in parser[section]:
+            submodules[parser[section]['path']] = (section[11:-1], parser[section].get('url'))
+    return submodules
@@ -1,11 +1,13 @@
-import json
 import os
 import uuid
 
 from datetime import datetime
+from typing import Dict, Iterable, List
 
+from gitma import _json
 from gitma.tag import Tag
 from gitma.tagset import Tagset
+from gitma._page_files import PageFileTransaction
 
 
 # the value of this constant should match the value in the relevant CATMA instance's settings
@@ -53,7 +55,8 @@ def _get_current_page_file_path(annotations_base_path: str, username: str = 'Git
     page_no = 0
 
     if len(pages) > 0:
-        pages.sort(key=lambda page: page[page.rindex('_')+1:])
+        # numerically, so that e.g. page 10 comes after page 9
+        pages.sort(key=lambda page: int(page[page.rindex('_')+1:-len('.json')]))
         page_no = len(pages)-1
         last_page = pages[-1]
 
@@ -63,28 +66,26 @@ def _get_current_page_file_path(annotations_base_path: str, username: str = 'Git
     return f'{annotations_base_path}{username}_{page_no}.json'
 
 
-def write_annotation_json(
+def get_annotation_json_dict(
         project,
-        text_title: str,
-        annotation_collection_name: str,
-        tagset_name: str,
-        tag_name: str,
+        text,
+        annotation_collection,
+        tagset: Tagset,
+        tag: Tag,
         start_points: list,
         end_points: list,
         property_annotations: dict,
         author: str,
         uuid_override: str = None,
-        timestamp_override: str = None) -> str:
-    """
-    Function to write a new annotation into a given `CatmaProject`.
-    Gets imported in the `CatmaProject` class and should only be used as a class method.
+        timestamp_override: str = None) -> dict:
+    """Builds the JSON-LD representation of a new annotation, as it is stored in the page files.
 
     Args:
         project (CatmaProject): A CatmaProject object.
-        text_title (str): The text title.
-        annotation_collection_name (str): The name of the target annotation collection.
-        tagset_name (str): The tagset's name.
-        tag_name (str): The tag's name.
+        text (Text): The annotated document.
+        annotation_collection (AnnotationCollection): The target annotation collection.
+        tagset (Tagset): The tag's tagset.
+        tag (Tag): The tag.
         start_points (list): The start points of the annotation spans.
         end_points (list): The end points of the annotation spans.
         property_annotations (dict): A dictionary with property names mapped to value lists.
@@ -93,24 +94,15 @@ def write_annotation_json(
         timestamp_override (str, optional): If supplied, overrides the internally generated annotation timestamp for testing purposes. Defaults to None.
 
     Returns:
-        str: The project-relative path of the page file that the annotation was written to.
+        dict: The annotation's JSON data.
     """
-
-    cwd = os.getcwd()
-    os.chdir(project.projects_directory + project.uuid)
-
-    text = project.text_dict[text_title]
-    annotation_collection = project.ac_dict[annotation_collection_name]
-    tagset = find_tagset_by_name(project, tagset_name)
-    tag = find_tag_by_name(tagset, tag_name)
-
     # NB: new_annotation_relative_path is NOT a file path and is only used in the JSON-LD representation of the annotation
     new_annotation_uuid, new_annotation_relative_path = get_new_annotation_uuid_and_path(annotation_collection.uuid)
     if uuid_override is not None:
         new_annotation_relative_path = new_annotation_relative_path.replace(new_annotation_uuid, uuid_override)
         new_annotation_uuid = uuid_override
 
-    tag_relative_path = tag.path[tag.path.index('/')+1:tag.path.rindex('/')]
+    tag_relative_path = os.path.relpath(os.path.dirname(tag.path), project.project_path).replace('\\', '/')
 
     context_dict = {
         Tag.SYSTEM_PROPERTY_UUID_CATMA_MARKUPTIMESTAMP: f'{tag_relative_path}/{Tag.SYSTEM_PROPERTY_UUID_CATMA_MARKUPTIMESTAMP}',
@@ -158,33 +150,259 @@ def write_annotation_json(
         },
     }
 
+    return json_dict
+
+
+def write_annotation_json(
+        project,
+        text_title: str,
+        annotation_collection_name: str,
+        tagset_name: str,
+        tag_name: str,
+        start_points: list,
+        end_points: list,
+        property_annotations: dict,
+        author: str,
+        uuid_override: str = None,
+        timestamp_override: str = None) -> str:
+    """
+    Function to write a new annotation into a given `CatmaProject`.
+    Gets imported in the `CatmaProject` class and should only be used as a class method.
+    To write many annotations at once use `write_annotations`.
+
+    Args:
+        project (CatmaProject): A CatmaProject object.
+        text_title (str): The text title.
+        annotation_collection_name (str): The name of the target annotation collection.
+        tagset_name (str): The tagset's name.
+        tag_name (str): The tag's name.
+        start_points (list): The start points of the annotation spans.
+        end_points (list): The end points of the annotation spans.
+        property_annotations (dict): A dictionary with property names mapped to value lists.
+        author (str): The annotation's author.
+        uuid_override (str, optional): If supplied, overrides the internally generated annotation UUID for testing purposes. Defaults to None.
+        timestamp_override (str, optional): If supplied, overrides the internally generated annotation timestamp for testing purposes. Defaults to None.
+
+    Returns:
+        str: The project-relative path of the page file that the annotation was written to.
+    """
+
+    text = project.text_dict[text_title]
+    annotation_collection = project.ac_dict[annotation_collection_name]
+    tagset = find_tagset_by_name(project, tagset_name)
+    tag = find_tag_by_name(tagset, tag_name)
+
+    json_dict = get_annotation_json_dict(
+        project=project,
+        text=text,
+        annotation_collection=annotation_collection,
+        tagset=tagset,
+        tag=tag,
+        start_points=start_points,
+        end_points=end_points,
+        property_annotations=property_annotations,
+        author=author,
+        uuid_override=uuid_override,
+        timestamp_override=timestamp_override
+    )
+
     # the below should be roughly equivalent to what GitAnnotationCollectionHandler.createTagInstances does in CATMA
-    annotation_json = json.dumps([json_dict], indent=2)
-    annotation_byte_size = len(annotation_json.encode('utf-8'))
+    annotation_json = _json.dumps([json_dict], indent=2).encode('utf-8')
+
+    annotations_base_path = f'{project.project_path}/collections/{annotation_collection.uuid}/annotations/'
+    with PageFileTransaction(annotations_base_path) as transaction:
+        current_page_file_path = append_to_page_files(transaction, annotations_base_path, [annotation_json])[0]
 
-    annotations_base_path = f'collections/{annotation_collection.uuid}/annotations/'
-    current_page_file_path = _get_current_page_file_path(annotations_base_path)  # <annotations_base_path><username>_<pagenumber>.json
+    return current_page_file_path[len(project.project_path) + 1:]
 
-    if os.path.isfile(current_page_file_path) and os.path.getsize(current_page_file_path) + annotation_byte_size > MAX_ANNOTATION_PAGE_FILE_SIZE_BYTES:
-        # the current page file doesn't have enough space to write the new annotation, we need to create a new one
-        current_page_file_path = _get_current_page_file_path(annotations_base_path, force_new=True)
 
-    with open(current_page_file_path, 'r+b' if os.path.isfile(current_page_file_path) else 'xb') as current_page_file:
-        file_size = current_page_file.seek(0, os.SEEK_END)
-        current_page_file.seek(0, os.SEEK_SET)
+def _write_page_file(transaction: PageFileTransaction, page_file_path: str, offset: int, parts: List[bytes]) -> None:
+    # writes the annotations at the offset of an existing page file, or into a new page file if offset is None
+    transaction.record(page_file_path, offset=offset)
+    with open(page_file_path, 'xb' if offset is None else 'r+b') as page_file:
+        page_file.seek(offset or 0)
+        page_file.write(b''.join(parts) + b'\n]')
+        page_file.flush()
+        os.fsync(page_file.fileno())
+
+
+def append_to_page_files(
+        transaction: PageFileTransaction,
+        annotations_base_path: str,
+        annotation_jsons: List[bytes],
+        username: str = 'GitMA_DummyUser') -> List[str]:
+    """Appends annotations to the current page file of an annotation collection, starting new page files when a page file
+    doesn't have enough space for the next annotation, see `MAX_ANNOTATION_PAGE_FILE_SIZE_BYTES`. Each page file gets
+    written once.
+
+    Args:
+        transaction (PageFileTransaction): The transaction on the annotations directory, which has to be entered.
+        annotations_base_path (str): The annotation collection's annotations directory, with a trailing slash.
+        annotation_jsons (List[bytes]): The annotations, each one serialized as a list with one element and an indent of 2.
+        username (str, optional): The user name the page files are named after. Defaults to 'GitMA_DummyUser'.
+
+    Returns:
+        List[str]: The paths of the page files that the annotations were written to, one for each annotation.
+    """
+    page_file_paths = []
+
+    current_page_file_path = _get_current_page_file_path(annotations_base_path, username=username)  # <annotations_base_path><username>_<pagenumber>.json
+    file_size = os.path.getsize(current_page_file_path) if os.path.isfile(current_page_file_path) else None
+    # the page file's new content is what is on disk up to the offset, then the parts and a closing '\n]'
+    offset = None if file_size is None else file_size - 2 if file_size > 2 else 0
+    parts = []
+    size = file_size or 0
+
+    for annotation_json in annotation_jsons:
+        if (file_size is not None or parts) and size + len(annotation_json) > MAX_ANNOTATION_PAGE_FILE_SIZE_BYTES:
+            # the current page file doesn't have enough space to write the new annotation, we need to create a new one
+            if parts:
+                _write_page_file(transaction, current_page_file_path, offset, parts)
+            current_page_file_path = _get_current_page_file_path(annotations_base_path, username=username, force_new=True)
+            file_size = os.path.getsize(current_page_file_path) if os.path.isfile(current_page_file_path) else None
+            offset = None if file_size is None else file_size - 2 if file_size > 2 else 0
+            parts = []
+            size = file_size or 0
 
         # condition is '> 2' because a page file can contain only "[]" (if all the annotations that the page contains are deleted)
-        if file_size > 2:
+        if size > 2:
             # replace the opening list bracket of the serialized annotation to be written with a comma
-            # in preparation for appending the annotation to the list of existing annotations in the page file
-            annotation_json = ',' + annotation_json[1:]
+            # in preparation for appending the annotation to the list of existing annotations in the page file,
+            # the closing list bracket and the preceding newline of the page file get overwritten
+            parts.append(b',' + annotation_json[1:-2])
+            size += len(annotation_json) - 2
+        else:
+            parts.append(annotation_json[:-2])
+            size = len(annotation_json)
+        page_file_paths.append(current_page_file_path)
+
+    if parts:
+        _write_page_file(transaction, current_page_file_path, offset, parts)
+
+    return page_file_paths
 
-            # seek so that the closing list bracket and the preceding newline in the page file will be overwritten
-            # with the new annotation + a new closing bracket
-            current_page_file.seek(-2, os.SEEK_END)
 
-        current_page_file.write(annotation_json.encode('utf-8'))
+class PageFileWriter:
+    """Collects new annotations for an annotation collection and appends them to its page files like `write_annotation_json`
+    does, but writes them in one go instead of one by one. At most about one page file of annotations is held in memory,
+    they get written when they would fill a page file or when `flush` is called.
 
-    os.chdir(cwd)
+    Args:
+        annotations_base_path (str): The annotation collection's annotations directory, with a trailing slash.
+        username (str, optional): The user name the page files are named after. Defaults to 'GitMA_DummyUser'.
+    """
+    def __init__(self, annotations_base_path: str, username: str = 'GitMA_DummyUser'):
+        self.annotations_base_path: str = annotations_base_path
+        self.username: str = username
+
+        self._pending: List[bytes] = []
+        self._pending_size: int = 0
+
+    def append(self, annotation_json_dict: dict) -> List[str]:
+        """Adds an annotation, flushing the pending annotations if they fill a page file.
+
+        Args:
+            annotation_json_dict (dict): The annotation's JSON data, see `get_annotation_json_dict`.
+
+        Returns:
+            List[str]: The paths of the page files written to, see `flush`.
+        """
+        annotation_json = _json.dumps([annotation_json_dict], indent=2).encode('utf-8')
+        self._pending.append(annotation_json)
+        self._pending_size += len(annotation_json)
+        if self._pending_size >= MAX_ANNOTATION_PAGE_FILE_SIZE_BYTES:
+            return self.flush()
+        return []
+
+    def flush(self) -> List[str]:
+        """Writes the pending annotations within a `PageFileTransaction`, so that other writers can work on the same
+        annotation collection concurrently and an interrupted flush gets rolled back.
+
+        Returns:
+            List[str]: The paths of the page files written to, one for each annotation.
+        """
+        if not self._pending:
+            return []
+        with PageFileTransaction(self.annotations_base_path) as transaction:
+            page_file_paths = append_to_page_files(transaction, self.annotations_base_path, self._pending, username=self.username)
+        self._pending = []
+        self._pending_size = 0
+        return page_file_paths
+
+
+def write_annotations(project, annotations: Iterable[dict]) -> List[str]:
+    """
+    Function to write many new annotations into a given `CatmaProject` at once.
+    Gets imported in the `CatmaProject` class and should only be used as a class method.
+
+    The page files are the same as if `write_annotation_json` was called for each annotation, but tagsets and tags are
+    looked up once and the annotations are written a page file at a time instead of one by one.
 
-    return current_page_file_path
+    Args:
+        project (CatmaProject): A CatmaProject object.
+        annotations (Iterable[dict]): The annotations as dicts with the parameters of `write_annotation_json` as keys:\
+            'text_title', 'annotation_collection_name', 'tagset_name', 'tag_name', 'start_points', 'end_points', 'author'\
+            and optionally 'property_annotations', 'uuid_override' and 'timestamp_override'.
+
+    Returns:
+        List[str]: The project-relative paths of the page files that were written to, in the order they were first written to.
+    """
+    # like find_tagset_by_name and find_tag_by_name, the first tagset or tag with a name is used
+    tagsets_by_name = {}
+    for tagset in project.tagsets:
+        tagsets_by_name.setdefault(tagset.name, tagset)
+    tags_by_name = {}
+
+    page_file_writers: Dict[str, PageFileWriter] = {}
+    # the indices of the annotations pending in each writer and the index of the first annotation in each page file
+    pending_indices: Dict[str, List[int]] = {}
+    first_indices: Dict[str, int] = {}
+
+    def add_page_file_paths(annotation_collection_uuid: str, page_file_paths: List[str]) -> None:
+        if page_file_paths:
+            for index, page_file_path in zip(pending_indices[annotation_collection_uuid], page_file_paths):
+                first_indices.setdefault(page_file_path, index)
+            pending_indices[annotation_collection_uuid] = []
+
+    try:
+        for index, annotation in enumerate(annotations):
+            annotation_collection = project.ac_dict[annotation['annotation_collection_name']]
+            tagset = tagsets_by_name[annotation['tagset_name']]
+            if tagset.uuid not in tags_by_name:
+                tags_by_name[tagset.uuid] = {}
+                for tag in tagset.tags:
+                    tags_by_name[tagset.uuid].setdefault(tag.name, tag)
+
+            json_dict = get_annotation_json_dict(
+                project=project,
+                text=project.text_dict[annotation['text_title']],
+                annotation_collection=annotation_collection,
+                tagset=tagset,
+                tag=tags_by_name[tagset.uuid][annotation['tag_name']],
+                start_points=annotation['start_points'],
+                end_points=annotation['end_points'],
+                property_annotations=annotation.get('property_annotations') or {},
+                author=annotation['author'],
+                uuid_override=annotation.get('uuid_override'),
+                timestamp_override=annotation.get('timestamp_override')
+            )
+
+            if annotation_collection.uuid not in page_file_writers:
+                page_file_writers[annotation_collection.uuid] = PageFileWriter(
+                    f'{project.project_path}/collections/{annotation_collection.uuid}/annotations/'
+                )
+                pending_indices[annotation_collection.uuid] = []
+            pending_indices[annotation_collection.uuid].append(index)
+            add_page_file_paths(
+                annotation_collection.uuid,
+                page_file_writers[annotation_collection.uuid].append(json_dict)
+            )
+    finally:
+        # the annotations prepared so far get written even if a later one fails
+        for annotation_collection_uuid, page_file_writer in page_file_writers.items():
+            add_page_file_paths(annotation_collection_uuid, page_file_writer.flush())
+
+    return [
+        page_file_path[len(project.project_path) + 1:]
+        for page_file_path in sorted(first_indices, key=first_indices.get)
+    ]
@@ -1,4 +1,4 @@
-import json
+import sys
 from copy import deepcopy
 from datetime import datetime
 from typing import List
@@ -32,20 +32,31 @@ def get_system_properties(annotation_dict: dict) -> str:
     return annotation_dict['body']['properties']['system']
 
 
-def get_date(annotation_dict: dict) -> datetime:
-    annotation_iso_datetime = get_system_properties(annotation_dict)[Tag.SYSTEM_PROPERTY_UUID_CATMA_MARKUPTIMESTAMP][0]
+# older GitMA versions wrote the timestamp without a timezone component
+# as a limited amount of annotations were created using these versions we assume CEST and append its offset to allow parsing to succeed
+# if you used older GitMA versions to create annotations and an accurate timestamp is important to you, consider correcting the source data
+# or modify the offset below
+LEGACY_TIMESTAMP_UTC_OFFSET = '+02:00'
+
+
+def get_date_string(annotation_dict: dict) -> str:
+    return get_system_properties(annotation_dict)[Tag.SYSTEM_PROPERTY_UUID_CATMA_MARKUPTIMESTAMP][0]
+
+
+def parse_date(annotation_iso_datetime: str) -> datetime:
     # not using datetime.fromisoformat here because it doesn't handle a timezone component without a colon separator
     try:
         timestamp = datetime.strptime(annotation_iso_datetime, '%Y-%m-%dT%H:%M:%S.%f%z')
     except ValueError:
-        # older GitMA versions wrote the timestamp without a timezone component, which will cause the above to fail
-        # as a limited amount of annotations were created using these versions we assume CEST and append its offset to allow parsing to succeed
-        # if you used older GitMA versions to create annotations and an accurate timestamp is important to you, consider correcting the source data
-        # or modify the offset below
-        timestamp = datetime.strptime(annotation_iso_datetime + '+02:00', '%Y-%m-%dT%H:%M:%S%z')
+        # timestamps written by older GitMA versions, which will cause the above to fail, see LEGACY_TIMESTAMP_UTC_OFFSET
+        timestamp = datetime.strptime(annotation_iso_datetime + LEGACY_TIMESTAMP_UTC_OFFSET, '%Y-%m-%dT%H:%M:%S%z')
     return timestamp
 
 
+def get_date(annotation_dict: dict) -> datetime:
+    return parse_date(get_date_string(annotation_dict))
+
+
 def get_author(annotation_dict: dict):
     return get_system_properties(annotation_dict)[Tag.SYSTEM_PROPERTY_UUID_CATMA_MARKUPAUTHOR][0]
 
@@ -155,6 +166,9 @@ def numeric_property_values_to_int(prop_dict: dict) -> dict:
 class Annotation:
     """Class which represents a CATMA annotation.
 
+    The annotated text, its context and the selectors are sliced from the document's plain text when they are accessed,
+    so that annotations don't hold copies of the text.
+
     Args:
         annotation_data (dict): The annotation data as a dict.
         page_file_path (str): The path of the JSON annotation page file from which annotation_data was loaded.
@@ -162,56 +176,57 @@ class Annotation:
         project (CatmaProject): The parent CatmaProject.
         context (int, optional): Size of the context that gets included in the\
             data frame representation of annotation collections. Defaults to 50.
+        compact (bool, optional): If `True` the annotation doesn't keep `annotation_data` in memory.\
+            It gets read from the page file again when `data` is accessed, e.g. to modify the annotation. Defaults to False.
     """
-    def __init__(self, annotation_data: dict, page_file_path: str, plain_text: str, project, context: int = 50):
+    __slots__ = (
+        'project', 'page_file_path', 'uuid', 'author', 'start_point', 'end_point', 'tag', 'properties',
+        '_data', '_date_string', '_date', '_plain_text', '_context', '_spans', '_tagset_uuid', '_tag_uuid'
+    )
+
+    def __init__(
+            self,
+            annotation_data: dict,
+            page_file_path: str,
+            plain_text: str,
+            project,
+            context: int = 50,
+            compact: bool = False):
         #: The parent CatmaProject
         self.project = project
-        
-        #: The annotation in its json representation as a dict
-        self.data: dict = annotation_data
 
         #: The path of the annotation page file that this annotation was loaded from
         self.page_file_path: str = page_file_path
 
         #: The annotation's uuid.
-        self.uuid: str = get_uuid(self.data)
-        
-        #: The date & time the annotation was created.
-        self.date: datetime = get_date(self.data)
+        self.uuid: str = get_uuid(annotation_data)
+
+        # the timestamp gets parsed the first time `date` is accessed
+        self._date_string: str = get_date_string(annotation_data)
+        self._date: datetime = None
 
         #: The annotation's author.
-        self.author: str = get_author(self.data)
+        self.author: str = sys.intern(get_author(annotation_data))
 
         #: The annotation's start point (character index) in the plain text.
-        self.start_point: int = get_start_point(self.data)
+        self.start_point: int = get_start_point(annotation_data)
 
         #: The annotation's end point (character index) in the plain text.
-        self.end_point: int = get_end_point(self.data)
+        self.end_point: int = get_end_point(annotation_data)
 
-        #: The annotated text span.
-        self.text: str = ' '.join(
-            list(get_annotated_text(self.data, plain_text))
+        self._data: dict = None if compact else annotation_data
+        self._plain_text: str = plain_text
+        self._context: int = context
+        self._spans: tuple = tuple(
+            (item['selector']['start'], item['selector']['end']) for item in annotation_data['target']['items']
         )
-
-        #: The annotation's left context.
-        self.pretext: str = plain_text[
-            self.start_point - context: self.start_point
-        ]
-
-        #: The annotation's right context.
-        self.posttext: str = plain_text[self.end_point: self.end_point + context]
-
-        #: The annotation's selectors as a list of gitma.Selector
-        self.selectors: List[Selector] = list(
-            build_selectors(self.data, plain_text))
-
-        tagset_uuid = get_tagset_uuid(self.data)
-        tag_uuid = get_tag_uuid(self.data)
+        self._tagset_uuid: str = sys.intern(get_tagset_uuid(annotation_data))
+        self._tag_uuid: str = sys.intern(get_tag_uuid(annotation_data))
 
         #: The annotation's tag as a gitma.Tag object.
-        self.tag = project.tagset_dict[tagset_uuid].tag_dict[tag_uuid]
+        self.tag = project.tagset_dict[self._tagset_uuid].tag_dict[self._tag_uuid]
 
-        user_properties = get_user_properties(self.data)
+        user_properties = get_user_properties(annotation_data)
 
         #: The annotation's properties as a dictionary with property names as keys
         #: and the property values as list.
@@ -219,6 +234,68 @@ class Annotation:
             self.tag.properties_data[prop]['name']: user_properties[prop] for prop in user_properties
         }
 
+    @property
+    def date(self) -> datetime:
+        """The date & time the annotation was created."""
+        if self._date is None:
+            self._date = parse_date(self._date_string)
+        return self._date
+
+    @date.setter
+    def date(self, date: datetime) -> None:
+        self._date = date
+
+    @property
+    def data(self) -> dict:
+        """The annotation in its json representation as a dict.
+        Compact annotations read it from their page file, within `CatmaProject.batch` each page file gets parsed once.
+        """
+        if self._data is None:
+            self._data = self._load_data()
+        return self._data
+
+    @data.setter
+    def data(self, data: dict) -> None:
+        self._data = data
+
+    def _load_data(self) -> dict:
+        # rehydrates the annotation data of compact annotations from their page file,
+        # within `CatmaProject.batch` the parsed page file is shared by all annotations of the page file
+        from gitma._batch import read_page
+
+        batch = self.project._batch
+        if batch is not None:
+            page = batch.read_page(self.page_file_path, self.project.storage)
+        else:
+            page = read_page(self.page_file_path, self.project.storage)
+
+        if self.uuid in page:
+            return page[self.uuid]
+
+        raise ValueError(
+            f'The annotation {self.uuid} could not be found in its page file {self.page_file_path}\n\
+                --> The page file has been changed since the annotation was loaded.')
+
+    @property
+    def text(self) -> str:
+        """The annotated text span."""
+        return ' '.join(self._plain_text[start:end] for start, end in self._spans)
+
+    @property
+    def pretext(self) -> str:
+        """The annotation's left context."""
+        return self._plain_text[self.start_point - self._context: self.start_point]
+
+    @property
+    def posttext(self) -> str:
+        """The annotation's right context."""
+        return self._plain_text[self.end_point: self.end_point + self._context]
+
+    @property
+    def selectors(self) -> List[Selector]:
+        """The annotation's selectors as a list of gitma.Selector"""
+        return [Selector(start, end, self._plain_text) for start, end in self._spans]
+
     def __len__(self) -> int:
         return self.end_point - self.start_point
 
@@ -247,30 +324,18 @@ class Annotation:
     
     def remove(self) -> None:
         """Removes the annotation from the annotation collection's json file.
+        The page file gets rewritten atomically, within `CatmaProject.batch` when the batch ends.
         """
-        with open(self.page_file_path, 'r', encoding='utf-8', newline='') as ac_input:
-            ac_data = json.load(ac_input)
-
-        for item in ac_data:
-            if get_uuid(item) == self.uuid:
-                ac_data.remove(self.data)
-
-        with open(self.page_file_path, 'w', encoding='utf-8', newline='') as ac_output:
-            ac_output.write(json.dumps(ac_data))
+        with self.project.batch() as batch:
+            batch.remove(self.page_file_path, self.uuid)
     
     def modify_annotation(self) -> None:
         """Overwrite annotation collection's json file with the updated
         annotation data: `self.data`.
+        The page file gets rewritten atomically, within `CatmaProject.batch` when the batch ends.
         """
-        with open(self.page_file_path, 'r', encoding='utf-8', newline='') as ac_input:
-            ac_data = json.load(ac_input)
-
-        for index, item in enumerate(ac_data):
-            if get_uuid(item) == self.uuid:
-                ac_data[index] = self.data
-
-        with open(self.page_file_path, 'w', encoding='utf-8', newline='') as ac_output:
-            ac_output.write(json.dumps(ac_data))
+        with self.project.batch() as batch:
+            batch.modify(self.page_file_path, self.uuid, self.data)
 
     def modify_start_point(self, new_start_point: int, relative: bool = False) -> None:
         """Rewrites annotation json file with new start point.
@@ -352,13 +417,15 @@ class Annotation:
 
             self.modify_annotation()
 
-    def _copy(
+    def _get_copy_parameters(
             self,
             annotation_collection_name: str,
             compare_annotation: 'Annotation' = None,
+            text_title: str = None,
             uuid_override: str = None,
             timestamp_override: str = None
-    ) -> str:
+    ) -> dict:
+        # the parameters of write_annotation_json for a copy of this annotation, as used by write_annotations
         new_properties = deepcopy(self.properties)
 
         # remove property values from new_properties unless we have a compare_annotation whose corresponding property values match
@@ -366,24 +433,38 @@ class Annotation:
             if compare_annotation is None or new_properties.get(property_name) != compare_annotation.properties.get(property_name, []):
                 new_properties[property_name] = []
 
-        document_uuid = self.data['target']['items'][0]['source']
-        document_title = [text for text in self.project.texts if text.uuid == document_uuid][0].title
+        if text_title is None:
+            document_uuid = self.data['target']['items'][0]['source']
+            text_title = [text for text in self.project.texts if text.uuid == document_uuid][0].title
 
-        start_points = [item['selector']['start'] for item in self.data['target']['items']]
-        end_points = [item['selector']['end'] for item in self.data['target']['items']]
+        return {
+            'text_title': text_title,
+            'annotation_collection_name': annotation_collection_name,
+            'tagset_name': self.project.tagset_dict[self._tagset_uuid].name,
+            'tag_name': self.tag.name,
+            'start_points': [start for start, _ in self._spans],
+            'end_points': [end for _, end in self._spans],
+            'property_annotations': new_properties,
+            'author': 'auto_gold',
+            'uuid_override': uuid_override,
+            'timestamp_override': timestamp_override
+        }
 
+    def _copy(
+            self,
+            annotation_collection_name: str,
+            compare_annotation: 'Annotation' = None,
+            uuid_override: str = None,
+            timestamp_override: str = None
+    ) -> str:
         return write_annotation_json(
             self.project,
-            document_title,
-            annotation_collection_name,
-            self.project.tagset_dict[get_tagset_uuid(self.data)].name,
-            self.tag.name,
-            start_points,
-            end_points,
-            new_properties,
-            'auto_gold',
-            uuid_override=uuid_override,
-            timestamp_override=timestamp_override
+            **self._get_copy_parameters(
+                annotation_collection_name,
+                compare_annotation,
+                uuid_override=uuid_override,
+                timestamp_override=timestamp_override
+            )
         )
 
     def copy(
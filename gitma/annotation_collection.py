@@ -1,39 +1,39 @@
-import json
-import os
 import string
-import subprocess
 import re
+import numpy as np
 import pandas as pd
-from typing import List, Union, Dict
+from typing import Callable, Iterable, List, Set, Union, Dict, Generator
 from collections import Counter
 from gitma.text import Text
 from gitma.annotation import Annotation
+from gitma.annotation_columns import AnnotationColumns
+from gitma.annotation_record import AnnotationRecord, iter_annotation_records
 from gitma.tag import Tag
-from gitma._export_annotations import to_stanford_tsv
-from gitma._vizualize import plot_annotations, plot_scaled_annotations, duplicate_rows
+from gitma import _json
+from gitma._page_files import is_page_file_name, warn_about_journal
 
 
-def split_property_dict_to_column(ac_df):
+def get_property_columns(properties: List[Dict[str, list]]) -> Dict[str, list]:
     """
-    Creates Pandas DataFrame columns for each property in annotation collection.
+    Collects the values of each property in one pass over the annotations' property dicts.
+    Annotations without a value for a property get `['nan']`.
     """
-    properties_dict = {}
-
-    for index, item in enumerate(ac_df['properties']):
-        for key in item:
-            if key not in properties_dict:
-                prev_list = index * [['nan']]
-                prev_list.append(item[key])
-                properties_dict[key] = prev_list
-            else:
-                properties_dict[key].append(item[key])
+    property_columns = {}
+    for index, item in enumerate(properties):
+        for key, value in item.items():
+            column = property_columns.get(key)
+            if column is None:
+                column = property_columns[key] = [['nan']] * len(properties)
+            column[index] = value
+    return property_columns
 
-        for prop in properties_dict:
-            if prop not in item:
-                properties_dict[prop].append(['nan'])
 
-    for prop in properties_dict:
-        ac_df[f'prop:{prop}'] = properties_dict[prop]
+def split_property_dict_to_column(ac_df):
+    """
+    Creates Pandas DataFrame columns for each property in annotation collection.
+    """
+    for prop, values in get_property_columns(list(ac_df['properties'])).items():
+        ac_df[f'prop:{prop}'] = values
 
     return ac_df.drop(columns='properties')
 
@@ -83,28 +83,56 @@ def clean_text_in_ac_df(annotation: str) -> str:
     return annotation
 
 
-def load_annotations(catma_project, ac, context: int):
-    base_dir = f'{os.getcwd()}/{catma_project.uuid}/collections/{ac.uuid}/annotations/'
-    # load all annotation collection page files
-    for filename in os.listdir(base_dir):
+# replacing single spaces with themselves is a no-op, matching only runs of spaces is much faster
+SPACE_RUNS_PATTERN = re.compile(' {2,}')
+
+
+def clean_texts(texts: List[str]) -> List[str]:
+    """`clean_text_in_ac_df` for many texts. The regular expression only runs on texts that contain runs of spaces."""
+    texts = [text.replace('\n', ' ') for text in texts]
+    return [SPACE_RUNS_PATTERN.sub(' ', text) if '  ' in text else text for text in texts]
+
+
+def load_annotations(catma_project, ac, context: int, page_file_names: List[str] = None):
+    base_dir = f'{ac._project_path}/collections/{ac.uuid}/annotations/'
+    # load all annotation collection page files, unless only some of them are requested
+    # sorted, so that annotations with the same start point always end up in the same order
+    storage = catma_project.storage
+
+    # the annotation filter is applied to the raw annotation data, before any `Annotation` gets created
+    annotation_filter = catma_project.annotation_filter
+    predicate = None
+    if annotation_filter is not None:
+        if not annotation_filter.matches_document(document_uuid=ac.plain_text_id, title=ac.text.title):
+            return
+        predicate = annotation_filter.get_predicate(catma_project.tagset_dict)
+
+    warn_about_journal(base_dir, storage)
+
+    if page_file_names is None:
+        page_file_names = [filename for filename in storage.listdir(base_dir) if is_page_file_name(filename)]
+    for filename in sorted(page_file_names):
         page_file_path = base_dir + filename
         page_file_annotations = []
 
-        with open(page_file_path, 'r', encoding='utf-8', newline='') as page_file:
-            # load all annotations
-            try:
-                page_file_annotations = json.load(page_file)
-            except json.JSONDecodeError as e:
-                print(f"WARNING: Failed to load annotation page file {page_file_path}\nOriginal error: {e}")
+        # load all annotations
+        try:
+            page_file_annotations = _json.loads(storage.read_bytes(page_file_path))
+        except _json.JSONDecodeError as e:
+            print(f"WARNING: Failed to load annotation page file {page_file_path}\nOriginal error: {e}")
 
         # construct `Annotation` objects
+        if predicate is not None:
+            page_file_annotations = [annotation_data for annotation_data in page_file_annotations if predicate(annotation_data)]
+
         for annotation_data in page_file_annotations:
             yield Annotation(
                     annotation_data=annotation_data,
                     page_file_path=page_file_path,
                     plain_text=ac.text.plain_text,
                     project=catma_project,
-                    context=context
+                    context=context,
+                    compact=ac._compact
             )
 
 
@@ -115,25 +143,54 @@ df_columns = [
 ]
 
 
-def ac_to_df(annotations: List[Annotation], text_title, ac_name) -> pd.DataFrame:
-    # create df
-    df = pd.DataFrame(
-        [
-            (
-                text_title, ac_name, a.author, a.tag.name, a.tag.full_path,
-                a.properties, a.pretext, a.text, a.posttext, a.start_point,
-                a.end_point, a.date
-            ) for a in annotations
-        ], columns=df_columns
-    )
+# data frame columns with categorical dtype
+categorical_df_columns = ['document', 'annotation collection', 'annotator', 'tag']
+
+
+def ac_to_df(annotations: List[Annotation], text_title, ac_name, columns: AnnotationColumns = None) -> pd.DataFrame:
+    if not annotations:
+        return pd.DataFrame(columns=[column for column in df_columns if column != 'properties'])
+
+    if columns is None:
+        columns = AnnotationColumns(annotations)
+    annotation_count = len(annotations)
+
+    # the names and paths of the tags, indexed by tag code
+    tag_codes = columns.tag_codes
+    tag_names = np.empty(len(columns.tag_uuids), dtype=object)
+    tag_paths = np.empty(len(columns.tag_uuids), dtype=object)
+    for tag_code, index in zip(*np.unique(tag_codes, return_index=True)):
+        tag_names[tag_code] = annotations[index].tag.name
+        tag_paths[tag_code] = annotations[index].tag.full_path
+
+    # slice the annotated texts and their contexts from the document, all annotations share the plain text and context size
+    plain_text = annotations[0]._plain_text
+    context = annotations[0]._context
+    start_points = columns.start_points.tolist()
+    end_points = columns.end_points.tolist()
+    texts = [plain_text[start:end] for start, end in zip(columns.segment_starts.tolist(), columns.segment_ends.tolist())]
+    if len(texts) != annotation_count:
+        # join the segments of discontinuous annotations
+        segment_offsets = columns.segment_offsets.tolist()
+        texts = [' '.join(texts[segment_offsets[index]:segment_offsets[index + 1]]) for index in range(annotation_count)]
+
+    df = pd.DataFrame({
+        'document': pd.Categorical.from_codes(np.zeros(annotation_count, dtype=np.int8), categories=[text_title]),
+        'annotation collection': pd.Categorical.from_codes(np.zeros(annotation_count, dtype=np.int8), categories=[ac_name]),
+        'annotator': pd.Categorical(np.array(columns.authors, dtype=object)[columns.author_codes]),
+        'tag': pd.Categorical(tag_names[tag_codes]),
+        'tag_path': tag_paths[tag_codes],
+        'left_context': clean_texts([plain_text[start - context:start] for start in start_points]),
+        'annotation': clean_texts(texts),
+        'right_context': clean_texts([plain_text[end:end + context] for end in end_points]),
+        'start_point': columns.start_points,
+        'end_point': columns.end_points,
+        'date': columns.to_datetime()
+    })
 
     # create property columns
-    df = split_property_dict_to_column(df)
-
-    # clean annotations
-    df['left_context'] = df['left_context'].apply(clean_text_in_ac_df)
-    df['annotation'] = df['annotation'].apply(clean_text_in_ac_df)
-    df['right_context'] = df['right_context'].apply(clean_text_in_ac_df)
+    for prop, values in get_property_columns([a.properties for a in annotations]).items():
+        df[f'prop:{prop}'] = values
 
     return df
 
@@ -145,12 +202,16 @@ class AnnotationCollection:
         ac_uuid (str): The annotation collection's UUID
         catma_project (CatmaProject): The parent CatmaProject
         context (int, optional): The text span to be considered for the annotation context. Defaults to 50.
+        lazy (bool, optional): If `True` only the annotation collection's header gets loaded. The document, the annotations\
+            and the data frame get loaded the first time they are accessed. Defaults to False.
+        compact (bool, optional): If `True` the annotations don't keep their raw JSON data in memory, see `Annotation`.\
+            Defaults to False.
 
     Raises:
         FileNotFoundError: If the path of the annotation collection's header.json does not exist.
     """
 
-    def __init__(self, ac_uuid: str, catma_project, context: int = 50):
+    def __init__(self, ac_uuid: str, catma_project, context: int = 50, lazy: bool = False, compact: bool = False):
         #: The annotation collection's UUID.
         self.uuid: str = ac_uuid
 
@@ -163,9 +224,13 @@ class AnnotationCollection:
         #: The annotation collection's directory.
         self.directory: str = f'{catma_project.uuid}/collections/{self.uuid}/'
 
+        # absolute, so that the annotation collection doesn't depend on the current working directory
+        self._project_path: str = catma_project.project_path
+
         try:
-            with open(self.directory + 'header.json', 'r', encoding='utf-8', newline='') as header_json:
-                self.header: str = json.load(header_json)
+            self.header: str = _json.loads(
+                catma_project.storage.read_bytes(f'{self._project_path}/collections/{self.uuid}/header.json')
+            )
         except FileNotFoundError:
             raise FileNotFoundError(
                 f"The annotation collection at this path could not be found: {self.directory}\n\
@@ -177,35 +242,181 @@ class AnnotationCollection:
         #: The UUID of the annotation collection's document.
         self.plain_text_id: str = self.header['sourceDocumentId']
 
-        #: The document of the annotation collection as a gitma.Text object.
-        self.text: Text = Text(
-            project_uuid=catma_project.uuid,
-            document_uuid=self.plain_text_id
-        )
-
         #: The document's version.
         self.text_version: str = self.header.get('sourceDocumentVersion')
 
-        if os.path.isdir(self.directory + 'annotations/'):
-            #: List of annotations in annotation collection as gitma.Annotation objects.
-            self.annotations: List[Annotation] = sorted(list(load_annotations(
-                catma_project=catma_project,
-                ac=self,
-                context=context
-            )))
-
-            #: Tags found in the annotation collection as a list of gitma.Tag objects.
-            self.tags: List[Tag] = [an.tag for an in self.annotations]
-
-            #: Annotations as a pandas.DataFrame.
-            self.df: pd.DataFrame = ac_to_df(
-                annotations=self.annotations,
-                text_title=self.text.title,
-                ac_name=self.name
+        self._catma_project = catma_project
+        self._context: int = context
+        self._compact: bool = compact
+
+        self._text: Text = None
+        self._annotations: List[Annotation] = None
+        self._columns: AnnotationColumns = None
+        self._tags: List[Tag] = None
+        self._df: pd.DataFrame = None
+
+        if not lazy:
+            # accessing the properties loads the document, the annotations and the data frame
+            self.text
+            self.df
+
+    def _has_annotations_directory(self) -> bool:
+        return self._catma_project.storage.isdir(f'{self._project_path}/collections/{self.uuid}/annotations/')
+
+    @property
+    def text(self) -> Text:
+        """The document of the annotation collection as a gitma.Text object."""
+        if self._text is None:
+            self._text = self._catma_project.document_cache.get(document_uuid=self.plain_text_id)
+        return self._text
+
+    @text.setter
+    def text(self, text: Text) -> None:
+        self._text = text
+
+    @property
+    def annotations(self) -> List[Annotation]:
+        """List of annotations in annotation collection as gitma.Annotation objects."""
+        if self._annotations is None:
+            if self._has_annotations_directory():
+                annotations = list(load_annotations(
+                    catma_project=self._catma_project,
+                    ac=self,
+                    context=self._context
+                ))
+            else:
+                annotations = []
+            # sort the annotations by their start points
+            columns = AnnotationColumns(annotations)
+            order = columns.sort_order()
+            self._annotations = [annotations[index] for index in order]
+            self._columns = columns.take(order)
+        return self._annotations
+
+    @annotations.setter
+    def annotations(self, annotations: List[Annotation]) -> None:
+        self._annotations = annotations
+        self._columns = None
+
+    @property
+    def columns(self) -> AnnotationColumns:
+        """The annotations in a columnar representation as gitma.AnnotationColumns, in the order of `annotations`."""
+        if self._columns is None:
+            self._columns = AnnotationColumns(self.annotations)
+        return self._columns
+
+    @property
+    def tags(self) -> List[Tag]:
+        """Tags found in the annotation collection as a list of gitma.Tag objects."""
+        if self._tags is None:
+            self._tags = [an.tag for an in self.annotations]
+        return self._tags
+
+    @tags.setter
+    def tags(self, tags: List[Tag]) -> None:
+        self._tags = tags
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """Annotations as a pandas.DataFrame."""
+        if self._df is None:
+            if self._has_annotations_directory():
+                self._df = ac_to_df(
+                    annotations=self.annotations,
+                    text_title=self.text.title,
+                    ac_name=self.name,
+                    columns=self.columns
+                )
+            else:
+                self._df = pd.DataFrame(columns=df_columns)
+        return self._df
+
+    @df.setter
+    def df(self, df: pd.DataFrame) -> None:
+        self._df = df
+
+    def iter_records(self) -> Generator[AnnotationRecord, None, None]:
+        """Streams the annotations from the page files as lightweight `AnnotationRecord`s, without loading the annotation collection.
+
+        At most one page file is held in memory at a time, or a single annotation if [ijson](https://github.com/ICRAR/ijson)
+        is installed, so that aggregations can be run over collections that don't fit into memory. The records are yielded
+        in page file order, not sorted by start point like `annotations`. The project's annotation filter is applied, see
+        `gitma.AnnotationFilter`.
+
+        Yields:
+            AnnotationRecord: The annotation records.
+        """
+        if not self._has_annotations_directory():
+            return
+        annotation_filter = self._catma_project.annotation_filter
+        if annotation_filter is not None and not annotation_filter.matches_document(
+                document_uuid=self.plain_text_id, title=self.text.title):
+            return
+        yield from iter_annotation_records(
+            annotations_directory=f'{self._project_path}/collections/{self.uuid}/annotations/',
+            annotation_collection=self.name,
+            tagset_dict=self._catma_project.tagset_dict,
+            storage=self._catma_project.storage,
+            annotation_filter=annotation_filter
+        )
+
+    def reload_page_files(self, page_file_names: List[str]) -> None:
+        """Reloads the given annotation page files after they have been changed on disk, e.g. by a `git pull`.
+        Only the annotations of these page files get parsed, the annotations, tags and data frame of the annotation collection
+        are patched accordingly. Page files that don't exist anymore are removed from the annotation collection.
+
+        Args:
+            page_file_names (List[str]): The file names of the page files within the collection's annotations directory.
+        """
+        if self._annotations is None:
+            # nothing has been loaded yet, the current page files will be loaded on access
+            return
+
+        base_dir = f'{self._project_path}/collections/{self.uuid}/annotations/'
+        page_file_paths = {base_dir + page_file_name for page_file_name in page_file_names}
+
+        keep = [an.page_file_path not in page_file_paths for an in self._annotations]
+        new_annotations = list(load_annotations(
+            catma_project=self._catma_project,
+            ac=self,
+            context=self._context,
+            page_file_names=[
+                page_file_name for page_file_name in page_file_names
+                if self._catma_project.storage.isfile(base_dir + page_file_name)
+            ]
+        ))
+        self._patch_annotations(keep=keep, new_annotations=new_annotations)
+
+    def _patch_annotations(self, keep: List[bool], new_annotations: List[Annotation]) -> None:
+        # keeps the loaded annotations where keep is True, adds new_annotations and restores the order of a full load
+        annotations = [an for an, keep_an in zip(self._annotations, keep) if keep_an] + new_annotations
+        new_columns = AnnotationColumns(new_annotations)
+        columns = AnnotationColumns.concatenate([self.columns.take(np.array(keep, dtype=bool)), new_columns])
+        order = columns.sort_order()
+        self._annotations = [annotations[index] for index in order]
+        self._columns = columns.take(order)
+        self._tags = None
+
+        if self._df is None or 'properties' in self._df.columns:
+            # no data frame has been built from page files yet
+            self._df = None
+            return
+
+        df = self._df[keep]
+        if new_annotations:
+            df = pd.concat(
+                [df, ac_to_df(annotations=new_annotations, text_title=self.text.title, ac_name=self.name, columns=new_columns)],
+                ignore_index=True
             )
-        else:
-            self.annotations: list = []
-            self.df: pd.DataFrame = pd.DataFrame(columns=df_columns)
+            # properties that are missing in either part are filled like in get_property_columns
+            for col in df.columns:
+                if col.startswith('prop:'):
+                    df[col] = [value if isinstance(value, list) else ['nan'] for value in df[col]]
+        df = df.iloc[order].reset_index(drop=True)
+        # the parts may have different categories
+        for col in categorical_df_columns:
+            df[col] = pd.Categorical(np.asarray(df[col], dtype=object))
+        self._df = df
 
     def __repr__(self):
         return f"AnnotationCollection(Name: {self.name}, Document: {self.text.title}, Length: {len(self)})"
@@ -254,6 +465,7 @@ class AnnotationCollection:
         Returns:
             pd.DataFrame: A duplicate of the annotation collection's DataFrame.
         """
+        from gitma._vizualize import duplicate_rows
         try:
             return duplicate_rows(ac_df=self.df, property_col=prop)
         except KeyError:
@@ -262,21 +474,30 @@ class AnnotationCollection:
             raise ValueError(
                 f"Given property doesn't exist. Choose one of these: {prop_cols}")
 
-    def push_annotations(self, commit_message: str = 'new annotations') -> None:
-        """Process `git add .`, `git commit` and `git push` for a single annotation collection.
+    def push_annotations(self, commit_message: str = 'new annotations', credentials=None) -> None:
+        """Commits the changed page files of this annotation collection and pushes them, see `CatmaProject.push_annotations`
+        to push several annotation collections at once.
 
-        *Note*: Works only if git is installed and the CATMA access token is stored in the **git
-        credential manager**.
+        *Note*: Without credentials, pushing works only if git is installed and the CATMA access token is stored in the **git
+        credential manager**, from which it is read once.
 
         Args:
             commit_message (str, optional): Customize the commit message. Defaults to 'new annotations'.
+            credentials (optional): pygit2 credentials, e.g. `pygit2.UserPass('none', access_token)`. Defaults to None.
         """
-        cwd = os.getcwd()
-        os.chdir(f'{self.projects_directory}{self.directory}')
-        subprocess.run(['git', 'add', '.'])
-        subprocess.run(['git', 'commit', '-m', commit_message])
-        subprocess.run(['git', 'push', 'origin', 'master'])
-        os.chdir(cwd)
+        from gitma._git import commit_and_push_collections
+
+        results = commit_and_push_collections(
+            project_path=self._project_path,
+            collection_uuids=[self.uuid],
+            message=commit_message,
+            commit_project=False,
+            credentials=credentials
+        )
+        for result in results.values():
+            if isinstance(result, Exception):
+                print(f'WARNING: Failed to push annotations from collection {self.name}: {result}')
+                return
         print(f'Pushed annotations from collection {self.name}.')
     
     def plot_annotations(self, y_axis: str = 'tag', color_prop: str = None):
@@ -289,18 +510,36 @@ class AnnotationCollection:
         Returns:
             go.Figure: Plotly scatter plot.
         """
+        from gitma._vizualize import plot_annotations
         return plot_annotations(ac=self, y_axis=y_axis, color_prop=color_prop)
 
-    def filter_by_tag_path(self, path_element: str) -> pd.DataFrame:
-        """Filters annotation collection data frame for annotations with the given `path_element` in the tag's full path.
+    def filter_by_tag_path(self, path_element: str, match_substring: bool = False) -> pd.DataFrame:
+        """Filters annotation collection data frame for the annotations of the tags named by `path_element` and of all tags
+        below them, using the tagsets' hierarchy index, see `annotations_under`.
+
+        *Note*: `path_element` has to match whole tag names. Up to GitMA 2.0.4 any part of the tag paths was matched,
+        e.g. 'event' selected the tags 'process_event' and 'non_event'. This behaviour is still available with
+        `match_substring=True`, but deprecated.
 
         Args:
-            path_element (str): Any tag name with the used tagsets.
+            path_element (str): Any tag name with the used tagsets, or the end of a tag path like 'parent_tag/child_tag'.
+            match_substring (bool, optional): Deprecated. Whether to select the annotations whose full tag path contains\
+                `path_element` anywhere instead. Defaults to False.
 
         Returns:
             pd.DataFrame: Data frame in the format of the annotation collection data frames.
         """
-        return self.df[self.df.tag_path.str.contains(path_element)]
+        if match_substring:
+            print("WARNING: filter_by_tag_path(match_substring=True) is deprecated, pass whole tag names instead")
+            return self.df[self.df.tag_path.str.contains(path_element)]
+
+        path_element = f"/{path_element.strip('/')}"
+        tag_uuids = {
+            descendant.id for tagset in self._catma_project.tagsets for tag in tagset.tags
+            if tag.full_path.endswith(path_element)
+            for descendant in tagset.descendants(tag, include_self=True)
+        }
+        return self.df[self._get_tag_mask(tag_uuids)]
     
     def plot_scaled_annotations(
             self,
@@ -318,6 +557,7 @@ class AnnotationCollection:
         Raises:
             Exception: _description_
         """
+        from gitma._vizualize import plot_scaled_annotations
         return plot_scaled_annotations(ac=self, tag_scale=tag_scale, bin_size=bin_size, smoothing_window=smoothing_window)
 
     def cooccurrence_network(
@@ -381,6 +621,7 @@ class AnnotationCollection:
         Returns:
             pd.DataFrame: The data as pandas DataFrame.
         """
+        from gitma._vizualize import duplicate_rows
 
         if 'prop:' in tag_col:
             analyze_df = duplicate_rows(self.df, property_col=tag_col)
@@ -411,13 +652,14 @@ class AnnotationCollection:
         Returns:
             pd.DataFrame: DataFrame with properties as index and property values as header.
         """
+        from gitma._vizualize import duplicate_rows
         return pd.DataFrame(
             {col: duplicate_rows(self.df, col)[col].value_counts(
             ) for col in self.df.columns if 'prop:' in col}
         ).T
 
     def get_annotation_by_tag(self, tag_name: str) -> List[Annotation]:
-        """Creates list of all annotations with a given name.
+        """Creates list of all annotations with a given tag name or a tag below it at any depth.
 
         Args:
             tag_name (str): The searched tag's name.
@@ -425,11 +667,39 @@ class AnnotationCollection:
         Returns:
             List[Annotation]: List of annotations as gitma.Annotation objects.
         """
-        return [
-            annotation for annotation in self.annotations
-            if annotation.tag.name == tag_name
-            or annotation.tag.parent is not None and annotation.tag.parent.name == tag_name
-        ]
+        return self.annotations_under(tag_name)
+
+    def annotations_under(self, tag: Union[Tag, str], include_self: bool = True) -> List[Annotation]:
+        """Returns the annotations whose tag is the given tag or a tag below it at any depth, using the tagsets' hierarchy index.
+
+        Args:
+            tag (Union[Tag, str]): A gitma.Tag of the project's tagsets or a tag name. A name selects all tags with this name.
+            include_self (bool, optional): Whether to include the annotations of the tag itself. Defaults to True.
+
+        Returns:
+            List[Annotation]: The annotations in the order of `annotations`.
+        """
+        if isinstance(tag, str):
+            tags = [
+                (tagset, tagset_tag) for tagset in self._catma_project.tagsets for tagset_tag in tagset.tags
+                if tagset_tag.name == tag
+            ]
+        else:
+            tags = [
+                (tagset, tag) for tagset in self._catma_project.tagsets if tagset.tag_dict.get(tag.id) is tag
+            ]
+
+        tag_uuids = {
+            descendant.id for tagset, ancestor in tags
+            for descendant in tagset.descendants(ancestor, include_self=include_self)
+        }
+        return [self.annotations[index] for index in np.flatnonzero(self._get_tag_mask(tag_uuids))]
+
+    def _get_tag_mask(self, tag_uuids: Set[str]) -> np.ndarray:
+        # whether the tag of each annotation is one of the given tags, tested once per distinct tag
+        columns = self.columns
+        category_mask = np.array([tag_uuid in tag_uuids for tag_uuid in columns.tag_uuids], dtype=bool)
+        return category_mask[columns.tag_codes]
 
     def annotate_properties(self, tag: str, prop: str, value: list):
         """Set value for given property. This function uses the `gitma.Annotation.set_property_values()` method.
@@ -439,8 +709,10 @@ class AnnotationCollection:
             prop (str): The property to be annotated.
             value (list): The new property value.
         """
-        for an in self.annotations:
-            an.set_property_values(tag=tag, prop=prop, value=value)
+        # each page file gets rewritten once
+        with self._catma_project.batch():
+            for an in self.annotations:
+                an.set_property_values(tag=tag, prop=prop, value=value)
 
     def rename_property_value(self, tag: str, prop: str, old_value: str, new_value: str):
         """Renames property value of all annotations with the given tag name.
@@ -452,9 +724,11 @@ class AnnotationCollection:
             old_value (str): The old property value that will be replaced.
             new_value (str): The new property value that will replace the old property value.
         """
-        for an in self.annotations:
-            an.modify_property_value(
-                tag=tag, prop=prop, old_value=old_value, new_value=new_value)
+        # each page file gets rewritten once
+        with self._catma_project.batch():
+            for an in self.annotations:
+                an.modify_property_value(
+                    tag=tag, prop=prop, old_value=old_value, new_value=new_value)
 
     def delete_properties(self, tag: str, prop: str):
         """Deletes a property from all annotations with a given tag name.
@@ -463,8 +737,41 @@ class AnnotationCollection:
             tag (str): The annotations tag name.
             prop (str): The name of the property that will be removed.
         """
-        for an in self.annotations:
-            an.delete_property(tag=tag, prop=prop)
+        # each page file gets rewritten once
+        with self._catma_project.batch():
+            for an in self.annotations:
+                an.delete_property(tag=tag, prop=prop)
+
+    def remove_annotations(self, annotations: Union[Callable[[Annotation], bool], Iterable[str]]) -> int:
+        """Removes annotations from the annotation collection's page files, e.g. to clean up after a bad automatic annotation run.
+
+        Each page file gets rewritten once, however many of its annotations are removed, and the annotations, tags and
+        data frame of the annotation collection are patched without reloading it. Within `CatmaProject.batch` the page files
+        get rewritten when the batch ends.
+
+        Args:
+            annotations (Union[Callable[[Annotation], bool], Iterable[str]]): Either a function that returns `True` for\
+                the annotations to remove, or the UUIDs of the annotations to remove.
+
+        Returns:
+            int: The number of removed annotations.
+        """
+        if callable(annotations):
+            remove = [bool(annotations(an)) for an in self.annotations]
+        else:
+            uuids = set(annotations)
+            remove = [an.uuid in uuids for an in self.annotations]
+
+        if not any(remove):
+            return 0
+
+        with self._catma_project.batch() as batch:
+            for an, remove_an in zip(self.annotations, remove):
+                if remove_an:
+                    batch.remove(an.page_file_path, an.uuid)
+        self._patch_annotations(keep=[not remove_an for remove_an in remove], new_annotations=[])
+
+        return sum(remove)
 
     def to_stanford_tsv(
         self,
@@ -483,6 +790,7 @@ class AnnotationCollection:
         """
         if tags == 'all':
             tags = list(self.df['tag'].unique())
+        from gitma._export_annotations import to_stanford_tsv
         to_stanford_tsv(ac=self, tags=tags, file_name=file_name, spacy_model=spacy_model)
     
     def write_annotation_csv(
@@ -574,31 +882,25 @@ class AnnotationCollection:
         annotation_table = pd.read_csv(filename, sep=";")
         an_dict = self.annotation_dict()
 
-        
-        cwd = os.getcwd()
-        os.chdir(self.projects_directory)
         annotation_counter = 0
         missed_annotation_counter = 0
-        for _, row in annotation_table.iterrows():
-            try:
-                if isinstance(row['values'], str):    # test if any property values are defined
-                    an_dict[row['id']].set_property_values(
-                        tag=row['tag'],
-                        prop=row['property'],
-                        value=row['values'].split(',')
-                    )
-                    annotation_counter += 1
-                else:
+        with self._catma_project.batch():
+            for _, row in annotation_table.iterrows():
+                try:
+                    if isinstance(row['values'], str):    # test if any property values are defined
+                        an_dict[row['id']].set_property_values(
+                            tag=row['tag'],
+                            prop=row['property'],
+                            value=row['values'].split(',')
+                        )
+                        annotation_counter += 1
+                    else:
+                        missed_annotation_counter += 1
+                except KeyError:
                     missed_annotation_counter += 1
-            except KeyError:
-                missed_annotation_counter += 1
         
         if push_to_gitlab:
-            os.chdir(self.directory)
-            subprocess.run(['git', 'add', '.'])
-            subprocess.run(['git', 'commit', '-m', 'new property annotations'])
-            subprocess.run(['git', 'push', 'origin', 'HEAD:master'])
-        os.chdir(cwd)
+            self.push_annotations(commit_message='new property annotations')
         print(f"Updated values for {annotation_counter} annotations.")
         if not push_to_gitlab:
             print(f'Your annotations are stored in {self.directory}')
@@ -0,0 +1,265 @@
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from gitma.annotation import Annotation, LEGACY_TIMESTAMP_UTC_OFFSET, parse_date
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# the timestamp formats accepted by `gitma.annotation.parse_date` that pandas can parse in bulk
+TIMESTAMP_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{1,6}(Z|[+-]\d{2}:?\d{2})')
+LEGACY_TIMESTAMP_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}')
+
+
+def encode(values: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+    """Encodes values as integer codes into a list of categories in the order of their first occurrence.
+
+    Args:
+        values (Sequence[str]): The values.
+
+    Returns:
+        Tuple[np.ndarray, List[str]]: The codes and the categories.
+    """
+    category_codes: Dict[str, int] = {}
+    codes = np.fromiter(
+        (category_codes.setdefault(value, len(category_codes)) for value in values),
+        dtype=np.int32,
+        count=len(values)
+    )
+    return codes, list(category_codes)
+
+
+def parse_utc_offset(utc_offset: str) -> int:
+    """Converts a UTC offset like '+02:00', '+0200' or 'Z' to seconds."""
+    if utc_offset == 'Z':
+        return 0
+    seconds = int(utc_offset[1:3]) * 3600 + int(utc_offset[-2:]) * 60
+    return -seconds if utc_offset[0] == '-' else seconds
+
+
+def parse_dates(timestamps: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Parses many annotation timestamps at once, with the same results as `gitma.annotation.parse_date`.
+
+    Args:
+        timestamps (Sequence[str]): The timestamps as stored in the annotations' JSON.
+
+    Raises:
+        ValueError: If a timestamp is invalid.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Microseconds since the epoch (UTC) and UTC offsets in seconds.
+    """
+    dates = np.empty(len(timestamps), dtype=np.int64)
+    utc_offsets = np.empty(len(timestamps), dtype=np.int32)
+
+    utc_offset_cache: Dict[str, int] = {}
+    regular_indices = []
+    regular_timestamps = []
+    for index, timestamp in enumerate(timestamps):
+        match = TIMESTAMP_PATTERN.fullmatch(timestamp)
+        if match:
+            utc_offset = match.group(1)
+        elif LEGACY_TIMESTAMP_PATTERN.fullmatch(timestamp):
+            utc_offset = LEGACY_TIMESTAMP_UTC_OFFSET
+            timestamp += utc_offset
+        else:
+            # any other format strptime accepts, parsed one by one
+            date = parse_date(timestamp)
+            dates[index] = (date - EPOCH) // timedelta(microseconds=1)
+            utc_offsets[index] = date.utcoffset().total_seconds()
+            continue
+
+        if utc_offset not in utc_offset_cache:
+            utc_offset_cache[utc_offset] = parse_utc_offset(utc_offset)
+        utc_offsets[index] = utc_offset_cache[utc_offset]
+        regular_indices.append(index)
+        regular_timestamps.append(timestamp)
+
+    if regular_timestamps:
+        dates[regular_indices] = pd.to_datetime(regular_timestamps, format='ISO8601', utc=True).as_unit('us').asi8
+
+    return dates, utc_offsets
+
+
+def recode(codes: np.ndarray, categories: List[str], new_categories: List[str]) -> np.ndarray:
+    """Maps codes into `categories` to codes into `new_categories`, which have to include all of `categories`."""
+    new_category_codes = {category: code for code, category in enumerate(new_categories)}
+    mapping = np.array([new_category_codes[category] for category in categories], dtype=np.int32)
+    return mapping[codes] if len(codes) else codes
+
+
+class AnnotationColumns:
+    """Columnar representation of the annotations of an annotation collection.
+
+    Row `i` of every array describes the annotation at index `i` of `AnnotationCollection.annotations`.
+    Strings like authors and tag UUIDs are stored once as categories and referenced by integer codes,
+    so that vectorized code can work on the arrays without touching the `Annotation` objects.
+
+    Args:
+        annotations (List[Annotation]): The annotations.
+    """
+    def __init__(self, annotations: List[Annotation]):
+        annotation_count = len(annotations)
+
+        #: The annotations' start points as int64 array.
+        self.start_points: np.ndarray = np.fromiter(
+            (an.start_point for an in annotations), dtype=np.int64, count=annotation_count
+        )
+
+        #: The annotations' end points as int64 array.
+        self.end_points: np.ndarray = np.fromiter(
+            (an.end_point for an in annotations), dtype=np.int64, count=annotation_count
+        )
+
+        #: Codes into `authors`.
+        self.author_codes: np.ndarray
+        #: The distinct authors.
+        self.authors: List[str]
+        self.author_codes, self.authors = encode([an.author for an in annotations])
+
+        #: Codes into `tag_uuids`.
+        self.tag_codes: np.ndarray
+        #: The UUIDs of the distinct tags.
+        self.tag_uuids: List[str]
+        self.tag_codes, self.tag_uuids = encode([an._tag_uuid for an in annotations])
+
+        #: Codes into `tagset_uuids`.
+        self.tagset_codes: np.ndarray
+        #: The UUIDs of the distinct tagsets.
+        self.tagset_uuids: List[str]
+        self.tagset_codes, self.tagset_uuids = encode([an._tagset_uuid for an in annotations])
+
+        #: Codes into `page_file_paths`.
+        self.page_file_codes: np.ndarray
+        #: The paths of the distinct page files.
+        self.page_file_paths: List[str]
+        self.page_file_codes, self.page_file_paths = encode([an.page_file_path for an in annotations])
+
+        #: The annotations' creation dates as microseconds since the epoch (UTC), int64 array.
+        self.dates: np.ndarray
+        #: The UTC offsets of the annotations' creation dates in seconds, int32 array.
+        self.utc_offsets: np.ndarray
+        self.dates, self.utc_offsets = parse_dates([an._date_string for an in annotations])
+
+        #: Offsets into `segment_starts` and `segment_ends`: the segments of annotation `i` are the ones
+        #: from `segment_offsets[i]` to `segment_offsets[i + 1]`. Length: number of annotations + 1.
+        self.segment_offsets: np.ndarray = np.zeros(annotation_count + 1, dtype=np.int64)
+        np.cumsum(
+            np.fromiter((len(an._spans) for an in annotations), dtype=np.int64, count=annotation_count),
+            out=self.segment_offsets[1:]
+        )
+
+        #: The start points of all annotation segments (selectors).
+        self.segment_starts: np.ndarray = np.fromiter(
+            (start for an in annotations for start, _ in an._spans), dtype=np.int64, count=self.segment_offsets[-1]
+        )
+
+        #: The end points of all annotation segments (selectors).
+        self.segment_ends: np.ndarray = np.fromiter(
+            (end for an in annotations for _, end in an._spans), dtype=np.int64, count=self.segment_offsets[-1]
+        )
+
+    def __len__(self) -> int:
+        return len(self.start_points)
+
+    def __repr__(self):
+        return f"AnnotationColumns(Annotations: {len(self)}, Authors: {len(self.authors)}, Tags: {len(self.tag_uuids)})"
+
+    def take(self, indices: np.ndarray) -> 'AnnotationColumns':
+        """Returns the rows at the given indices as new `AnnotationColumns`, sharing the categories.
+
+        Args:
+            indices (np.ndarray): Integer indices or a boolean mask.
+
+        Returns:
+            AnnotationColumns: The selected rows.
+        """
+        indices = np.arange(len(self))[np.asarray(indices)]
+
+        columns = AnnotationColumns.__new__(AnnotationColumns)
+        for name in ('start_points', 'end_points', 'author_codes', 'tag_codes', 'tagset_codes', 'page_file_codes', 'dates', 'utc_offsets'):
+            setattr(columns, name, getattr(self, name)[indices])
+        columns.authors = self.authors
+        columns.tag_uuids = self.tag_uuids
+        columns.tagset_uuids = self.tagset_uuids
+        columns.page_file_paths = self.page_file_paths
+
+        segment_counts = self.segment_offsets[indices + 1] - self.segment_offsets[indices]
+        columns.segment_offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(segment_counts, out=columns.segment_offsets[1:])
+        # the positions of the selected segments in the segment arrays
+        segment_indices = np.repeat(self.segment_offsets[indices] - columns.segment_offsets[:-1], segment_counts) \
+            + np.arange(columns.segment_offsets[-1])
+        columns.segment_starts = self.segment_starts[segment_indices]
+        columns.segment_ends = self.segment_ends[segment_indices]
+
+        return columns
+
+    @staticmethod
+    def concatenate(columns_list: List['AnnotationColumns']) -> 'AnnotationColumns':
+        """Concatenates the rows of several `AnnotationColumns`, merging their categories.
+
+        Args:
+            columns_list (List[AnnotationColumns]): The columns to be concatenated, at least one.
+
+        Returns:
+            AnnotationColumns: The concatenated columns.
+        """
+        columns = AnnotationColumns.__new__(AnnotationColumns)
+        for name in ('start_points', 'end_points', 'dates', 'utc_offsets', 'segment_starts', 'segment_ends'):
+            setattr(columns, name, np.concatenate([getattr(part, name) for part in columns_list]))
+
+        for codes_name, categories_name in (
+                ('author_codes', 'authors'),
+                ('tag_codes', 'tag_uuids'),
+                ('tagset_codes', 'tagset_uuids'),
+                ('page_file_codes', 'page_file_paths')):
+            categories = list(dict.fromkeys(
+                category for part in columns_list for category in getattr(part, categories_name)
+            ))
+            setattr(columns, categories_name, categories)
+            setattr(columns, codes_name, np.concatenate([
+                recode(getattr(part, codes_name), getattr(part, categories_name), categories) for part in columns_list
+            ]))
+
+        segment_offsets = [np.zeros(1, dtype=np.int64)]
+        segment_count = 0
+        for part in columns_list:
+            segment_offsets.append(part.segment_offsets[1:] + segment_count)
+            segment_count += part.segment_offsets[-1]
+        columns.segment_offsets = np.concatenate(segment_offsets)
+
+        return columns
+
+    def sort_order(self) -> np.ndarray:
+        """Returns the indices that sort the rows by start point and, for equal start points, by page file path,
+        i.e. the order of `AnnotationCollection.annotations`.
+
+        Returns:
+            np.ndarray: The indices.
+        """
+        page_file_ranks = np.argsort(np.argsort(np.array(self.page_file_paths, dtype=object)))
+        return np.lexsort((page_file_ranks[self.page_file_codes], self.start_points))
+
+    def to_datetime(self) -> pd.Series:
+        """Returns the annotations' creation dates as a pandas Series.
+
+        If all dates have the same UTC offset the Series has a timezone aware datetime dtype,
+        otherwise it holds `datetime.datetime` objects, just like a Series created from `Annotation.date`.
+
+        Returns:
+            pd.Series: The dates.
+        """
+        utc_offsets = np.unique(self.utc_offsets)
+        if len(utc_offsets) == 1:
+            return pd.Series(
+                pd.to_datetime(self.dates, unit='us', utc=True).tz_convert(timezone(timedelta(seconds=int(utc_offsets[0]))))
+            )
+        return pd.Series([
+            (EPOCH + timedelta(microseconds=int(date))).astimezone(timezone(timedelta(seconds=int(utc_offset))))
+            for date, utc_offset in zip(self.dates, self.utc_offsets)
+        ], dtype=object)
@@ -0,0 +1,141 @@
+"""
+Filters that select the annotations to load, applied to the raw annotation data of the page files.
+"""
+import hashlib
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Set, Union
+
+from gitma.annotation import get_author, get_date_string, get_tag_uuid, parse_date
+from gitma.tag import Tag
+
+
+def _to_datetime(value: Union[datetime, str, None]) -> Union[datetime, None]:
+    # timestamps of annotations are timezone aware, naive datetimes are interpreted as UTC to make them comparable
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class AnnotationFilter:
+    """Selects the annotations that get loaded, e.g. by `CatmaProject(annotation_filter=...)`.
+
+    The filter is applied to the raw annotation data read from the page files, before `Annotation` objects,
+    `AnnotationRecord`s or data frame rows are created, so the time and memory needed to load a project scale with the
+    selected annotations. Annotation collections of documents that are not selected are still loaded, but their page files
+    are not read at all.
+
+    All given criteria have to be met. Criteria that are `None` select everything.
+
+    Args:
+        tags (Iterable[Union[str, Tag]], optional): Tags given as `Tag` objects, tag names or full tag paths like '/parent/child'.\
+            Defaults to None.
+        include_child_tags (bool, optional): Whether the tags below the given tags are selected as well. Defaults to False.
+        authors (Iterable[str], optional): The annotation authors. Defaults to None.
+        start_date (Union[datetime, str], optional): The earliest creation time of the annotations, as datetime or ISO string.\
+            Timezone-naive values are interpreted as UTC. Defaults to None.
+        end_date (Union[datetime, str], optional): The latest creation time of the annotations, see start_date. Defaults to None.
+        documents (Iterable[str], optional): The titles or UUIDs of the annotated documents. Defaults to None.
+    """
+    def __init__(
+            self,
+            tags: Iterable[Union[str, Tag]] = None,
+            include_child_tags: bool = False,
+            authors: Iterable[str] = None,
+            start_date: Union[datetime, str] = None,
+            end_date: Union[datetime, str] = None,
+            documents: Iterable[str] = None):
+        #: The selected tags as tag UUIDs, tag names or full tag paths.
+        self.tags: Set[str] = None if tags is None else {tag.id if isinstance(tag, Tag) else tag for tag in tags}
+
+        #: Whether the tags below the selected tags are selected as well.
+        self.include_child_tags: bool = include_child_tags
+
+        #: The selected authors.
+        self.authors: Set[str] = None if authors is None else set(authors)
+
+        #: The earliest creation time of the selected annotations.
+        self.start_date: datetime = _to_datetime(start_date)
+
+        #: The latest creation time of the selected annotations.
+        self.end_date: datetime = _to_datetime(end_date)
+
+        #: The titles or UUIDs of the selected documents.
+        self.documents: Set[str] = None if documents is None else set(documents)
+
+    def __repr__(self):
+        return (
+            f'AnnotationFilter(Tags: {self.tags}, Include Child Tags: {self.include_child_tags}, Authors: {self.authors}, '
+            f'Start Date: {self.start_date}, End Date: {self.end_date}, Documents: {self.documents})'
+        )
+
+    @property
+    def cache_key(self) -> str:
+        """A short hash of the criteria, to cache annotation collections loaded with different filters separately."""
+        criteria = [
+            sorted(self.tags) if self.tags is not None else None,
+            self.include_child_tags,
+            sorted(self.authors) if self.authors is not None else None,
+            self.start_date.isoformat() if self.start_date else None,
+            self.end_date.isoformat() if self.end_date else None,
+            sorted(self.documents) if self.documents is not None else None,
+        ]
+        return hashlib.sha1(repr(criteria).encode('utf-8')).hexdigest()[:16]
+
+    def matches_document(self, document_uuid: str, title: str) -> bool:
+        """Tests whether the annotations of a document are selected."""
+        return self.documents is None or document_uuid in self.documents or title in self.documents
+
+    def get_tag_uuids(self, tagset_dict: dict) -> Union[Set[str], None]:
+        """Resolves the selected tags to the UUIDs of the matching tags of a project.
+
+        Args:
+            tagset_dict (dict): The project's tagsets with their UUIDs as keys.
+
+        Returns:
+            Union[Set[str], None]: The tag UUIDs, or `None` if the filter doesn't select by tag.
+        """
+        if self.tags is None:
+            return None
+
+        tag_uuids = set()
+        for tagset in tagset_dict.values():
+            for tag in tagset.tags:
+                if tag.id in self.tags or tag.name in self.tags or tag.full_path in self.tags:
+                    if self.include_child_tags:
+                        tag_uuids.update(child_tag.id for child_tag in tagset.descendants(tag, include_self=True))
+                    else:
+                        tag_uuids.add(tag.id)
+        return tag_uuids
+
+    def get_predicate(self, tagset_dict: dict) -> Callable[[dict], bool]:
+        """Compiles the filter for a project into a function that tests the raw data of an annotation, as read from a page file.
+
+        Args:
+            tagset_dict (dict): The project's tagsets with their UUIDs as keys.
+
+        Returns:
+            Callable[[dict], bool]: The function, which returns whether an annotation is selected.
+        """
+        tests = []
+
+        tag_uuids = self.get_tag_uuids(tagset_dict)
+        if tag_uuids is not None:
+            tests.append(lambda annotation_data: get_tag_uuid(annotation_data) in tag_uuids)
+
+        authors = self.authors
+        if authors is not None:
+            tests.append(lambda annotation_data: get_author(annotation_data) in authors)
+
+        start_date, end_date = self.start_date, self.end_date
+        if start_date is not None or end_date is not None:
+            def test_date(annotation_data: dict) -> bool:
+                date = parse_date(get_date_string(annotation_data))
+                return (start_date is None or date >= start_date) and (end_date is None or date <= end_date)
+            tests.append(test_date)
+
+        return lambda annotation_data: all(test(annotation_data) for test in tests)
+
@@ -0,0 +1,141 @@
+"""
+Lightweight annotation records for streaming over annotation page files with bounded memory.
+"""
+import io
+import os
+from typing import Dict, Generator, List, NamedTuple, Tuple
+
+from gitma import _json
+from gitma.annotation import (
+    get_author, get_date_string, get_end_point, get_start_point, get_tag_uuid, get_tagset_uuid, get_user_properties,
+    get_uuid
+)
+from gitma.annotation_filter import AnnotationFilter
+from gitma.tag import Tag
+from gitma._page_files import is_page_file_name, warn_about_journal
+from gitma._storage import file_system_storage, get_storage
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+# errors raised for page files that aren't valid JSON
+PAGE_FILE_ERRORS = (_json.JSONDecodeError,) if ijson is None else (_json.JSONDecodeError, ijson.JSONError)
+
+
+class AnnotationRecord(NamedTuple):
+    """An annotation as read from its page file, without the annotated text and the raw JSON data.
+
+    Yielded by `AnnotationCollection.iter_records` and `CatmaProject.iter_annotations(stream=True)`.
+    """
+    #: The annotation's UUID.
+    uuid: str
+
+    #: The name of the annotation collection.
+    annotation_collection: str
+
+    #: The annotation's author.
+    author: str
+
+    #: The annotation's tag.
+    tag: Tag
+
+    #: The annotation's start point (character index) in the plain text.
+    start_point: int
+
+    #: The annotation's end point (character index) in the plain text.
+    end_point: int
+
+    #: The start and end points of the annotation's segments.
+    spans: Tuple[Tuple[int, int], ...]
+
+    #: The annotation's properties with property names as keys and the property values as list.
+    properties: Dict[str, List[str]]
+
+    #: The unparsed creation timestamp, see `gitma.annotation.parse_date`.
+    timestamp: str
+
+    #: The path of the annotation page file.
+    page_file_path: str
+
+
+def iter_page_file(page_file_path: str, storage=None) -> Generator[dict, None, None]:
+    """Yields the annotations in a page file as dicts.
+
+    If [ijson](https://github.com/ICRAR/ijson) is installed the page file gets parsed incrementally,
+    so that only one annotation at a time is held in memory, otherwise the page file is parsed as a whole.
+
+    Args:
+        page_file_path (str): The path of the page file.
+        storage (optional): The storage the page file is read from, see `gitma._storage`. If `None` it is read from\
+            the file system. Defaults to None.
+
+    Yields:
+        dict: The annotation data.
+    """
+    storage = get_storage(storage)
+    if storage is file_system_storage:
+        page_file = open(page_file_path, 'rb')
+    else:
+        # blobs from the Git object database are read into memory as a whole, but still parsed incrementally
+        page_file = io.BytesIO(storage.read_bytes(page_file_path))
+
+    with page_file:
+        if ijson is not None:
+            yield from ijson.items(page_file, 'item')
+        else:
+            yield from _json.load(page_file)
+
+
+def iter_annotation_records(
+        annotations_directory: str,
+        annotation_collection: str,
+        tagset_dict: dict,
+        storage=None,
+        annotation_filter: AnnotationFilter = None) -> Generator[AnnotationRecord, None, None]:
+    """Yields the annotations of all page files in a directory as `AnnotationRecord`s, one page file after another.
+
+    Args:
+        annotations_directory (str): The annotations directory of an annotation collection.
+        annotation_collection (str): The name of the annotation collection.
+        tagset_dict (dict): The project's tagsets with their UUIDs as keys.
+        storage (optional): The storage the page files are read from, see `gitma._storage`. If `None` they are read from\
+            the file system. Defaults to None.
+        annotation_filter (AnnotationFilter, optional): If given, only the annotations selected by the filter's tag, author\
+            and date criteria are yielded. Defaults to None.
+
+    Yields:
+        AnnotationRecord: The annotation records in the order of the page files and within them.
+    """
+    storage = get_storage(storage)
+    warn_about_journal(annotations_directory, storage)
+
+    predicate = annotation_filter.get_predicate(tagset_dict) if annotation_filter else None
+    for page_file_name in sorted(filter(is_page_file_name, storage.listdir(annotations_directory))):
+        page_file_path = os.path.join(annotations_directory, page_file_name)
+        try:
+            for annotation_data in iter_page_file(page_file_path, storage=storage):
+                if predicate is not None and not predicate(annotation_data):
+                    continue
+                tag = tagset_dict[get_tagset_uuid(annotation_data)].tag_dict[get_tag_uuid(annotation_data)]
+                user_properties = get_user_properties(annotation_data)
+                yield AnnotationRecord(
+                    uuid=get_uuid(annotation_data),
+                    annotation_collection=annotation_collection,
+                    author=get_author(annotation_data),
+                    tag=tag,
+                    start_point=get_start_point(annotation_data),
+                    end_point=get_end_point(annotation_data),
+                    spans=tuple(
+                        (item['selector']['start'], item['selector']['end']) for item in annotation_data['target']['items']
+                    ),
+                    properties={
+                        tag.properties_data[prop]['name']: user_properties[prop] for prop in user_properties
+                    },
+                    timestamp=get_date_string(annotation_data),
+                    page_file_path=page_file_path
+                )
+        except PAGE_FILE_ERRORS as e:
+            print(f"WARNING: Failed to load annotation page file {page_file_path}\nOriginal error: {e}")
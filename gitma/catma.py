@@ -1,8 +1,43 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
-import gitlab
 from gitma.project import CatmaProject
 
 
+def load_local_projects(
+        projects_directory: str,
+        project_names: List[str] = None,
+        workers: int = None,
+        **kwargs) -> Dict[str, CatmaProject]:
+    """Loads several local CATMA projects in a pool of threads.
+
+    Loading a project doesn't change the working directory or any other process-wide state, so the projects can be loaded
+    concurrently. Threads mostly help with the file system and Git I/O, parsing is still bound to one CPU by the GIL.
+
+    Args:
+        projects_directory (str): The directory where the CATMA projects are located.
+        project_names (List[str], optional): The names of the projects to load. If `None` all CATMA projects\
+            in the directory get loaded. Defaults to None.
+        workers (int, optional): The number of projects loaded concurrently. If `None` the projects are loaded\
+            one after another. Defaults to None.
+        **kwargs: Further arguments for `CatmaProject`, e.g. `lazy` or `cache_dir`.
+
+    Returns:
+        Dict[str, CatmaProject]: The projects with their names (excluding the UUID) as keys.
+    """
+    if project_names is None:
+        project_names = [
+            item for item in sorted(os.listdir(projects_directory))
+            if item.startswith('CATMA_') and len(item) > 43 and os.path.isdir(os.path.join(projects_directory, item))
+        ]
+
+    def load_project(project_name: str) -> CatmaProject:
+        return CatmaProject(projects_directory=projects_directory, project_name=project_name, **kwargs)
+
+    with ThreadPoolExecutor(max_workers=workers or 1) as executor:
+        return {project.name: project for project in executor.map(load_project, project_names)}
+
+
 class Catma:
     """Class which represents all projects of a single CATMA user.
 
@@ -14,6 +49,7 @@ class Catma:
         #: The access token of the CATMA account.
         self.gitlab_access_token = gitlab_access_token
 
+        import gitlab
         gl = gitlab.Gitlab(
             url='https://git.catma.de/',
             private_token=gitlab_access_token
@@ -58,17 +94,53 @@ class Catma:
             backup_directory=backup_directory
         )
 
-    def load_all_projects_from_gitlab(self) -> None:
-        """Loads all projects that your CATMA account has access to after creating a local Git clone of these projects."""
-        for project_name in self.project_name_list:
-            self.load_project_from_gitlab(project_name=project_name)
+    def load_all_projects_from_gitlab(self, backup_directory: str = './', workers: int = None, depth: int = 0) -> None:
+        """Loads all projects that your CATMA account has access to after creating a local Git clone of these projects.
+        Existing clones in the backup directory get fetched and fast-forwarded instead of being cloned again.
+        Projects that can't be cloned or updated are skipped with a warning.
+
+        Args:
+            backup_directory (str, optional): Where to clone the CATMA projects. Defaults to './'.
+            workers (int, optional): The number of projects cloned or fetched and then loaded concurrently, see\
+                `load_local_projects`. If `None` the projects are cloned and loaded one after another. Defaults to None.
+            depth (int, optional): If greater than 0, shallow clones with this many commits get created,\
+                which is much faster for projects with a long history. Defaults to 0.
+        """
+        import pygit2
+        from gitma._git import clone_or_fetch_all
+
+        clone_urls = {
+            backup_directory + project.name: project.http_url_to_repo for project in self._gitlab_projects
+        }
+        print(f'Cloning or fetching {len(clone_urls)} project(s) ...')
+        results = clone_or_fetch_all(
+            clone_urls=clone_urls,
+            workers=workers,
+            depth=depth,
+            credentials=pygit2.UserPass('none', self.gitlab_access_token)
+        )
+
+        project_names = []
+        for project in self._gitlab_projects:
+            result = results[backup_directory + project.name]
+            if isinstance(result, Exception):
+                print(f'WARNING: Failed to clone or fetch the project {project.name}\nOriginal error: {result}')
+            else:
+                project_names.append(project.name)
+
+        self.project_dict.update(load_local_projects(
+            projects_directory=backup_directory,
+            project_names=project_names,
+            workers=workers
+        ))
 
     def load_local_project(
             self,
             projects_directory: str,
             project_name: str,
             included_acs: list = None,
-            excluded_acs: list = None) -> None:
+            excluded_acs: list = None,
+            workers: int = None) -> None:
         """Loads a local CATMA project.
 
         Args:
@@ -77,12 +149,14 @@ class Catma:
             included_acs (list, optional): The names of annotation collections to load. If set to None and excluded_acs is also None,\
                 all annotation collections are loaded. Defaults to None.
             excluded_acs (list, optional): The names of annotation collections not to load. Defaults to None.
+            workers (int, optional): The number of processes used to load the annotation collections. Defaults to None.
         """
         self.project_dict[project_name] = CatmaProject(
             projects_directory=projects_directory,
             project_name=project_name,
             included_acs=included_acs,
-            excluded_acs=excluded_acs
+            excluded_acs=excluded_acs,
+            workers=workers
         )
 
     def git_clone_command(self, project_name: str) -> str:
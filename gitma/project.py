@@ -1,33 +1,44 @@
+import contextlib
 import subprocess
 import os
-import json
 import textwrap
-import gitlab
-import pygit2
 import pandas as pd
-import plotly.graph_objects as go
-from typing import Dict, List, Tuple, Union, Generator
-from gitma.text import Text
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Tuple, Union, Generator, TYPE_CHECKING
+from gitma.text import Text, DocumentCache
 from gitma.tagset import Tagset
-from gitma.annotation_collection import AnnotationCollection
+from gitma.annotation_collection import AnnotationCollection, ac_to_df
 from gitma.annotation import Annotation
+from gitma.annotation_record import AnnotationRecord
+from gitma.annotation_filter import AnnotationFilter
 from gitma.tag import Tag
-from gitma._write_annotation import write_annotation_json
-from gitma._gold_annotation import create_gold_annotations
-from gitma._vizualize import plot_interactive, plot_annotation_progression
+from gitma import _json
+from gitma._write_annotation import write_annotation_json, write_annotations
+from gitma._batch import AnnotationBatch
+from gitma._schema import SchemaMigration
+from gitma._cache import get_cache_directory, read_cache_entry, write_cache_entry
+from gitma._storage import file_system_storage, get_storage
+from gitma._page_files import recover_page_files
+from gitma._gold_annotation import create_gold_annotations, create_majority_vote_annotations
 from gitma._metrics import get_annotation_pairs, get_iaa_data, get_confusion_matrix, gamma_agreement
 
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
 
 def load_gitlab_project(
         gitlab_access_token: str,
         project_name: str,
-        backup_directory: str = './') -> str:
-    """Loads a CATMA project from the GitLab backend.
+        backup_directory: str = './',
+        depth: int = 0) -> str:
+    """Loads a CATMA project from the GitLab backend. If a clone of the project already exists in the backup directory,
+    it gets fetched and fast-forwarded instead.
 
     Args:
         gitlab_access_token (str): A valid access token for CATMA's GitLab backend.
         project_name (str): The CATMA project name (or a part thereof - a search is performed in the GitLab backend using this value).
         backup_directory (str, optional): Where to clone the CATMA project. Defaults to './'.
+        depth (int, optional): If greater than 0, a shallow clone with this many commits gets created. Defaults to 0.
 
     Raises:
         Exception: If no CATMA project with the given name could be found.
@@ -35,6 +46,10 @@ def load_gitlab_project(
     Returns:
         str: The GitLab project name.
     """
+    import gitlab
+    import pygit2
+    from gitma._git import clone_or_fetch
+
     gl = gitlab.Gitlab(
         url='https://git.catma.de/',
         private_token=gitlab_access_token
@@ -48,13 +63,11 @@ def load_gitlab_project(
     gitlab_project = gl.projects.get(id=gitlab_project_id)
 
     # clone the project in the defined directory
-    creds = pygit2.UserPass('none', gitlab_access_token)
-    callbacks = pygit2.RemoteCallbacks(credentials=creds)
-    pygit2.clone_repository(
+    clone_or_fetch(
         url=gitlab_project.http_url_to_repo,
         path=backup_directory + gitlab_project.name,
-        bare=False,
-        callbacks=callbacks
+        depth=depth,
+        credentials=pygit2.UserPass('none', gitlab_access_token)
     )
 
     return gitlab_project.name
@@ -94,28 +107,71 @@ def get_local_project_uuid(
         return project_uuids[0]
 
 
-def get_ac_name(project_uuid: str, directory: str) -> str:
+def get_ac_name(project_uuid: str, directory: str, storage=None) -> str:
     """Gets an annotation collection's name.
 
     Args:
-        project_uuid (str): CATMA project UUID
+        project_uuid (str): The path of the CATMA project directory
         directory (str): annotation collection directory
-        test_positive (bool, optional): what should be returned if it is intrinsic markup. Defaults to True.
+        storage (optional): The storage the project is read from, see `gitma._storage`. Defaults to None.
 
     Returns:
         str: annotation collection name
     """
-    with open(f'{project_uuid}/collections/{directory}/header.json', 'r', encoding='utf-8', newline='') as header_input:
-        header_dict = json.load(header_input)
+    header_dict = _json.loads(get_storage(storage).read_bytes(f'{project_uuid}/collections/{directory}/header.json'))
 
     return header_dict['name']
 
 
+def _init_annotation_collection_worker(catma_project) -> None:
+    # each worker process gets the project once instead of once per annotation collection
+    global _worker_project
+    _worker_project = catma_project
+
+
+def _load_annotation_collection_in_worker(ac_uuid: str) -> AnnotationCollection:
+    ac = AnnotationCollection(
+        catma_project=_worker_project,
+        ac_uuid=ac_uuid,
+        compact=_worker_project.compact
+    )
+    _detach_annotation_collection(ac)
+    return ac
+
+
+def _detach_annotation_collection(ac: AnnotationCollection) -> None:
+    """Removes all references to the parent project and its tags from an annotation collection,
+    so that it can be pickled without pickling the whole project along with it.
+    """
+    for an in ac.annotations:
+        an.project = None
+        an.tag = None
+        an._plain_text = None
+    ac.tags = []
+    ac.text = None
+    ac._catma_project = None
+
+
+def _attach_annotation_collection(ac: AnnotationCollection, catma_project) -> None:
+    """Restores the references removed by `_detach_annotation_collection`."""
+    ac._catma_project = catma_project
+    plain_text = ac.text.plain_text
+    for an in ac.annotations:
+        an.project = catma_project
+        an.tag = catma_project.tagset_dict[an._tagset_uuid].tag_dict[an._tag_uuid]
+        an._plain_text = plain_text
+    ac.tags = [an.tag for an in ac.annotations]
+
+
 def load_annotation_collections(
         catma_project,
         included_acs: list = None,
         excluded_acs: list = None,
-        ac_filter_keyword: str = None) -> Tuple[List[AnnotationCollection], Dict[str, AnnotationCollection]]:
+        ac_filter_keyword: str = None,
+        workers: int = None,
+        lazy: bool = False,
+        compact: bool = False,
+        cache_directory: str = None) -> Tuple[List[AnnotationCollection], Dict[str, AnnotationCollection]]:
     """Generates list and dict of CATMA annotation collections.
 
     Args:
@@ -123,44 +179,92 @@ def load_annotation_collections(
         included_acs (list): All listed annotation collections get loaded.
         excluded_acs (list): All listed annotation collections don't get loaded.\
             If neither included nor excluded annotation collections are defined, all annotation collections get loaded.
+        ac_filter_keyword (str): Only annotation collections with the given keyword get loaded.
+        workers (int, optional): The number of worker processes used to load the annotation collections.\
+            If `None` the annotation collections are loaded one after another in the current process. Defaults to None.
+        lazy (bool): If `True` only the headers of the annotation collections get loaded, see `AnnotationCollection`.\
+            Lazy annotation collections are never loaded in worker processes. Defaults to False.
+        compact (bool): If `True` the annotations don't keep their raw JSON data in memory, see `Annotation`. Defaults to False.
+        cache_directory (str, optional): A directory returned by `gitma._cache.get_cache_directory`. Annotation collections found\
+            there are unpickled instead of being parsed, all others get added to it. Ignored for lazy annotation collections.\
+            Defaults to None.
 
     Returns:
         Tuple[List[AnnotationCollection], Dict[str, AnnotationCollection]]: List and dict of annotation collections.
     """
-    collections_directory = catma_project.uuid + '/collections/'
+    collections_directory = catma_project.project_path + '/collections/'
+    storage = catma_project.storage
 
     if included_acs:        # selects annotation collections listed in included_acs
-        annotation_collections = [
-            AnnotationCollection(
-                catma_project=catma_project,
-                ac_uuid=directory
-            ) for directory in os.listdir(collections_directory)
-            if get_ac_name(catma_project.uuid, directory) in included_acs
+        ac_uuids = [
+            directory for directory in storage.listdir(collections_directory)
+            if get_ac_name(catma_project.project_path, directory, storage=storage) in included_acs
         ]
     elif excluded_acs:      # selects all annotation collections except for the excluded_acs
-        annotation_collections = [
-            AnnotationCollection(
-                catma_project=catma_project,
-                ac_uuid=directory
-            ) for directory in os.listdir(collections_directory)
-            if get_ac_name(catma_project.uuid, directory) not in excluded_acs
+        ac_uuids = [
+            directory for directory in storage.listdir(collections_directory)
+            if get_ac_name(catma_project.project_path, directory, storage=storage) not in excluded_acs
         ]
     elif ac_filter_keyword:  # selects annotation collections with the given ac_filter_keyword
-        annotation_collections = [
-            AnnotationCollection(
-                catma_project=catma_project,
-                ac_uuid=directory
-            ) for directory in os.listdir(collections_directory)
-            if ac_filter_keyword in get_ac_name(catma_project.uuid, directory)
+        ac_uuids = [
+            directory for directory in storage.listdir(collections_directory)
+            if ac_filter_keyword in get_ac_name(catma_project.project_path, directory, storage=storage)
         ]
     else:                   # selects all annotation collections
-        annotation_collections = [
+        ac_uuids = [
+            directory for directory in storage.listdir(collections_directory)
+            if directory.startswith('C_') or directory.startswith('CATMA_')
+        ]
+
+    if lazy:
+        cache_directory = None
+
+    # compact and complete annotation collections, and those loaded with different annotation filters, are cached separately
+    cache_entry_suffix = '.compact' if compact else ''
+    if catma_project.annotation_filter is not None:
+        cache_entry_suffix += f'.{catma_project.annotation_filter.cache_key}'
+
+    cached_acs = {}
+    if cache_directory:
+        for ac_uuid in ac_uuids:
+            ac = read_cache_entry(cache_directory, ac_uuid + cache_entry_suffix)
+            if ac is not None:
+                _attach_annotation_collection(ac, catma_project)
+                cached_acs[ac_uuid] = ac
+    uncached_ac_uuids = [ac_uuid for ac_uuid in ac_uuids if ac_uuid not in cached_acs]
+
+    if workers and workers > 1 and len(uncached_ac_uuids) > 1 and not lazy:
+        # the workers parse the page files and build the data frames, the annotation collections
+        # are returned in the order of uncached_ac_uuids and get linked to this project afterwards
+        with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_annotation_collection_worker,
+                initargs=(catma_project,)) as executor:
+            loaded_acs = list(executor.map(_load_annotation_collection_in_worker, uncached_ac_uuids))
+        for ac in loaded_acs:
+            if cache_directory:
+                write_cache_entry(cache_directory, ac.uuid + cache_entry_suffix, ac)
+            _attach_annotation_collection(ac, catma_project)
+    else:
+        loaded_acs = [
             AnnotationCollection(
                 catma_project=catma_project,
-                ac_uuid=directory
-            ) for directory in os.listdir(collections_directory)
-            if directory.startswith('C_') or directory.startswith('CATMA_')
+                ac_uuid=directory,
+                lazy=lazy,
+                compact=compact
+            ) for directory in uncached_ac_uuids
         ]
+        if cache_directory:
+            for ac in loaded_acs:
+                _detach_annotation_collection(ac)
+                write_cache_entry(cache_directory, ac.uuid + cache_entry_suffix, ac)
+                _attach_annotation_collection(ac, catma_project)
+
+    loaded_acs = {ac.uuid: ac for ac in loaded_acs}
+    annotation_collections = [
+        cached_acs[ac_uuid] if ac_uuid in cached_acs else loaded_acs[ac_uuid]
+        for ac_uuid in ac_uuids
+    ]
 
     ac_dict = {
         ac.name: ac for ac in annotation_collections}
@@ -170,59 +274,63 @@ def load_annotation_collections(
 
 def test_tageset_directory(
         project_uuid: str,
-        tagset_uuid: str) -> bool:
+        tagset_uuid: str,
+        storage=None) -> bool:
     """Tests if tagset has header.json to filter empty tagsets from loading process.
 
     Args:
-        project_uuid (str): UUID.
+        project_uuid (str): The path of the CATMA project directory.
         tagset_uuid (str): UUID.
+        storage (optional): The storage the project is read from, see `gitma._storage`. Defaults to None.
 
     Returns:
         boolean: True if header.json exists.
     """
     tageset_dir = f'{project_uuid}/tagsets/{tagset_uuid}/header.json'
-    if os.path.isfile(tageset_dir):
+    if get_storage(storage).isfile(tageset_dir):
         return True
 
 
-def load_tagsets(project_uuid: str) -> Tuple[List[Tagset], Dict[str, Tagset]]:
+def load_tagsets(project_uuid: str, storage=None) -> Tuple[List[Tagset], Dict[str, Tagset]]:
     """Generates list and dict of tagsets.
 
     Args:
-        project_uuid (str): CATMA project UUID.
+        project_uuid (str): The path of the CATMA project directory.
+        storage (optional): The storage the project is read from, see `gitma._storage`. Defaults to None.
 
     Returns:
         Tuple[List[Tagset], Dict[str, Tagset]]: Tagsets as list and dictionary with UUIDs as keys.
     """
+    storage = get_storage(storage)
     tagsets_directory = project_uuid + '/tagsets/'
     tagsets = [
         Tagset(
             project_uuid=project_uuid,
-            tagset_uuid=directory
-        ) for directory in os.listdir(tagsets_directory)
+            tagset_uuid=directory,
+            storage=storage
+        ) for directory in storage.listdir(tagsets_directory)
         # ignore empty tagsets
-        if test_tageset_directory(project_uuid, directory)
+        if test_tageset_directory(project_uuid, directory, storage=storage)
     ]
     tagset_dict = {tagset.uuid: tagset for tagset in tagsets}
 
     return tagsets, tagset_dict
 
 
-def load_texts(project_uuid: str) -> Tuple[List[Text], Dict[str, Text]]:
+def load_texts(project_uuid: str, document_cache: DocumentCache) -> Tuple[List[Text], Dict[str, Text]]:
     """Generates list and dict of CATMA texts.
 
     Args:
-        project_uuid (str): CATMA project UUID.
+        project_uuid (str): The path of the CATMA project directory.
+        document_cache (DocumentCache): The project's document cache that holds the `Text` objects.
 
     Returns:
         Tuple[List[Text], Dict[Text]]: List and dictionary of documents.
     """
     texts_directory = project_uuid + '/documents/'
     texts = [
-        Text(
-            project_uuid=project_uuid,
-            document_uuid=directory
-        ) for directory in os.listdir(texts_directory)
+        document_cache.get(document_uuid=directory)
+        for directory in document_cache.storage.listdir(texts_directory)
         if directory.startswith('D_')
     ]
 
@@ -248,6 +356,28 @@ class CatmaProject:
         load_from_gitlab (bool, optional): Whether the CATMA project should be loaded directly from CATMA's GitLab backend. Defaults to False.
         gitlab_access_token (str, optional): The private CATMA GitLab access token. Defaults to None.
         backup_directory (str, optional): The directory where your project clone should be located. Defaults to './'.
+        workers (int, optional): If greater than 1, the annotation collections get loaded in a pool of this many processes.\
+            The results are the same as when loading them one after another. Note that on platforms that spawn new processes\
+            (Windows, macOS) the project has to be loaded within an `if __name__ == '__main__':` block. Defaults to None.
+        lazy (bool, optional): If `True` only the headers of the annotation collections and documents get loaded. Plain texts,\
+            annotations and data frames get loaded the first time they are accessed. Plain texts can be read lazily on their own\
+            with `lazy_documents`. Defaults to False.
+        cache_dir (str, optional): A directory where the parsed tagsets and annotation collections get cached. The cache is keyed\
+            by the project clone's HEAD commit and the commits of its submodules, so repeatedly loading an unchanged clone doesn't\
+            parse any tagset or annotation JSON. Clones with uncommitted changes are never cached. Defaults to None.
+        compact (bool, optional): If `True` the annotations don't keep their raw JSON data in memory, which considerably\
+            reduces the memory footprint of large projects. The JSON data of an annotation is read from its page file again\
+            when it is needed, e.g. to modify the annotation. Defaults to False.
+        ref (str, optional): If given, the project is read straight from the Git object database of the project's repository\
+            at this commit, branch or tag, e.g. 'HEAD', 'origin/master' or a commit hash, including the trees of submodules.\
+            No checked out working tree is needed, so the project directory can also be a bare repository like a mirror.\
+            Methods that write to the project's files are not supported for projects loaded this way. Defaults to None.
+        annotation_filter (AnnotationFilter, optional): If given, only the annotations selected by the filter get loaded,\
+            e.g. `AnnotationFilter(tags=['/event'], include_child_tags=True, authors=['jane'])`. The filter is applied to the\
+            raw page file data, so the annotations that are not selected are never constructed. Defaults to None.
+        lazy_documents (bool, optional): Whether the plain texts of the documents get read the first time they are accessed,\
+            independently of `lazy`, e.g. for projects with very large documents of which only a few are annotated. Defaults\
+            to None, which means the same as `lazy`.
 
     Raises:
         FileNotFoundError: If the local or remote CATMA project was not found.
@@ -261,10 +391,14 @@ class CatmaProject:
             ac_filter_keyword: str = None,
             load_from_gitlab: bool = False,
             gitlab_access_token: str = None,
-            backup_directory: str = './'):
-        # get the current directory, to return to after loading the project
-        cwd = os.getcwd()
-
+            backup_directory: str = './',
+            workers: int = None,
+            lazy: bool = False,
+            cache_dir: str = None,
+            compact: bool = False,
+            ref: str = None,
+            annotation_filter: AnnotationFilter = None,
+            lazy_documents: bool = None):
         # TODO: what we're calling UUID here is actually the full GitLab project name, which is unlikely to change and contains a UUID
         #       the CATMA project name is stored in the GitLab project description field and can change
         if load_from_gitlab:
@@ -285,6 +419,27 @@ class CatmaProject:
         #: The directory where the project is located.
         self.projects_directory: str = projects_directory
 
+        #: The number of worker processes used to load the annotation collections.
+        self.workers: int = workers
+
+        #: Whether the annotation collections get loaded the first time they are accessed.
+        self.lazy: bool = lazy
+
+        #: Whether the plain texts of the documents get read the first time they are accessed.
+        self.lazy_documents: bool = lazy if lazy_documents is None else lazy_documents
+
+        #: The directory where parsed project components get cached.
+        self.cache_dir: str = cache_dir
+
+        #: Whether the annotations are loaded without their raw JSON data.
+        self.compact: bool = compact
+
+        #: The filter that selects the annotations that get loaded, see `gitma.AnnotationFilter`.
+        self.annotation_filter: AnnotationFilter = annotation_filter
+
+        # the modifications buffered by `batch`
+        self._batch: AnnotationBatch = None
+
         #: The project's name.
         self.name: str = self.uuid[43:]  # NB: the actual name can be different if the project is renamed or the name contains whitespace or special characters
 
@@ -294,13 +449,41 @@ class CatmaProject:
                 f'Make sure the project clone worked properly and that the projects_directory parameter is correct.'
             )
 
-        os.chdir(self.projects_directory)  # everything following is relative to this directory
+        #: The absolute path of the project directory. All files of the project are accessed via absolute paths,
+        #: so that projects can be loaded and written from several threads at once.
+        self.project_path: str = os.path.abspath(f'{self.projects_directory}/{self.uuid}')
+
+        #: The storage the project's files are read from: the file system or, if a ref is given,\
+        #: a `gitma._git.GitStorage` that reads them from the Git object database.
+        self.storage = file_system_storage
+        if ref:
+            from gitma._git import GitStorage
+            self.storage = GitStorage(project_path=self.project_path, ref=ref)
+
+        #: Cache that holds every document of the project once, shared by `texts` and the annotation collections.
+        self.document_cache: DocumentCache = DocumentCache(
+            project_path=self.project_path,
+            lazy=self.lazy_documents,
+            storage=self.storage
+        )
+
+        cache_directory = get_cache_directory(
+            cache_dir=self.cache_dir,
+            project_path=self.project_path,
+            commit_id=self.storage.commit_id if ref else None
+        ) if self.cache_dir else None
 
         try:
             # Load tagsets
             print('Loading tagsets ...')
-            if os.path.isdir(self.uuid + '/tagsets/'):
-                tagsets, tagset_dict = load_tagsets(project_uuid=self.uuid)
+            if self.storage.isdir(self.project_path + '/tagsets/'):
+                cached_tagsets = read_cache_entry(cache_directory, 'tagsets') if cache_directory else None
+                if cached_tagsets is not None:
+                    tagsets, tagset_dict = cached_tagsets
+                else:
+                    tagsets, tagset_dict = load_tagsets(project_uuid=self.project_path, storage=self.storage)
+                    if cache_directory:
+                        write_cache_entry(cache_directory, 'tagsets', (tagsets, tagset_dict))
 
                 #: List of gitma.Tagset objects.
                 self.tagsets: List[Tagset] = tagsets
@@ -314,8 +497,8 @@ class CatmaProject:
 
             # Load texts
             print('Loading documents ...')
-            if os.path.isdir(self.uuid + '/documents/'):
-                texts, text_dict = load_texts(project_uuid=self.uuid)
+            if self.storage.isdir(self.project_path + '/documents/'):
+                texts, text_dict = load_texts(project_uuid=self.project_path, document_cache=self.document_cache)
 
                 #: List of the gitma.Text objects.
                 self.texts: List[Text] = texts
@@ -329,12 +512,16 @@ class CatmaProject:
 
             # Load annotation collections
             print('Loading annotation collections ...')
-            if os.path.isdir(self.uuid + '/collections/'):
+            if self.storage.isdir(self.project_path + '/collections/'):
                 annotation_collections, ac_dict = load_annotation_collections(
                     catma_project=self,
                     included_acs=included_acs,
                     excluded_acs=excluded_acs,
                     ac_filter_keyword=ac_filter_keyword,
+                    workers=self.workers,
+                    lazy=self.lazy,
+                    compact=self.compact,
+                    cache_directory=cache_directory
                 )
                 #: List of gitma.AnnotationCollection objects.
                 self.annotation_collections: List[AnnotationCollection] = annotation_collections
@@ -346,15 +533,17 @@ class CatmaProject:
                 self.ac_dict = {}
             print(f'\tFound {len(self.annotation_collections)} annotation collection(s).')
             for ac in self.annotation_collections:
-                print(f'\tAnnotation collection "{ac.name}" for document "{ac.text.title}"')
-                print(f'\t\tAnnotations: {len(ac.annotations)}')
+                if self.lazy:
+                    # don't load the annotation collections just to print their stats
+                    print(f'\tAnnotation collection "{ac.name}"')
+                else:
+                    print(f'\tAnnotation collection "{ac.name}" for document "{ac.text.title}"')
+                    print(f'\t\tAnnotations: {len(ac.annotations)}')
 
         except FileNotFoundError as e:
             raise FileNotFoundError(
                 f"Some components of your CATMA project could not be loaded."
             ) from e
-        finally:
-            os.chdir(cwd)
 
     def __repr__(self):
         documents = [text.title for text in self.texts]
@@ -392,34 +581,147 @@ class CatmaProject:
                 output_dict[ac.text.title][rename_dict[ac.name]] = ac.to_list(tags=included_tags)
 
         with open(f'{directory}{self.name}.json', 'w', encoding='utf-8', newline='') as json_output:
-            json_output.write(json.dumps(output_dict))
+            json_output.write(_json.dumps(output_dict))
 
     def update(self) -> None:
-        """Updates local git folder and reloads CatmaProject.
+        """Updates local git folder and reloads the parts of the CatmaProject that have changed.
+
+        Only the tagsets, documents and annotation page files that differ between the commits before and after the pull
+        get parsed again. The annotations and data frames of annotation collections whose page files changed are patched
+        in place. If the changes can't be determined with pygit2 the whole project gets reloaded.
+
+        If the project has been loaded from a ref, the repository gets fetched instead of pulled and the project is read from
+        the commit the ref points to afterwards.
 
         Warning: This method can only be used if you have [Git](https://git-scm.com/book/en/v2/Getting-Started-Installing-Git) installed.
         """
-        cwd = os.getcwd()
-        os.chdir(f'{self.projects_directory}{self.uuid}/')
+        import pygit2
+        from gitma._git import GitStorage, get_changed_paths, get_project_prefix
+
+        if isinstance(self.storage, GitStorage):
+            self._update_from_ref()
+            print('Updated the CATMA project')
+            return
+
+        project_path = self.project_path
+        try:
+            old_commit_id = pygit2.Repository(project_path).head.target
+        except pygit2.GitError:
+            old_commit_id = None
+
+        subprocess.run(['git', 'pull'], cwd=project_path)
+
+        try:
+            if old_commit_id is None:
+                raise pygit2.GitError('The project is not a Git repository.')
+            repo = pygit2.Repository(project_path)
+            project_prefix = get_project_prefix(repo, project_path)
+            changed_paths = [
+                path[len(project_prefix):] for path in get_changed_paths(repo, old_commit_id, repo.head.target)
+                if path.startswith(project_prefix)
+            ]
+        except pygit2.GitError:
+            self._reload()
+        else:
+            self._reload_changed_paths(changed_paths)
+
+        print('Updated the CATMA project')
+
+    def _update_from_ref(self) -> None:
+        from gitma._git import get_changed_paths
 
-        subprocess.run(['git', 'pull'])
+        old_commit_id = self.storage.commit_id
+        repo = self.storage.repository
+        subprocess.run(['git', 'fetch'], cwd=repo.path)
+        self.storage.checkout(self.storage.ref)
 
-        os.chdir('../')
+        project_prefix = self.storage.project_prefix
+        changed_paths = [
+            path[len(project_prefix):] for path in get_changed_paths(repo, old_commit_id, self.storage.commit_id)
+            if path.startswith(project_prefix)
+        ]
+        self._reload_changed_paths(changed_paths)
+
+    def _reload(self) -> None:
         # Load tagsets
-        self.tagsets, self.tagset_dict = load_tagsets(project_uuid=self.uuid)
+        self.tagsets, self.tagset_dict = load_tagsets(project_uuid=self.project_path, storage=self.storage)
 
         # Load texts
-        self.texts, self.text_dict = load_texts(project_uuid=self.uuid)
+        self.document_cache = DocumentCache(
+            project_path=self.project_path,
+            lazy=self.lazy_documents,
+            storage=self.storage
+        )
+        self.texts, self.text_dict = load_texts(project_uuid=self.project_path, document_cache=self.document_cache)
 
         # Load annotation collections
         self.annotation_collections, self.ac_dict = load_annotation_collections(
             catma_project=self,
-            included_acs=list(self.ac_dict)
+            included_acs=list(self.ac_dict),
+            workers=self.workers,
+            lazy=self.lazy,
+            compact=self.compact
         )
 
-        print('Updated the CATMA project')
+    def _reload_changed_paths(self, changed_paths: List[str]) -> None:
+        # sort the project-relative paths of changed files by the project components they belong to
+        changed_tagsets = set()
+        changed_documents = set()
+        changed_acs = set()
+        changed_page_files = {}
+        for path in changed_paths:
+            path_parts = path.split('/')
+            if len(path_parts) < 2:
+                continue
+            if path_parts[0] == 'tagsets':
+                changed_tagsets.add(path_parts[1])
+            elif path_parts[0] == 'documents':
+                changed_documents.add(path_parts[1])
+            elif path_parts[0] == 'collections':
+                if len(path_parts) == 4 and path_parts[2] == 'annotations':
+                    changed_page_files.setdefault(path_parts[1], set()).add(path_parts[3])
+                else:
+                    changed_acs.add(path_parts[1])
+
+        # Reload changed tagsets
+        for tagset_uuid in changed_tagsets:
+            if test_tageset_directory(self.project_path, tagset_uuid, storage=self.storage):
+                self.tagset_dict[tagset_uuid] = Tagset(project_uuid=self.project_path, tagset_uuid=tagset_uuid, storage=self.storage)
+            else:
+                self.tagset_dict.pop(tagset_uuid, None)
+        if changed_tagsets:
+            self.tagsets = list(self.tagset_dict.values())
+
+        # Reload changed texts
+        for document_uuid in changed_documents:
+            self.document_cache.remove(document_uuid)
+        if changed_documents:
+            if self.storage.isdir(self.project_path + '/documents/'):
+                self.texts, self.text_dict = load_texts(project_uuid=self.project_path, document_cache=self.document_cache)
+            else:
+                self.texts, self.text_dict = [], {}
+
+        # Reload annotation collections whose header, document or tagsets changed, patch those with changed page files
+        annotation_collections = []
+        for ac in self.annotation_collections:
+            uses_changed_tagset = ac._annotations is not None and any(
+                an._tagset_uuid in changed_tagsets for an in ac._annotations
+            )
+            if ac.uuid in changed_acs or ac.plain_text_id in changed_documents or uses_changed_tagset:
+                if not self.storage.isfile(f'{self.project_path}/collections/{ac.uuid}/header.json'):
+                    continue    # the annotation collection has been deleted
+                ac = AnnotationCollection(
+                    catma_project=self,
+                    ac_uuid=ac.uuid,
+                    lazy=self.lazy,
+                    compact=self.compact
+                )
+            elif ac.uuid in changed_page_files:
+                ac.reload_page_files(sorted(changed_page_files[ac.uuid]))
+            annotation_collections.append(ac)
 
-        os.chdir(cwd)
+        self.annotation_collections = annotation_collections
+        self.ac_dict = {ac.name: ac for ac in annotation_collections}
 
     def annotations(self) -> Generator[Annotation, None, None]:
         """Generator that yields all annotations as gitma.annotation.Annotation objects.
@@ -431,6 +733,23 @@ class CatmaProject:
             for an in ac.annotations:
                 yield an
 
+    def iter_annotations(self, stream: bool = False) -> Generator[Union[Annotation, AnnotationRecord], None, None]:
+        """Generator that yields all annotations of the project's annotation collections.
+
+        Args:
+            stream (bool, optional): If `True` the annotations are streamed from the page files as lightweight\
+                `gitma.annotation_record.AnnotationRecord`s with bounded memory, see `AnnotationCollection.iter_records`.\
+                Use this with `lazy=True` to aggregate over projects that don't fit into memory. Defaults to False.
+
+        Yields:
+            Union[Annotation, AnnotationRecord]: gitma.annotation.Annotation objects, or records if `stream` is `True`.
+        """
+        for ac in self.annotation_collections:
+            if stream:
+                yield from ac.iter_records()
+            else:
+                yield from ac.annotations
+
     def all_tags(self) -> Generator[Tag, None, None]:
         """Generator that yields all tags as gitma.tag.Tag objects.
 
@@ -454,8 +773,8 @@ class CatmaProject:
                 'annotations': len(ac.annotations),
                 'annotator': set([an.author for an in ac.annotations]),
                 'tag': set([an.tag.name for an in ac.annotations]),
-                'first_annotation': min([an.date for an in ac.annotations]),
-                'last_annotation': max([an.date for an in ac.annotations]),
+                'first_annotation': ac.columns.to_datetime().min(),
+                'last_annotation': ac.columns.to_datetime().max(),
                 'uuid': ac.uuid,
             } for ac in self.annotation_collections
             if len(ac.annotations) > 0
@@ -500,6 +819,149 @@ class CatmaProject:
             author=author
         )
 
+    @contextlib.contextmanager
+    def batch(self) -> Generator[AnnotationBatch, None, None]:
+        """Buffers the modifications of annotations, e.g. by `Annotation.modify_property_value` or `Annotation.remove`,
+        and writes each changed page file once, atomically, when the with block ends:
+
+        ```python
+        with project.batch():
+            for an in project.annotations():
+                an.set_property_values(tag='event', prop='checked', value=['yes'])
+        ```
+
+        If the with block raises an exception, none of the buffered modifications get written. Batches can be nested,
+        the modifications are written when the outermost batch ends. Writing is atomic per page file, not for the batch as
+        a whole: if a page file can't be written, the page files written before keep their changes and the remaining
+        changes stay in the yielded `AnnotationBatch`.
+
+        Yields:
+            AnnotationBatch: The modifications buffered so far.
+        """
+        if self._batch is not None:
+            yield self._batch
+            return
+
+        self._batch = AnnotationBatch()
+        try:
+            yield self._batch
+            self._batch.flush()
+        finally:
+            self._batch = None
+
+    @contextlib.contextmanager
+    def migrate_schema(self) -> Generator[SchemaMigration, None, None]:
+        """Collects renames of properties and remaps of property values across tagsets and annotations, and applies them
+        when the with block ends, reading and writing each tag file and page file at most once:
+
+        ```python
+        with project.migrate_schema() as migration:
+            migration.rename_property('representation_type', 'representation')
+            migration.remap_property_values('representation', {'narrator_speech': 'narration', 'figure_speech': 'speech'})
+        ```
+
+        The loaded tagsets and annotation collections are updated afterwards. If the with block raises an exception,
+        nothing gets changed.
+
+        Raises:
+            RuntimeError: If a `batch` is active, whose buffered modifications could overwrite the migrated page files.
+            ValueError: If a tag would end up with two properties with the same name.
+
+        Yields:
+            SchemaMigration: The migration to add the changes to.
+        """
+        if self._batch is not None:
+            raise RuntimeError('The schema can\'t be migrated within a batch.')
+
+        migration = SchemaMigration(project=self)
+        yield migration
+        migration.apply()
+
+    def recover(self) -> List[str]:
+        """Rolls back the changes to page files that were interrupted, e.g. because the writing process was killed, and
+        reloads them. Loading a project only warns about interrupted writes, the next write to an annotation collection
+        rolls them back as well.
+
+        Returns:
+            List[str]: The project-relative paths of the page files that were restored or removed.
+        """
+        collections_directory = f'{self.project_path}/collections/'
+        recovered_paths = []
+        for ac_uuid in sorted(os.listdir(collections_directory)) if os.path.isdir(collections_directory) else []:
+            annotations_directory = f'{collections_directory}{ac_uuid}/annotations/'
+            if os.path.isdir(annotations_directory):
+                recovered_paths.extend(
+                    f'collections/{ac_uuid}/annotations/{page_file_name}'
+                    for page_file_name in recover_page_files(annotations_directory)
+                )
+
+        self._reload_changed_paths(recovered_paths)
+        return recovered_paths
+
+    def write_annotations(self, annotations: Iterable[dict]) -> List[str]:
+        """Writes many new annotations into this project at once, e.g. to import machine-generated annotations.
+
+        The page files are the same as if `write_annotation_json` was called for each annotation, but tagsets and tags are
+        looked up once and each page file is written once instead of once per annotation.
+
+        Args:
+            annotations (Iterable[dict]): The annotations as dicts with the parameters of `write_annotation_json` as keys:\
+                'text_title', 'annotation_collection_name', 'tagset_name', 'tag_name', 'start_points', 'end_points', 'author'\
+                and optionally 'property_annotations'. Can be a generator, only one page file of annotations is held in memory\
+                per annotation collection.
+
+        Returns:
+            List[str]: The project-relative paths of the page files that were written to.
+        """
+        return write_annotations(project=self, annotations=annotations)
+
+    def push_annotations(
+            self,
+            ac_names: List[str] = None,
+            commit_message: str = 'new annotations',
+            commit_project: bool = True,
+            credentials=None,
+            workers: int = None) -> Dict[str, Union[str, Exception]]:
+        """Commits the changed page files of annotation collections and the project with the collections' new commits, and
+        pushes them to the CATMA GitLab backend, in-process with pygit2 instead of running git for each collection.
+
+        Only page files get committed, other changes in the working tree are left alone. Without credentials, the CATMA
+        access token stored in the **git credential manager** is used, which is looked up once for all repositories.
+        Rejected pushes, e.g. of collections that have been changed in CATMA meanwhile, are reported and not retried.
+
+        Args:
+            ac_names (List[str], optional): The names of the annotation collections. Defaults to `None`, which means all\
+                annotation collections.
+            commit_message (str, optional): Customize the commit message. Defaults to 'new annotations'.
+            commit_project (bool, optional): Whether the project gets committed and pushed, too. Defaults to `True`.
+            credentials (optional): pygit2 credentials, e.g. `pygit2.UserPass('none', access_token)`. Defaults to None.
+            workers (int, optional): The maximum number of concurrent pushes. If `None` the repositories are pushed\
+                one after another. Defaults to None.
+
+        Returns:
+            Dict[str, Union[str, Exception]]: 'pushed', 'committed' or 'up to date' or the raised exception for the working\
+                directory of every repository.
+        """
+        from gitma._git import commit_and_push_collections
+
+        if ac_names is None:
+            ac_names = [ac.name for ac in self.annotation_collections]
+
+        results = commit_and_push_collections(
+            project_path=self.project_path,
+            collection_uuids=[self.ac_dict[ac_name].uuid for ac_name in ac_names],
+            message=commit_message,
+            commit_project=commit_project,
+            credentials=credentials,
+            workers=workers
+        )
+
+        failures = {path: result for path, result in results.items() if isinstance(result, Exception)}
+        for path, result in failures.items():
+            print(f'WARNING: Failed to push {path}: {result}')
+        print(f'Pushed {sum(result == "pushed" for result in results.values())} repositories, {len(failures)} failed.')
+        return results
+
     def create_gold_annotations(
             self,
             ac_1_name: str,
@@ -537,15 +999,55 @@ class CatmaProject:
             push_to_gitlab=push_to_gitlab
         )
 
+    def create_majority_vote_annotations(
+            self,
+            ac_names: List[str],
+            gold_ac_name: str,
+            min_votes: int = None,
+            excluded_tags: List[str] = None,
+            min_overlap: float = 1.0,
+            same_tag: bool = True,
+            copy_property_values_if_equal: bool = True,
+            push_to_gitlab: bool = False):
+        """Searches for annotations that match in at least `min_votes` of the given annotation collections of this project and
+        copies them into another annotation collection, once per group of matching annotations.
+        By default, property values are copied when they are exactly the same for all matching annotations.
+
+        Args:
+            ac_names (List[str]): The names of the annotation collections that vote.
+            gold_ac_name (str): The name of the annotation collection, into which gold annotations will be written.
+            min_votes (int, optional): The number of collections that have to agree on an annotation. Defaults to `None`, which\
+                means more than half of the collections.
+            excluded_tags (list, optional): Annotations with these tags will not be included in the gold annotations. Defaults to `None`.
+            min_overlap (float, optional): The minimal overlap for annotations to match. Defaults to 1.0.
+            same_tag (bool, optional): Whether matching annotations have to use the same tag. Defaults to `True`.
+            copy_property_values_if_equal (bool, optional): Whether property values should be copied when they are exactly the same for all\
+                matching annotations. Defaults to `True`. If `False` or property values are not exactly the same, no property values are copied.
+            push_to_gitlab (bool, optional): Whether the gold annotations should be uploaded to the CATMA GitLab backend. Defaults to `False`.
+        """
+        create_majority_vote_annotations(
+            project=self,
+            ac_names=ac_names,
+            gold_ac_name=gold_ac_name,
+            min_votes=min_votes,
+            excluded_tags=excluded_tags,
+            min_overlap=min_overlap,
+            same_tag=same_tag,
+            copy_property_values_if_equal=copy_property_values_if_equal,
+            push_to_gitlab=push_to_gitlab
+        )
+
     def merge_annotations(self) -> pd.DataFrame:
         """Concatenates all annotation collections to one pandas data frame and resets index.
 
         Returns:
             pd.DataFrame: Data frame including all annotation in the CATMA project.
         """
-        return pd.concat(
-            [ac.df for ac in self.annotation_collections if not ac.df.empty]
-        ).reset_index(drop=True)
+        dfs = [ac.df for ac in self.annotation_collections if not ac.df.empty]
+        if not dfs:
+            # e.g. if an annotation filter doesn't select any annotation
+            return ac_to_df(annotations=[], text_title=None, ac_name=None)
+        return pd.concat(dfs).reset_index(drop=True)
 
     def merge_annotations_per_document(self) -> Dict[str, pd.DataFrame]:
         """Merges all annotations per document to one annotation collection.
@@ -563,15 +1065,16 @@ class CatmaProject:
 
         return document_acs
 
-    def plot_annotation_progression(self) -> go.Figure:
+    def plot_annotation_progression(self) -> 'go.Figure':
         """Plot the annotation progression for every annotator in a CATMA project.
 
         Returns:
             go.Figure: Plotly scatter plot.
         """
+        from gitma._vizualize import plot_annotation_progression
         return plot_annotation_progression(project=self)
 
-    def plot_interactive(self, color_col: str = 'annotation collection') -> go.Figure:
+    def plot_interactive(self, color_col: str = 'annotation collection') -> 'go.Figure':
         """This function generates one Plotly scatter plot per annotated document in a CATMA project.
         By default the colors represent the annotation collections.
         By that they can be deactivated with the interactive legend.
@@ -582,9 +1085,10 @@ class CatmaProject:
         Returns:
             go.Figure: Plotly scatter plot.
         """
+        from gitma._vizualize import plot_interactive
         return plot_interactive(catma_project=self, color_col=color_col)
 
-    def plot_annotations(self, color_col: str = 'annotation collection') -> go.Figure:
+    def plot_annotations(self, color_col: str = 'annotation collection') -> 'go.Figure':
         """This function generates one Plotly scatter plot per annotated document in a CATMA project.
         By default the colors represent the annotation collections.
         By that they can be deactivated with the interactive legend.
@@ -595,6 +1099,7 @@ class CatmaProject:
         Returns:
             go.Figure: Plotly scatter plot.
         """
+        from gitma._vizualize import plot_interactive
         return plot_interactive(catma_project=self, color_col=color_col)
 
     def cooccurrence_network(
@@ -694,7 +1199,7 @@ class CatmaProject:
     def compare_annotation_collections(
         self,
         annotation_collections: List[str],
-        color_col: str = 'tag') -> go.Figure:
+        color_col: str = 'tag') -> 'go.Figure':
         """Plots annotations of multiple annotation collections of the same texts as line plot.
 
         Args:
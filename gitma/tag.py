@@ -1,6 +1,7 @@
-import json
 from typing import List, Dict
 from gitma.property import Property
+from gitma import _json
+from gitma._storage import get_storage
 
 
 def rgbint_to_hex(rgb: int) -> str:
@@ -41,6 +42,8 @@ class Tag:
 
     Args:
         json_file_path (str): The path of the tag within the project's folder structure.
+        storage (optional): The storage the tag is read from, see `gitma._storage`. If `None` the tag is read from\
+            the file system. Defaults to None.
 
     Raises:
         FileNotFoundError: If the json_file_path could not be found.
@@ -49,12 +52,11 @@ class Tag:
     SYSTEM_PROPERTY_UUID_CATMA_MARKUPTIMESTAMP = 'CATMA_54A5F93F-5333-3F0D-92F7-7BD5930DB9E6'
     SYSTEM_PROPERTY_UUID_CATMA_MARKUPAUTHOR = 'CATMA_AB27F1D4-303A-3622-BB2C-72C310D0C1BF'
 
-    def __init__(self, json_file_path: str):
+    def __init__(self, json_file_path: str, storage=None):
         #: The tag's path.
         self.path: str = json_file_path.replace('\\', '/')
         try:
-            with open(json_file_path, 'r', encoding='utf-8', newline='') as json_input:
-                self.json = json.load(json_input)
+            self.json = _json.loads(get_storage(storage).read_bytes(json_file_path))
         except FileNotFoundError:
             raise FileNotFoundError(
                 f'The tag at this path could not be found: {self.path}\n\
@@ -100,6 +102,18 @@ class Tag:
         #: The full tag path within the tagset.
         self.full_path: str = None
 
+        #: The tag's depth within the tagset, 0 for top-level tags.
+        #: Is None until the tagset's hierarchy index has been built, see `gitma.Tagset`.
+        self.depth: int = None
+
+        #: The tag's position in the depth-first order of its tagset, see `gitma.Tagset.tags_in_tree_order`.
+        #: Is None until the tagset's hierarchy index has been built.
+        self.tree_start: int = None
+
+        #: The position after the tag's last descendant in the depth-first order of its tagset. The tag's descendants are the
+        #: tags with positions from `tree_start + 1` to `tree_end - 1`. Is None until the tagset's hierarchy index has been built.
+        self.tree_end: int = None
+
     def __repr__(self):
         return f'Tag(Name: {self.name}, Properties: {self.properties})'
 
@@ -143,7 +157,7 @@ class Tag:
                 self.json['userDefinedPropertyDefinitions'][item.uuid]['name'] = new_prop
         # write new tag json file
         with open(self.path, 'w', encoding='utf-8', newline='') as json_output:
-            json_output.write(json.dumps(self.json))
+            json_output.write(_json.dumps(self.json))
 
     def rename_possible_property_value(self, prop: str, old_value: str, new_value: str) -> None:
         """Renames a specified property value in the list of possible property values.
@@ -162,4 +176,4 @@ class Tag:
                 self.json['userDefinedPropertyDefinitions'][item.uuid]["possibleValueList"] = pv
         # write new tag json file
         with open(self.path, 'w', encoding='utf-8', newline='') as json_output:
-            json_output.write(json.dumps(self.json))
+            json_output.write(_json.dumps(self.json))
@@ -1,28 +1,30 @@
-import json
-import os
 from typing import List, Dict
 from gitma.tag import Tag
+from gitma import _json
+from gitma._storage import get_storage
 
 
 class Tagset:
     """Class which represents a CATMA tagset.
 
     Args:
-        project_uuid (str): Name of a CATMA project directory.
+        project_uuid (str): The path of a CATMA project directory, e.g. `CatmaProject.project_path`.
         tagset_uuid (str): Tagset UUID. Corresponds to the directory name in the "tagsets" directory.
+        storage (optional): The storage the tagset is read from, see `gitma._storage`. If `None` the tagset is read from\
+            the file system. Defaults to None.
     Raises:
         FileNotFoundError: If the path of the tagset's header.json does not exist.
     """
-    def __init__(self, project_uuid: str, tagset_uuid: str):
+    def __init__(self, project_uuid: str, tagset_uuid: str, storage=None):
         #: The tagsets UUID.
         self.uuid: str = tagset_uuid
 
         #: The path of the tagset within the project's folder structure.
         self.path: str = project_uuid + '/tagsets/' + tagset_uuid
 
+        storage = get_storage(storage)
         try:
-            with open(self.path + '/header.json', 'r', encoding='utf-8', newline='') as header_input:
-                header = json.load(header_input)
+            header = _json.loads(storage.read_bytes(self.path + '/header.json'))
         except FileNotFoundError:
             raise FileNotFoundError(
                 f'The tagset at this path could not be found: {self.path}\n\
@@ -38,28 +40,99 @@ class Tagset:
         self.tag_dict: Dict[str, Tag] = {}
 
         # walks through tagset directory
-        for dirpath, _, filenames in os.walk(self.path):
+        for dirpath, _, filenames in storage.walk(self.path):
             for file in filenames:
                 if file == 'propertydefs.json':             # if a file is a tag JSON file
                     # create a Tag object
-                    new_tag = Tag(dirpath + '/' + file)
+                    new_tag = Tag(dirpath + '/' + file, storage=storage)
                     # and store it in a list
                     self.tags.append(new_tag)
                     # and store it in a dict
                     self.tag_dict[new_tag.id] = new_tag
 
-        for tag in self.tags:
-            tag.get_parent_tag(self.tag_dict)
-            tag.get_child_tags(self.tags)
+        #: List of tags in depth-first order, every tag is followed by all of its descendants.
+        self.tags_in_tree_order: List[Tag] = []
 
-        for tag in self.tags:
-            tag.full_tag_path()
+        self.index_hierarchy()
 
     def __repr__(self) -> str:
         return f'Tagset(Name: {self.name}, Tags: {self.tags})'
 
+    def index_hierarchy(self) -> None:
+        """Links the tags to their parent and child tags and numbers them in depth-first order, so that the descendants
+        of a tag are a contiguous range of `tags_in_tree_order`. Also sets the tags' depth and full path.
+        Is called when the tagset is loaded.
+        """
+        for tag in self.tags:
+            tag.get_parent_tag(self.tag_dict)
+            tag.child_tags = []
+            tag.tree_start = None
+        for tag in self.tags:
+            if tag.parent is not None:
+                tag.parent.child_tags.append(tag)
+
+        self.tags_in_tree_order = []
+        # tags in a cycle of parents aren't below any top-level tag, the first one found is treated as top-level tag
+        for top_level_tag in [tag for tag in self.tags if tag.parent is None] + self.tags:
+            if top_level_tag.tree_start is not None:
+                continue
+            stack = [(top_level_tag, 0, '')]
+            while stack:
+                tag, depth, parent_path = stack.pop()
+                tag.tree_start = len(self.tags_in_tree_order)
+                tag.tree_end = tag.tree_start + 1
+                tag.depth = depth
+                tag.full_path = f'{parent_path}/{tag.name}'
+                self.tags_in_tree_order.append(tag)
+                stack.extend(
+                    (child, depth + 1, tag.full_path) for child in reversed(tag.child_tags) if child.tree_start is None
+                )
+
+        # children come after their parents, so the subtrees are complete when their roots are reached
+        for tag in reversed(self.tags_in_tree_order):
+            if tag.parent is not None and tag.parent.tree_start < tag.tree_start:
+                tag.parent.tree_end = max(tag.parent.tree_end, tag.tree_end)
+
+    def _check_tag(self, tag: Tag) -> None:
+        if self.tag_dict.get(tag.id) is not tag:
+            raise ValueError(f'The tag "{tag.name}" is not part of the tagset "{self.name}".')
+
+    def descendants(self, tag: Tag, include_self: bool = False) -> List[Tag]:
+        """Returns all tags below a tag at any depth, in depth-first order.
+
+        Args:
+            tag (Tag): A tag of this tagset.
+            include_self (bool, optional): Whether to include the tag itself. Defaults to False.
+
+        Raises:
+            ValueError: If the tag is not part of this tagset.
+
+        Returns:
+            List[Tag]: The descendants.
+        """
+        self._check_tag(tag)
+        return self.tags_in_tree_order[tag.tree_start if include_self else tag.tree_start + 1:tag.tree_end]
+
+    def is_descendant(self, tag: Tag, ancestor: Tag) -> bool:
+        """Tests in constant time whether a tag is below another tag at any depth.
+
+        Args:
+            tag (Tag): A tag of this tagset.
+            ancestor (Tag): Another tag of this tagset.
+
+        Raises:
+            ValueError: If one of the tags is not part of this tagset.
+
+        Returns:
+            bool: True if `tag` is a descendant of `ancestor`.
+        """
+        self._check_tag(tag)
+        self._check_tag(ancestor)
+        return ancestor.tree_start < tag.tree_start < ancestor.tree_end
+
     def edit_property_names(self, tag_names: list, old_prop: str, new_prop: str) -> None:
         """Renames a property for all tags given as tag_names.
+        See `CatmaProject.migrate_schema` to apply many renames across tagsets, writing each tag file once.
 
         Args:
             tag_names (list): List of names of the tags that hold the property to be renamed.
@@ -72,7 +145,7 @@ class Tagset:
 
     def edit_possible_property_values(self, tag_names: list, prop: str, old_value: str, new_value: str) -> None:
         """Replace an old property value with a new one. The possible property values will be listed in CATMA's
-        property annotation window.
+        property annotation window. See `CatmaProject.migrate_schema` to change the values of the annotations as well.
 
         Args:
             tag_names (list): The list of tags with the given property.
@@ -1,19 +1,24 @@
-import json
+import os
+from typing import Dict, Iterator
+from gitma import _json
+from gitma._storage import get_storage
 
 
 class Text:
     """Class which represents a CATMA document.
 
     Args:
-        project_uuid (str): Name of a CATMA project directory.
+        project_uuid (str): The path of a CATMA project directory, e.g. `CatmaProject.project_path`.
         document_uuid (str): Document UUID. Corresponds to the directory name in the "documents" directory.
+        lazy (bool, optional): If `True` the plain text gets read the first time it is accessed. Defaults to False.
+        storage (optional): The storage the document is read from, see `gitma._storage`. If `None` the document is read from\
+            the file system. Defaults to None.
     """
-    def __init__(self, project_uuid: str, document_uuid: str):
+    def __init__(self, project_uuid: str, document_uuid: str, lazy: bool = False, storage=None):
         #: The text's UUID.
         self.uuid: str = document_uuid
-        with open(project_uuid + '/documents/' + document_uuid +
-                  '/header.json', 'r', encoding='utf-8', newline='') as text_header_input:
-            text_header = json.load(text_header_input)
+        self._storage = get_storage(storage)
+        text_header = _json.loads(self._storage.read_bytes(project_uuid + '/documents/' + document_uuid + '/header.json'))
 
         #: The text's title.
         self.title: str = text_header['gitContentInfoSet']['title']
@@ -21,13 +26,86 @@ class Text:
         #: The text's author.
         self.author: str = text_header['gitContentInfoSet']['author']
 
-        text_file_path = f"{project_uuid}/documents/{document_uuid}/{document_uuid}.txt"
-        with open(text_file_path, 'r', encoding='utf-8', newline='') as document:
-            #: The text as a plain text. The offset annotation data refers to this plain text.
-            self.plain_text: str = document.read()
+        # absolute, so that a lazy text can be read independently of the current working directory
+        self._text_file_path: str = os.path.abspath(f"{project_uuid}/documents/{document_uuid}/{document_uuid}.txt")
+        self._plain_text: str = None
+
+        if not lazy:
+            self.plain_text
+
+    @property
+    def plain_text(self) -> str:
+        """The text as a plain text. The offset annotation data refers to this plain text."""
+        if self._plain_text is None:
+            self._plain_text = self._storage.read_bytes(self._text_file_path).decode('utf-8')
+        return self._plain_text
 
     def __repr__(self):
         return f"Text(Name: {self.title}, Author: {self.author})"
 
     def __len__(self):
         return len(self.plain_text)
+
+
+class DocumentCache:
+    """Holds every document of a CATMA project exactly once.
+
+    All `Text` objects of a `CatmaProject` are created by this cache, so that the project's texts and all annotation
+    collections on the same document share one plain text.
+
+    Args:
+        project_path (str): The path of the CATMA project directory.
+        lazy (bool, optional): If `True` the documents' plain texts are only read the first time they are accessed.\
+            Useful for projects with very large documents of which only a few are needed. Defaults to False.
+        storage (optional): The storage the documents are read from, see `gitma._storage`. If `None` the documents are read\
+            from the file system. Defaults to None.
+    """
+    def __init__(self, project_path: str, lazy: bool = False, storage=None):
+        #: The path of the CATMA project directory.
+        self.project_path: str = project_path
+
+        #: Whether the plain texts get read the first time they are accessed.
+        self.lazy: bool = lazy
+
+        #: The storage the documents are read from.
+        self.storage = get_storage(storage)
+
+        self._texts: Dict[str, Text] = {}
+
+    def __repr__(self):
+        return f"DocumentCache(Documents: {len(self._texts)}, Lazy: {self.lazy})"
+
+    def __len__(self):
+        return len(self._texts)
+
+    def __contains__(self, document_uuid: str) -> bool:
+        return document_uuid in self._texts
+
+    def __iter__(self) -> Iterator[Text]:
+        return iter(self._texts.values())
+
+    def get(self, document_uuid: str) -> Text:
+        """Returns the document with the given UUID, loading it if it hasn't been loaded before.
+
+        Args:
+            document_uuid (str): Document UUID. Corresponds to the directory name in the "documents" directory.
+
+        Returns:
+            Text: The document as a gitma.Text object.
+        """
+        if document_uuid not in self._texts:
+            self._texts[document_uuid] = Text(
+                project_uuid=self.project_path,
+                document_uuid=document_uuid,
+                lazy=self.lazy,
+                storage=self.storage
+            )
+        return self._texts[document_uuid]
+
+    def remove(self, document_uuid: str) -> None:
+        """Removes a document from the cache, e.g. because it has been changed on disk.
+
+        Args:
+            document_uuid (str): Document UUID.
+        """
+        self._texts.pop(document_uuid, None)
@@ -0,0 +1,176 @@
+import contextlib
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+import pygit2
+
+from gitma import CatmaProject
+from gitma import _git
+from gitma._git import AuthenticationError, PushCallbacks, PushRejectedError, clone_or_fetch_all
+
+
+class TestGit(unittest.TestCase):
+    def test_clone_or_fetch_all(self):
+        # test that missing clones get created, existing clones get fast-forwarded and failures don't stop the other clones
+        git = ['git', '-c', 'user.name=GitMA', '-c', 'user.email=gitma@example.com']
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            clone_urls = {}
+            for index in range(3):
+                origin = os.path.join(temp_dir, f'origin_{index}')
+                subprocess.run(git + ['init', '-q', origin], check=True)
+                with open(os.path.join(origin, 'header.json'), 'w') as header:
+                    header.write('{}')
+                subprocess.run(git + ['-C', origin, 'add', '-A'], check=True)
+                subprocess.run(git + ['-C', origin, 'commit', '-q', '-m', 'init'], check=True)
+                clone_urls[os.path.join(temp_dir, 'clones', f'project_{index}')] = origin
+            missing_clone_path = os.path.join(temp_dir, 'clones', 'missing')
+            clone_urls[missing_clone_path] = os.path.join(temp_dir, 'missing')
+
+            results = clone_or_fetch_all(clone_urls, workers=2, depth=1)
+            self.assertIsInstance(results.pop(missing_clone_path), pygit2.GitError)
+            self.assertEqual(set(results.values()), {'cloned'})
+
+            # a new commit in one origin
+            origin = clone_urls[os.path.join(temp_dir, 'clones', 'project_1')]
+            with open(os.path.join(origin, 'header.json'), 'w') as header:
+                header.write('{"name": "changed"}')
+            subprocess.run(git + ['-C', origin, 'commit', '-q', '-a', '-m', 'change'], check=True)
+
+            del clone_urls[missing_clone_path]
+            results = clone_or_fetch_all(clone_urls, workers=2, depth=1)
+            self.assertEqual(results[os.path.join(temp_dir, 'clones', 'project_0')], 'up to date')
+            self.assertEqual(results[os.path.join(temp_dir, 'clones', 'project_1')], 'updated')
+
+            for path, origin in clone_urls.items():
+                self.assertEqual(pygit2.Repository(path).head.target, pygit2.Repository(origin).head.target)
+                with open(os.path.join(path, 'header.json')) as header, open(os.path.join(origin, 'header.json')) as origin_header:
+                    self.assertEqual(header.read(), origin_header.read())
+
+    def test_push_annotations(self):
+        # test that the changed page files of annotation collections in submodules and the project get committed and pushed
+        # to local bare remotes, leaving other changes alone
+        project_name = 'CATMA_9385E190-13CD-44BE-8A06-32FA95B7EEFA_GitMA_Demo_Project'
+        git = ['git', '-c', 'user.name=GitMA', '-c', 'user.email=gitma@example.com', '-c', 'protocol.file.allow=always']
+        demo_project = CatmaProject(projects_directory='../demo/projects/', project_name=project_name)
+        ac_uuids = [demo_project.ac_dict['ac_1'].uuid, demo_project.ac_dict['ac_2'].uuid]
+
+        def create_remote(source: str, remote: str, submodules: dict = None) -> None:
+            subprocess.run(git + ['init', '-q', source], check=True)
+            for submodule_path, submodule_remote in (submodules or {}).items():
+                subprocess.run(git + ['-C', source, 'submodule', 'add', '-q', submodule_remote, submodule_path], check=True)
+            subprocess.run(git + ['-C', source, 'add', '-A'], check=True)
+            subprocess.run(git + ['-C', source, 'commit', '-q', '-m', 'init'], check=True)
+            subprocess.run(git + ['clone', '-q', '--bare', source, remote], check=True)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            remotes = {}
+            for uuid in ac_uuids:
+                remotes[uuid] = os.path.join(temp_dir, 'remotes', f'{uuid}.git')
+                shutil.copytree(f'../demo/projects/{project_name}/collections/{uuid}', os.path.join(temp_dir, 'sources', uuid))
+                create_remote(os.path.join(temp_dir, 'sources', uuid), remotes[uuid])
+            remotes['project'] = os.path.join(temp_dir, 'remotes', 'project.git')
+            shutil.copytree(
+                f'../demo/projects/{project_name}',
+                os.path.join(temp_dir, 'sources', 'project'),
+                ignore=lambda directory, names: [name for name in names if name in ac_uuids]
+            )
+            create_remote(
+                os.path.join(temp_dir, 'sources', 'project'),
+                remotes['project'],
+                submodules={f'collections/{uuid}': remotes[uuid] for uuid in ac_uuids}
+            )
+            project_path = os.path.join(temp_dir, 'projects', project_name)
+            subprocess.run(git + ['clone', '-q', '--recurse-submodules', remotes['project'], project_path], check=True)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                project = CatmaProject(projects_directory=os.path.join(temp_dir, 'projects'), project_name=project_name)
+                annotations = []
+                for ac_name in ['ac_1', 'ac_2']:
+                    an = project.ac_dict[ac_name].annotations[0]
+                    parameters = an._get_copy_parameters(ac_name, text_title=project.ac_dict[ac_name].text.title)
+                    annotations.extend([parameters] * 3)
+                project.write_annotations(annotations)
+                # a change that isn't a page file
+                with open(f'{project_path}/collections/{ac_uuids[0]}/notes.txt', 'w') as notes:
+                    notes.write('not an annotation')
+
+                results = project.push_annotations(ac_names=['ac_1', 'ac_2'], commit_message='import', workers=2)
+            self.assertEqual(list(results.values()), ['pushed', 'pushed', 'pushed'])
+
+            project_remote = pygit2.Repository(remotes['project'])
+            project_commit = project_remote.revparse_single('master')
+            self.assertEqual(project_commit.message, 'import')
+            for uuid in ac_uuids:
+                repo = pygit2.Repository(f'{project_path}/collections/{uuid}')
+                remote_commit = pygit2.Repository(remotes[uuid]).revparse_single('master')
+                self.assertEqual(remote_commit.id, repo.head.target)
+                self.assertEqual(remote_commit.message, 'import')
+                self.assertEqual(project_commit.tree[f'collections/{uuid}'].id, remote_commit.id)
+                self.assertEqual(len(remote_commit.tree['annotations']), len(os.listdir(f'{project_path}/collections/{uuid}/annotations')))
+                self.assertNotIn('notes.txt', remote_commit.tree)
+            self.assertIn('notes.txt', pygit2.Repository(f'{project_path}/collections/{ac_uuids[0]}').status())
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = project.push_annotations(ac_names=['ac_1', 'ac_2'])
+            self.assertEqual(list(results.values()), ['up to date', 'up to date'])
+            self.assertEqual(project_remote.revparse_single('master').id, project_commit.id)
+
+            # a collection that was changed in the remote meanwhile is rejected, and neither it nor the project is pushed again
+            other_clone = os.path.join(temp_dir, 'other')
+            subprocess.run(git + ['clone', '-q', remotes[ac_uuids[0]], other_clone], check=True)
+            subprocess.run(git + ['-C', other_clone, 'commit', '-q', '--allow-empty', '-m', 'changed in CATMA'], check=True)
+            subprocess.run(git + ['-C', other_clone, 'push', '-q', 'origin', 'HEAD:master'], check=True)
+            remote_commit_id = pygit2.Repository(remotes[ac_uuids[0]]).revparse_single('master').id
+            with contextlib.redirect_stdout(io.StringIO()):
+                project.write_annotations([annotations[0]])
+                results = project.push_annotations(ac_names=['ac_1'])
+            self.assertIsInstance(results[f'{project_path}/collections/{ac_uuids[0]}/'], PushRejectedError)
+            self.assertEqual(results[f'{project_path}/'], 'committed')
+            self.assertEqual(pygit2.Repository(remotes[ac_uuids[0]]).revparse_single('master').id, remote_commit_id)
+            self.assertEqual(project_remote.revparse_single('master').id, project_commit.id)
+
+    def test_helper_credentials(self):
+        # test that the credentials of git's credential helper are looked up once per host, and refused ones aren't retried
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_path = os.path.join(temp_dir, 'requests.log')
+            environment = {
+                'GIT_CONFIG_GLOBAL': os.devnull,
+                'GIT_CONFIG_NOSYSTEM': '1',
+                'GIT_CONFIG_COUNT': '1',
+                'GIT_CONFIG_KEY_0': 'credential.helper',
+                'GIT_CONFIG_VALUE_0': f'!f() {{ echo request >> "{log_path}"; echo username=gitma; echo password=token; }}; f',
+            }
+            original_environment = {key: os.environ.get(key) for key in environment}
+            os.environ.update(environment)
+            _git._helper_credentials.clear()
+            try:
+                for url in ['https://git.catma.de/a.git', 'https://git.catma.de/b.git']:
+                    callbacks = PushCallbacks()
+                    credentials = callbacks.credentials(url, None, pygit2.enums.CredentialType.USERPASS_PLAINTEXT)
+                    self.assertEqual(credentials.credential_tuple, ('gitma', 'token'))
+                    with self.assertRaises(AuthenticationError):
+                        callbacks.credentials(url, None, pygit2.enums.CredentialType.USERPASS_PLAINTEXT)
+                with open(log_path) as log:
+                    self.assertEqual(log.read().splitlines(), ['request'])
+
+                given_credentials = pygit2.UserPass('none', 'access_token')
+                credentials = PushCallbacks(credentials=given_credentials).credentials(
+                    'https://git.catma.de/c.git', None, pygit2.enums.CredentialType.USERPASS_PLAINTEXT
+                )
+                self.assertIs(credentials, given_credentials)
+            finally:
+                _git._helper_credentials.clear()
+                for key, value in original_environment.items():
+                    if value is None:
+                        os.environ.pop(key)
+                    else:
+                        os.environ[key] = value
+
+
+if __name__ == '__main__':
+    unittest.main()
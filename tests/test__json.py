@@ -0,0 +1,39 @@
+import glob
+import json
+import unittest
+
+from gitma import _json
+
+
+class TestJson(unittest.TestCase):
+    def tearDown(self):
+        _json.set_json_backend()
+
+    def test_backends_read_and_write_like_json_module(self):
+        # test that every backend decodes the demo project like the json module and writes the same bytes
+        json_file_paths = glob.glob('../demo/projects/*/**/*.json', recursive=True)
+        test_objects = [[1.5, 1e-05, 1e20], {'key': 'välue', 'list': [None, True, 2 ** 70]}, []]
+
+        for backend in _json.get_available_json_backends():
+            _json.set_json_backend(backend)
+
+            for json_file_path in json_file_paths:
+                with open(json_file_path, 'r', encoding='utf-8') as expected, open(json_file_path, 'rb') as actual:
+                    expected_obj = json.load(expected)
+                    self.assertEqual(expected_obj, _json.load(actual))
+                self.assertEqual(json.dumps(expected_obj, indent=2), _json.dumps(expected_obj, indent=2))
+                self.assertEqual(json.dumps(expected_obj), _json.dumps(expected_obj))
+
+            for test_object in test_objects:
+                self.assertEqual(json.dumps(test_object, indent=2), _json.dumps(test_object, indent=2))
+
+            with self.assertRaises(_json.JSONDecodeError):
+                _json.loads(b'[{"broken": ')
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            _json.set_json_backend('unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
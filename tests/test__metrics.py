@@ -0,0 +1,64 @@
+import random
+import unittest
+
+from gitma import CatmaProject
+from gitma._metrics import EmptyAnnotation, get_annotation_pairs, get_best_overlapping_annotations, get_overlapping_annotations
+from gitma import _metrics
+
+
+class Span:
+    # the attributes of annotations used for pairing
+    def __init__(self, start_point: int, end_point: int):
+        self.start_point = start_point
+        self.end_point = end_point
+
+
+class TestMetrics(unittest.TestCase):
+    def test_overlapping_annotations(self):
+        # test the sweep against comparing all annotations with each other, including empty and touching spans
+        random.seed(0)
+        for _ in range(200):
+            spans1, spans2 = [
+                [Span(start_point, start_point + random.choice([0, 1, 2, 5, 20])) for start_point in
+                 [random.randint(0, 40) for _ in range(random.randint(0, 30))]]
+                for _ in range(2)
+            ]
+            expected_overlapping_spans = [[span2 for span2 in spans2 if _metrics.test_overlap(span1, span2)] for span1 in spans1]
+            overlapping_spans = get_overlapping_annotations(spans1, spans2)
+            self.assertEqual(len(overlapping_spans), len(spans1))
+            for expected, actual in zip(expected_overlapping_spans, overlapping_spans):
+                self.assertEqual([id(span) for span in expected], [id(span) for span in actual])
+
+            best_matching_spans = get_best_overlapping_annotations(spans1, spans2)
+            for span1, expected, actual in zip(spans1, expected_overlapping_spans, best_matching_spans):
+                self.assertIs(actual, _metrics.test_max_overlap(span1, expected) if expected else None)
+
+    def test_get_annotation_pairs(self):
+        # test the pairs of the demo project against comparing all annotations with each other
+        project = CatmaProject(
+            projects_directory='../demo/projects/',
+            project_name='CATMA_9385E190-13CD-44BE-8A06-32FA95B7EEFA_GitMA_Demo_Project'
+        )
+        ac1, ac2 = project.ac_dict['ac_1'], project.ac_dict['ac_2']
+
+        empty_annotations = 0
+        for ac1, ac2, tag_filter in [(ac1, ac2, None), (ac2, ac1, ['process_event', 'stative_event'])]:
+            pairs = get_annotation_pairs(ac1, ac2, tag_filter=tag_filter, filter_both_ac=True, verbose=False)
+            ac1_annotations, ac2_annotations = _metrics.get_same_text(
+                *_metrics.filter_ac_by_tag(ac1, ac2, tag_filter=tag_filter, filter_both_ac=True)
+            )
+            self.assertEqual([an1 for an1, _ in pairs], ac1_annotations)
+            for an1, an2 in pairs:
+                overlapping_annotations = [an for an in ac2_annotations if _metrics.test_overlap(an1, an)]
+                if overlapping_annotations:
+                    self.assertIs(an2, _metrics.test_max_overlap(an1, overlapping_annotations))
+                else:
+                    empty_annotations += 1
+                    self.assertIsInstance(an2, EmptyAnnotation)
+                    self.assertEqual((an2.start_point, an2.end_point), (an1.start_point, an1.end_point))
+                    self.assertEqual(an2.properties, {key: '#None#' for key in an1.properties})
+        self.assertGreater(empty_annotations, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+
+from gitma import CatmaProject
+from gitma._network import Network, cooccurrent_annotations, overlapping_annotations
+
+
+class TestNetwork(unittest.TestCase):
+    def test_excluded_tags(self):
+        # test that the tags that are filtered out of the categorical tag column are not counted as co-occurrent
+        project = CatmaProject(
+            projects_directory='../demo/projects/',
+            project_name='CATMA_9385E190-13CD-44BE-8A06-32FA95B7EEFA_GitMA_Demo_Project'
+        )
+        ac = project.ac_dict['ac_1']
+        df = ac.df[ac.df.tag != 'non_event']
+        for tag_dict in [cooccurrent_annotations(ac_df=df), overlapping_annotations(ac_df=df, only_different_acs=False)]:
+            self.assertSetEqual(set(tag_dict), set(df.tag.unique()))
+            self.assertNotIn('non_event', tag_dict)
+
+        for edge_func in ['cooccurrent', 'overlapping']:
+            network = Network(annotation_collections=[ac], edge_func=edge_func, excluded_tags=['non_event'])
+            self.assertNotIn('non_event', network.network_graph.nodes)
+        self.assertGreater(len(Network(annotation_collections=[ac], excluded_tags=['non_event']).edges), 0)
+
+        figure = ac.cooccurrence_network(excluded_tags=['non_event'])
+        self.assertNotIn('non_event', figure.data[-1].text)
+
+
+if __name__ == '__main__':
+    unittest.main()
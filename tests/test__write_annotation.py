@@ -1,8 +1,15 @@
+import contextlib
+import glob
+import io
 import os
+import shutil
+import tempfile
+import threading
 import unittest
 
 from gitma import CatmaProject
-from gitma._write_annotation import write_annotation_json
+from gitma._page_files import JOURNAL_FILE_NAME, PageFileTransaction
+from gitma._write_annotation import write_annotation_json, write_annotations
 from gitma.annotation import get_tagset_uuid, get_tag_uuid
 
 
@@ -86,6 +93,129 @@ class TestWriteAnnotation(unittest.TestCase):
         # delete output page file
         os.remove(relative_page_file_path)
 
+    def test_write_annotations(self):
+        # test that writing annotations in bulk gives the same page files as writing them one by one
+        project_name = 'CATMA_9385E190-13CD-44BE-8A06-32FA95B7EEFA_GitMA_Demo_Project'
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            projects = {}
+            for mode in ['single', 'bulk']:
+                shutil.copytree(f'../demo/projects/{project_name}', f'{temp_dir}/{mode}/{project_name}')
+                with contextlib.redirect_stdout(io.StringIO()):
+                    projects[mode] = CatmaProject(projects_directory=f'{temp_dir}/{mode}/', project_name=project_name)
+
+            # enough annotations for several page files, in two annotation collections, with an existing "[]" page file
+            project = projects['single']
+            acs = [project.ac_dict['ac_1'], project.ac_dict['ac_2']]
+            for mode in ['single', 'bulk']:
+                with open(f'{temp_dir}/{mode}/{project_name}/collections/{acs[1].uuid}/annotations/GitMA_DummyUser_0.json', 'w') as page_file:
+                    page_file.write('[]')
+
+            annotations = []
+            for index in range(600):
+                ac = acs[index % 2]
+                an = ac.annotations[index % len(ac.annotations)]
+                annotations.append({
+                    'text_title': ac.text.title,
+                    'annotation_collection_name': ac.name,
+                    'tagset_name': project.tagset_dict[get_tagset_uuid(an.data)].name,
+                    'tag_name': an.tag.name,
+                    'start_points': [an.start_point],
+                    'end_points': [an.end_point],
+                    'property_annotations': an.properties,
+                    'author': an.author,
+                    'uuid_override': f'CATMA_{index:08d}-684C-11EE-8D15-9CB6D09600FA',
+                    'timestamp_override': '2023-10-11T17:40:30.684+02:00'
+                })
+
+            single_page_file_paths = [write_annotation_json(projects['single'], **annotation) for annotation in annotations]
+            bulk_page_file_paths = write_annotations(projects['bulk'], iter(annotations))
+            self.assertListEqual(bulk_page_file_paths, list(dict.fromkeys(single_page_file_paths)))
+            self.assertGreater(len(bulk_page_file_paths), 2)
+
+            for page_file_path in glob.glob(f'{temp_dir}/single/**/*.json', recursive=True):
+                with open(page_file_path, 'rb') as single, open(page_file_path.replace('/single/', '/bulk/'), 'rb') as bulk:
+                    self.assertEqual(single.read(), bulk.read(), page_file_path)
+
+    def test_concurrent_writes_and_recovery(self):
+        # test that concurrent writers don't corrupt the page files and that interrupted writes get rolled back
+        project_name = 'CATMA_9385E190-13CD-44BE-8A06-32FA95B7EEFA_GitMA_Demo_Project'
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            shutil.copytree(f'../demo/projects/{project_name}', f'{temp_dir}/{project_name}')
+            with contextlib.redirect_stdout(io.StringIO()):
+                project = CatmaProject(projects_directory=f'{temp_dir}/', project_name=project_name)
+            ac = project.ac_dict['ac_1']
+            annotations_directory = f'{project.project_path}/collections/{ac.uuid}/annotations'
+
+            def get_annotations(writer: int) -> list:
+                return [{
+                    'text_title': ac.text.title,
+                    'annotation_collection_name': ac.name,
+                    'tagset_name': project.tagset_dict[get_tagset_uuid(an.data)].name,
+                    'tag_name': an.tag.name,
+                    'start_points': [an.start_point],
+                    'end_points': [an.end_point],
+                    'author': an.author,
+                    'uuid_override': f'CATMA_{writer:04d}{index:04d}-684C-11EE-8D15-9CB6D09600FA',
+                } for index, an in enumerate(ac.annotations * 10)]
+
+            # several writers appending to the same annotation collection at the same time, like parallel importers
+            threads = [
+                threading.Thread(target=write_annotations, args=(project, get_annotations(writer)))
+                for writer in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                reloaded_ac = CatmaProject(projects_directory=f'{temp_dir}/', project_name=project_name).ac_dict['ac_1']
+            self.assertNotIn('WARNING', output.getvalue())
+            self.assertEqual(len(reloaded_ac.annotations), 20 + 4 * 200)
+            self.assertEqual(len({an.uuid for an in reloaded_ac.annotations}), 20 + 4 * 200)
+
+            # a transaction that gets interrupted after changing a page file in place and creating a new one
+            page_file_path = sorted(glob.glob(f'{annotations_directory}/*.json'))[0]
+            with open(page_file_path, 'rb') as page_file:
+                original_content = page_file.read()
+            new_page_file_path = f'{annotations_directory}/GitMA_DummyUser_999.json'
+
+            transaction = PageFileTransaction(annotations_directory).__enter__()
+            transaction.record(page_file_path, offset=len(original_content) - 2)
+            with open(page_file_path, 'r+b') as page_file:
+                page_file.seek(-2, os.SEEK_END)
+                page_file.write(b',\n  {"incomplete')
+            transaction.record(new_page_file_path)
+            with open(new_page_file_path, 'wb') as page_file:
+                page_file.write(b'[\n  {')
+            # the lock is released when the writing process dies
+            transaction._unlock()
+
+            # loading only warns about the interrupted write and leaves the page files alone
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                reloaded_project = CatmaProject(projects_directory=f'{temp_dir}/', project_name=project_name)
+                reloaded_ac = reloaded_project.ac_dict['ac_1']
+                reloaded_ac.annotations
+            self.assertIn('interrupted write', output.getvalue())
+            self.assertNotIn('Rolled back', output.getvalue())
+            self.assertTrue(os.path.exists(new_page_file_path))
+            self.assertTrue(os.path.exists(f'{annotations_directory}/{JOURNAL_FILE_NAME}'))
+
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                recovered_paths = reloaded_project.recover()
+            self.assertIn('Rolled back', output.getvalue())
+            self.assertListEqual(
+                recovered_paths,
+                [os.path.relpath(path, reloaded_project.project_path) for path in sorted([page_file_path, new_page_file_path])]
+            )
+            self.assertEqual(len(reloaded_ac.annotations), 20 + 4 * 200)
+            with open(page_file_path, 'rb') as page_file:
+                self.assertEqual(page_file.read(), original_content)
+            self.assertFalse(os.path.exists(new_page_file_path))
+            self.assertFalse(os.path.exists(f'{annotations_directory}/{JOURNAL_FILE_NAME}'))
+
 
 if __name__ == '__main__':
     unittest.main()
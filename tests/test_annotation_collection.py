@@ -0,0 +1,119 @@
+import shutil
+import tempfile
+import unittest
+
+from gitma import CatmaProject
+from gitma.annotation_collection import categorical_df_columns, clean_text_in_ac_df
+
+
+PROJECTS_DIRECTORY = '../demo/projects/'
+PROJECT_NAME = 'CATMA_9385E190-13CD-44BE-8A06-32FA95B7EEFA_GitMA_Demo_Project'
+
+
+class TestAnnotationCollection(unittest.TestCase):
+    def test_df(self):
+        # test that the column-wise built data frame matches the annotations row by row
+        project = CatmaProject(projects_directory=PROJECTS_DIRECTORY, project_name=PROJECT_NAME)
+
+        for ac in project.annotation_collections:
+            if not ac.annotations:
+                continue
+
+            for col in categorical_df_columns:
+                self.assertEqual(ac.df[col].dtype, 'category')
+
+            properties = {prop for an in ac.annotations for prop in an.properties}
+            for index, an in enumerate(ac.annotations):
+                row = ac.df.iloc[index]
+                self.assertEqual(row['document'], ac.text.title)
+                self.assertEqual(row['annotation collection'], ac.name)
+                self.assertEqual(row['annotator'], an.author)
+                self.assertEqual(row['tag'], an.tag.name)
+                self.assertEqual(row['tag_path'], an.tag.full_path)
+                self.assertEqual(row['left_context'], clean_text_in_ac_df(an.pretext))
+                self.assertEqual(row['annotation'], clean_text_in_ac_df(an.text))
+                self.assertEqual(row['right_context'], clean_text_in_ac_df(an.posttext))
+                self.assertEqual(row['start_point'], an.start_point)
+                self.assertEqual(row['end_point'], an.end_point)
+                self.assertEqual(row['date'], an.date)
+                for prop in properties:
+                    self.assertEqual(row[f'prop:{prop}'], an.properties.get(prop, ['nan']))
+
+    def test_annotations_under(self):
+        # test the hierarchy queries against walking up the parent tags, with tags of the demo project nested three levels deep
+        project = CatmaProject(projects_directory=PROJECTS_DIRECTORY, project_name=PROJECT_NAME)
+        tagset = project.tagsets[0]
+        tags = {tag.name: tag for tag in tagset.tags}
+        tags['change_of_state'].parent_id = tags['process_event'].id
+        tags['stative_event'].parent_id = tags['change_of_state'].id
+        tagset.index_hierarchy()
+
+        self.assertEqual(tags['stative_event'].full_path, '/process_event/change_of_state/stative_event')
+        self.assertEqual(tags['stative_event'].depth, 2)
+        self.assertTrue(tagset.is_descendant(tags['stative_event'], tags['process_event']))
+        self.assertFalse(tagset.is_descendant(tags['process_event'], tags['stative_event']))
+        self.assertFalse(tagset.is_descendant(tags['non_event'], tags['process_event']))
+        self.assertListEqual(
+            tagset.descendants(tags['process_event']),
+            [tags['change_of_state'], tags['stative_event']]
+        )
+
+        def is_under(tag, ancestor):
+            while tag is not None:
+                if tag is ancestor:
+                    return True
+                tag = tag.parent
+            return False
+
+        ac = project.ac_dict['ac_1']
+        for tag in tagset.tags:
+            expected = [an for an in ac.annotations if is_under(an.tag, tag)]
+            self.assertListEqual(ac.annotations_under(tag), expected)
+            self.assertListEqual(ac.get_annotation_by_tag(tag.name), expected)
+            self.assertListEqual(
+                ac.annotations_under(tag, include_self=False),
+                [an for an in expected if an.tag is not tag]
+            )
+
+        # the data frame gets filtered by whole tag names and the end of tag paths, with the tags below them
+        def get_rows(annotations):
+            return [ac.annotations.index(an) for an in annotations]
+
+        self.assertListEqual(list(ac.filter_by_tag_path('process_event').index), get_rows(ac.annotations_under(tags['process_event'])))
+        self.assertListEqual(
+            list(ac.filter_by_tag_path('process_event/change_of_state').index),
+            get_rows(ac.annotations_under(tags['change_of_state']))
+        )
+        self.assertTrue(ac.filter_by_tag_path('event').empty)
+        # the deprecated substring matching of earlier versions, on the tag paths of the data frame
+        self.assertListEqual(
+            list(ac.filter_by_tag_path('event', match_substring=True).index),
+            [index for index, tag_path in enumerate(ac.df.tag_path) if 'event' in tag_path]
+        )
+        self.assertListEqual(
+            list(ac.filter_by_tag_path('_of_', match_substring=True).index),
+            get_rows([an for an in ac.annotations if an.tag is tags['change_of_state']])
+        )
+
+    def test_remove_annotations(self):
+        # test that the patched annotation collection equals the annotation collection loaded again from the page files
+        with tempfile.TemporaryDirectory() as temp_dir:
+            shutil.copytree(f'{PROJECTS_DIRECTORY}{PROJECT_NAME}', f'{temp_dir}/{PROJECT_NAME}')
+            project = CatmaProject(projects_directory=f'{temp_dir}/', project_name=PROJECT_NAME)
+            ac = project.ac_dict['ac_1']
+            annotation_count = len(ac.annotations)
+            stative_event_count = sum(an.tag.name == 'stative_event' for an in ac.annotations)
+
+            self.assertEqual(ac.remove_annotations(lambda an: an.tag.name == 'stative_event'), stative_event_count)
+            self.assertEqual(ac.remove_annotations([ac.annotations[0].uuid, ac.annotations[-1].uuid, 'unknown']), 2)
+            self.assertEqual(ac.remove_annotations([]), 0)
+            self.assertEqual(len(ac.annotations), annotation_count - stative_event_count - 2)
+            self.assertNotIn('stative_event', ac.df['tag'].values)
+
+            reloaded_ac = CatmaProject(projects_directory=f'{temp_dir}/', project_name=PROJECT_NAME).ac_dict['ac_1']
+            self.assertListEqual([an.uuid for an in ac.annotations], [an.uuid for an in reloaded_ac.annotations])
+            self.assertTrue(ac.df.equals(reloaded_ac.df))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from datetime import timedelta
+
+import numpy as np
+
+from gitma import CatmaProject
+from gitma.annotation import parse_date
+from gitma.annotation_columns import EPOCH, AnnotationColumns, parse_dates
+
+
+class TestAnnotationColumns(unittest.TestCase):
+    def setUp(self):
+        self.project = CatmaProject(
+            projects_directory='../demo/projects/',
+            project_name='CATMA_9385E190-13CD-44BE-8A06-32FA95B7EEFA_GitMA_Demo_Project'
+        )
+
+    def test_columns_match_annotations(self):
+        # test that every row of the columns describes the annotation with the same index
+        for ac in self.project.annotation_collections:
+            columns = ac.columns
+            self.assertEqual(len(columns), len(ac.annotations))
+
+            for index, an in enumerate(ac.annotations):
+                self.assertEqual(columns.start_points[index], an.start_point)
+                self.assertEqual(columns.end_points[index], an.end_point)
+                self.assertEqual(columns.authors[columns.author_codes[index]], an.author)
+                self.assertEqual(columns.tag_uuids[columns.tag_codes[index]], an.tag.id)
+                self.assertEqual(columns.page_file_paths[columns.page_file_codes[index]], an.page_file_path)
+                self.assertEqual(columns.to_datetime()[index], an.date)
+
+                segments = slice(columns.segment_offsets[index], columns.segment_offsets[index + 1])
+                self.assertListEqual(
+                    [(selector.start, selector.end) for selector in an.selectors],
+                    list(zip(columns.segment_starts[segments], columns.segment_ends[segments]))
+                )
+
+            self.assertTrue(np.array_equal(columns.sort_order(), np.arange(len(columns))))
+
+    def test_take_and_concatenate(self):
+        # test that splitting the columns and concatenating the parts in reverse order gives the columns of the reversed annotations
+        ac = self.project.ac_dict['ac_1']
+        middle = len(ac.annotations) // 2
+        first_part = ac.columns.take(np.arange(middle))
+        second_part = AnnotationColumns(ac.annotations[middle:])
+
+        columns = AnnotationColumns.concatenate([second_part, first_part])
+        expected_columns = AnnotationColumns(ac.annotations[middle:] + ac.annotations[:middle])
+
+        for name in ('start_points', 'end_points', 'dates', 'utc_offsets', 'segment_offsets', 'segment_starts', 'segment_ends'):
+            self.assertTrue(np.array_equal(getattr(columns, name), getattr(expected_columns, name)), name)
+        for codes_name, categories_name in (('author_codes', 'authors'), ('tag_codes', 'tag_uuids')):
+            self.assertListEqual(
+                [getattr(columns, categories_name)[code] for code in getattr(columns, codes_name)],
+                [getattr(expected_columns, categories_name)[code] for code in getattr(expected_columns, codes_name)]
+            )
+
+    def test_parse_dates(self):
+        # test that bulk parsing gives the same results as parsing the timestamps one by one, including legacy timestamps without UTC offset
+        timestamps = [
+            '2023-08-03T13:29:00.085+0200',
+            '2023-08-03T13:29:00.085-05:30',
+            '2023-08-03T13:29:00.123456Z',
+            '2021-01-01T10:00:00',
+            '2023-08-03T13:29:00.5+01:00:30'
+        ]
+        dates, utc_offsets = parse_dates(timestamps)
+
+        for timestamp, date, utc_offset in zip(timestamps, dates, utc_offsets):
+            expected_date = parse_date(timestamp)
+            self.assertEqual(date, (expected_date - EPOCH) // timedelta(microseconds=1))
+            self.assertEqual(utc_offset, expected_date.utcoffset().total_seconds())
+
+        with self.assertRaises(ValueError):
+            parse_dates(['2023-08-03 13:29'])
+
+
+if __name__ == '__main__':
+    unittest.main()
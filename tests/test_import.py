@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+import unittest
+
+REPOSITORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# dependencies that should only be imported by the methods that need them
+HEAVY_DEPENDENCIES = ['pygit2', 'gitlab', 'plotly', 'spacy', 'networkx', 'IPython', 'nltk', 'pygamma_agreement']
+
+
+def get_loaded_modules(statement: str) -> set:
+    # imports in a fresh interpreter, this process has imported everything already
+    output = subprocess.run(
+        [sys.executable, '-c', f'import sys\n{statement}\nprint(" ".join(sys.modules))'],
+        cwd=REPOSITORY_PATH,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    return set(output.split())
+
+
+class TestImport(unittest.TestCase):
+    def test_import_gitma(self):
+        # test that importing the package doesn't import any of its modules
+        loaded_modules = get_loaded_modules('import gitma')
+        self.assertEqual({module for module in loaded_modules if module.startswith('gitma.')}, set())
+        self.assertNotIn('pandas', loaded_modules)
+
+    def test_import_classes(self):
+        # test that the classes can be imported without the heavy dependencies
+        loaded_modules = get_loaded_modules('from gitma import *\nfrom gitma import CatmaProject, Catma, AnnotationCollection')
+        self.assertIn('gitma.project', loaded_modules)
+        for dependency in HEAVY_DEPENDENCIES:
+            self.assertNotIn(dependency, loaded_modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,430 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from datetime import datetime
+
+from gitma import AnnotationFilter, CatmaProject
+from gitma.annotation import get_tagset_uuid
+from gitma._gold_annotation import compare_annotations
+from gitma import _metrics
+from gitma.catma import load_local_projects
+
+
+PROJECTS_DIRECTORY = '../demo/projects/'
+PROJECT_NAME = 'CATMA_9385E190-13CD-44BE-8A06-32FA95B7EEFA_GitMA_Demo_Project'
+
+
+def load_demo_project(**kwargs) -> CatmaProject:
+    # the demo project, loaded with the given `CatmaProject` arguments
+    return CatmaProject(projects_directory=PROJECTS_DIRECTORY, project_name=PROJECT_NAME, **kwargs)
+
+
+class TestProject(unittest.TestCase):
+    def test_load_annotation_collections_with_workers(self):
+        # test that loading the annotation collections in worker processes gives the same results as loading them one after another
+        project = load_demo_project()
+        parallel_project = load_demo_project(workers=2)
+
+        self.assertListEqual(
+            [ac.name for ac in project.annotation_collections],
+            [ac.name for ac in parallel_project.annotation_collections]
+        )
+
+        for ac, parallel_ac in zip(project.annotation_collections, parallel_project.annotation_collections):
+            self.assertListEqual([an.uuid for an in ac.annotations], [an.uuid for an in parallel_ac.annotations])
+            self.assertTrue(ac.df.equals(parallel_ac.df))
+
+            for an in parallel_ac.annotations:
+                # annotations have to be linked to the project and tags of the loading process
+                self.assertIs(an.project, parallel_project)
+                self.assertIs(an.tag, parallel_project.tagset_dict[get_tagset_uuid(an.data)].tag_dict[an.tag.id])
+
+    def test_lazy_annotation_collections(self):
+        # test that lazy annotation collections only get loaded on access and then equal eagerly loaded ones
+        project = load_demo_project()
+        lazy_project = load_demo_project(lazy=True)
+
+        for ac in lazy_project.annotation_collections:
+            self.assertIsNone(ac._annotations)
+            self.assertIsNone(ac._df)
+
+        for ac in project.annotation_collections:
+            lazy_ac = lazy_project.ac_dict[ac.name]
+            self.assertListEqual([an.uuid for an in ac.annotations], [an.uuid for an in lazy_ac.annotations])
+            self.assertTrue(ac.df.equals(lazy_ac.df))
+            self.assertEqual(ac.text.title, lazy_ac.text.title)
+
+    def test_documents_are_shared(self):
+        # test that the project's texts and the annotation collections share one Text object per document
+        project = load_demo_project()
+
+        for ac in project.annotation_collections:
+            self.assertIs(ac.text, project.document_cache.get(ac.plain_text_id))
+            self.assertIn(ac.text, project.texts)
+
+        # the plain texts can be read lazily without loading the annotation collections lazily, and the other way round
+        for lazy, lazy_documents in [(False, True), (True, False)]:
+            project = load_demo_project(
+                excluded_acs=[ac.name for ac in project.annotation_collections],
+                lazy=lazy,
+                lazy_documents=lazy_documents
+            )
+            self.assertIs(project.document_cache.lazy, lazy_documents)
+            for text in project.texts:
+                self.assertEqual(text._plain_text is None, lazy_documents)
+
+    def test_cache_dir(self):
+        # test that a project loaded from the cache equals the project loaded from the JSON files
+        project = load_demo_project()
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for _ in range(2):  # the first run fills the cache, the second one reads from it
+                cached_project = load_demo_project(cache_dir=cache_dir)
+
+                for ac in project.annotation_collections:
+                    cached_ac = cached_project.ac_dict[ac.name]
+                    self.assertListEqual([an.uuid for an in ac.annotations], [an.uuid for an in cached_ac.annotations])
+                    self.assertTrue(ac.df.equals(cached_ac.df))
+                    self.assertIs(cached_ac.text, cached_project.document_cache.get(cached_ac.plain_text_id))
+
+                    for an in cached_ac.annotations:
+                        self.assertIs(an.project, cached_project)
+                        self.assertIs(an.tag, cached_project.tagset_dict[get_tagset_uuid(an.data)].tag_dict[an.tag.id])
+
+    def test_compact_annotations(self):
+        # test that compact annotations equal complete ones and read their JSON data from the page file on access
+        project = load_demo_project()
+        compact_project = load_demo_project(compact=True)
+
+        for ac in project.annotation_collections:
+            compact_ac = compact_project.ac_dict[ac.name]
+            self.assertTrue(ac.df.equals(compact_ac.df))
+
+            for an, compact_an in zip(ac.annotations, compact_ac.annotations):
+                self.assertIsNone(compact_an._data)
+                self.assertFalse(hasattr(compact_an, '__dict__'))
+                self.assertEqual(an.text, compact_an.text)
+                self.assertEqual(an.to_dict(), compact_an.to_dict())
+                self.assertEqual(an.data, compact_an.data)
+
+        # within a batch, each page file gets parsed once for all of its annotations
+        compact_project = load_demo_project(compact=True)
+        with compact_project.batch() as batch:
+            annotations = list(compact_project.annotations())
+            for an in annotations:
+                self.assertIs(an.data, batch._pages[an.page_file_path][an.uuid])
+            self.assertSetEqual(set(batch._pages), {an.page_file_path for an in annotations})
+
+    def test_iter_annotations_stream(self):
+        # test that streamed records match the loaded annotations and that streaming doesn't load the annotation collections
+        project = load_demo_project()
+        lazy_project = load_demo_project(lazy=True)
+
+        records = list(lazy_project.iter_annotations(stream=True))
+        for ac in lazy_project.annotation_collections:
+            self.assertIsNone(ac._annotations)
+
+        annotations = {an.uuid: an for an in project.iter_annotations()}
+        self.assertEqual(len(records), len(annotations))
+        for record in records:
+            an = annotations[record.uuid]
+            self.assertEqual(record.author, an.author)
+            self.assertEqual(record.tag.id, an.tag.id)
+            self.assertEqual((record.start_point, record.end_point), (an.start_point, an.end_point))
+            self.assertListEqual(list(record.spans), [(selector.start, selector.end) for selector in an.selectors])
+            self.assertEqual(record.properties, an.properties)
+            self.assertEqual(record.page_file_path, an.page_file_path)
+
+    def test_annotation_filter(self):
+        # test that a filtered project holds the annotations of the complete project that match the filter
+        project = load_demo_project()
+        start_date = datetime.fromisoformat('2023-08-02T15:50:00+02:00')
+        end_date = datetime.fromisoformat('2023-08-03T13:30:00+02:00')
+
+        annotation_filters = {
+            'tags': (
+                AnnotationFilter(tags=['process_event', '/non_event']),
+                lambda an: an.tag.name in ['process_event', 'non_event']
+            ),
+            'authors': (AnnotationFilter(authors=['MVauth']), lambda an: an.author == 'MVauth'),
+            'dates': (
+                AnnotationFilter(start_date=start_date, end_date=end_date.isoformat()),
+                lambda an: start_date <= an.date <= end_date
+            ),
+            'combined': (
+                AnnotationFilter(tags=['process_event'], authors=['mvgoogle'], documents=['The Metamorphosis']),
+                lambda an: an.tag.name == 'process_event' and an.author == 'mvgoogle'
+            ),
+            'documents': (AnnotationFilter(documents=['Unknown Document']), lambda an: False),
+        }
+
+        for name, (annotation_filter, predicate) in annotation_filters.items():
+            with self.subTest(name):
+                filtered_project = load_demo_project(annotation_filter=annotation_filter)
+                expected_uuids = {an.uuid for an in project.iter_annotations() if predicate(an)}
+                self.assertTrue(name == 'documents' or 0 < len(expected_uuids) < len(list(project.iter_annotations())))
+                self.assertEqual({an.uuid for an in filtered_project.iter_annotations()}, expected_uuids)
+                self.assertEqual({record.uuid for record in filtered_project.iter_annotations(stream=True)}, expected_uuids)
+                self.assertEqual(len(filtered_project.merge_annotations()), len(expected_uuids))
+
+    def test_batch(self):
+        # test that modifications within a batch give the same page files as without, and are only written when the batch ends
+        def modify(project):
+            ac = project.ac_dict['ac_1']
+            ac.rename_property_value(tag='stative_event', prop='representation_type', old_value='narrator_speech', new_value='x')
+            ac.annotations[0].modify_start_point(1, relative=True)
+            ac.annotations[1].remove()
+            ac.annotations[2].set_property_values(tag=ac.annotations[2].tag.name, prop='representation_type', value=['y'])
+            ac.annotations[2].modify_end_point(-1, relative=True)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            projects = {}
+            for mode in ['single', 'batch']:
+                shutil.copytree(f'{PROJECTS_DIRECTORY}{PROJECT_NAME}', f'{temp_dir}/{mode}/{PROJECT_NAME}')
+                projects[mode] = CatmaProject(projects_directory=f'{temp_dir}/{mode}/', project_name=PROJECT_NAME)
+            page_file_path = projects['batch'].ac_dict['ac_1'].annotations[0].page_file_path
+            with open(page_file_path, 'rb') as page_file:
+                original_page_file = page_file.read()
+
+            modify(projects['single'])
+            with projects['batch'].batch() as batch:
+                modify(projects['batch'])
+                self.assertEqual(batch.page_file_paths, [page_file_path])
+                with open(page_file_path, 'rb') as page_file:
+                    self.assertEqual(page_file.read(), original_page_file)
+
+            with open(page_file_path, 'rb') as batch_page_file, \
+                    open(page_file_path.replace('/batch/', '/single/'), 'rb') as single_page_file:
+                self.assertEqual(batch_page_file.read(), single_page_file.read())
+            self.assertEqual(os.listdir(os.path.dirname(page_file_path)), [os.path.basename(page_file_path)])
+
+            # nothing gets written if the batch fails
+            with open(page_file_path, 'rb') as page_file:
+                modified_page_file = page_file.read()
+            with self.assertRaises(KeyError):
+                with projects['batch'].batch():
+                    projects['batch'].ac_dict['ac_1'].annotations[3].remove()
+                    raise KeyError
+            with open(page_file_path, 'rb') as page_file:
+                self.assertEqual(page_file.read(), modified_page_file)
+
+            # the changes of a page file that can't be rewritten stay in the batch
+            missing_page_file_path = os.path.join(os.path.dirname(page_file_path), 'GitMA_DummyUser_999.json')
+            annotation = projects['batch'].ac_dict['ac_1'].annotations[3]
+            with self.assertRaises(FileNotFoundError):
+                with projects['batch'].batch() as batch:
+                    annotation.remove()
+                    batch.remove(missing_page_file_path, annotation.uuid)
+            self.assertEqual(batch.page_file_paths, [missing_page_file_path])
+            self.assertEqual(len(batch), 1)
+            with open(page_file_path, 'rb') as page_file:
+                self.assertNotEqual(page_file.read(), modified_page_file)
+
+    def test_gold_annotations(self):
+        # test the gold annotations against the pairwise comparison of all annotations, and the majority vote against them
+        def get_spans(annotations):
+            return sorted((an.start_point, an.end_point, an.tag.name) for an in annotations)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            shutil.copytree(f'{PROJECTS_DIRECTORY}{PROJECT_NAME}', f'{temp_dir}/{PROJECT_NAME}')
+            project = CatmaProject(projects_directory=f'{temp_dir}/', project_name=PROJECT_NAME)
+            al1 = [an for an in project.ac_dict['ac_1'].annotations if an.tag.name != 'non_event']
+            al2 = [an for an in project.ac_dict['ac_2'].annotations if an.tag.name != 'non_event']
+            expected_spans = []
+            for an in al1:
+                overlapping_annotations = [an2 for an2 in al2 if _metrics.test_overlap(an, an2)]
+                if overlapping_annotations and compare_annotations(an, overlapping_annotations, min_overlap=0.5):
+                    expected_spans.append((an.start_point, an.end_point, an.tag.name))
+
+            project.create_gold_annotations('ac_1', 'ac_2', 'gold_annotation', excluded_tags=['non_event'], min_overlap=0.5)
+            gold_spans = get_spans(
+                CatmaProject(projects_directory=f'{temp_dir}/', project_name=PROJECT_NAME).ac_dict['gold_annotation'].annotations
+            )
+            self.assertGreater(len(gold_spans), 0)
+            self.assertListEqual(gold_spans, sorted(expected_spans))
+
+            # with ac_1 voting twice, all of its annotations get 2 votes and the ones matched in ac_2 get 3
+            for min_votes, expected_spans in [(2, get_spans(al1)), (3, gold_spans)]:
+                project.create_majority_vote_annotations(
+                    ['ac_1', 'ac_2', 'ac_1'], 'gold_annotation', min_votes=min_votes, excluded_tags=['non_event'], min_overlap=0.5
+                )
+                majority_vote_spans = get_spans(
+                    CatmaProject(projects_directory=f'{temp_dir}/', project_name=PROJECT_NAME).ac_dict['gold_annotation'].annotations
+                )
+                self.assertListEqual(majority_vote_spans, expected_spans)
+
+    def test_migrate_schema(self):
+        # test that renames and value remaps are applied to tags and annotations in one pass
+        with tempfile.TemporaryDirectory() as temp_dir:
+            shutil.copytree(f'{PROJECTS_DIRECTORY}{PROJECT_NAME}', f'{temp_dir}/{PROJECT_NAME}')
+            project = CatmaProject(projects_directory=f'{temp_dir}/', project_name=PROJECT_NAME)
+            value_map = {'narrator_speech': 'narration', 'narration': 'narrative'}
+            expected_values = {
+                ac.name: [
+                    [value_map['narration'] if value == 'narrator_speech' else value for value in an.properties['representation_type']]
+                    for an in ac.annotations
+                ]
+                for ac in project.annotation_collections
+            }
+
+            with project.migrate_schema() as migration:
+                migration.rename_property('representation_type', 'representation')
+                # found by its new name, the remaps are composed
+                migration.remap_property_values('representation', {'narrator_speech': 'narration'})
+                migration.remap_property_values('representation', {'narration': 'narrative'}, tagsets=['demo_tagset'])
+
+            tag_paths = sorted(tag.path for tagset in project.tagsets for tag in tagset.tags)
+            for reloaded_project in [project, CatmaProject(projects_directory=f'{temp_dir}/', project_name=PROJECT_NAME)]:
+                self.assertListEqual(sorted(tag.path for tagset in reloaded_project.tagsets for tag in tagset.tags), tag_paths)
+                for tagset in reloaded_project.tagsets:
+                    for tag in tagset.tags:
+                        self.assertListEqual(list(tag.properties_dict), ['representation'])
+                        self.assertNotIn('narrator_speech', tag.properties_dict['representation'].possible_value_list)
+                for ac in reloaded_project.annotation_collections:
+                    self.assertListEqual([an.properties['representation'] for an in ac.annotations], expected_values[ac.name])
+                    if ac.annotations:
+                        self.assertIn('prop:representation', ac.df.columns)
+
+            # only the properties of selected tags change
+            values = {an.uuid: an.properties['representation'] for an in project.annotations()}
+            with project.migrate_schema() as migration:
+                migration.remap_property_values('representation', {'narrative': 'n'}, tags=['/process_event'])
+            for an in project.annotations():
+                if an.tag.name == 'process_event':
+                    self.assertListEqual(an.properties['representation'], ['n' if value == 'narrative' else value for value in values[an.uuid]])
+                else:
+                    self.assertListEqual(an.properties['representation'], values[an.uuid])
+            self.assertIn(['n'], [an.properties['representation'] for an in project.annotations()])
+
+        # the page files of annotation collections that were not loaded get migrated, too
+        with tempfile.TemporaryDirectory() as temp_dir:
+            shutil.copytree(f'{PROJECTS_DIRECTORY}{PROJECT_NAME}', f'{temp_dir}/{PROJECT_NAME}')
+            project = CatmaProject(projects_directory=f'{temp_dir}/', project_name=PROJECT_NAME, excluded_acs=['ac_2'])
+            with project.migrate_schema() as migration:
+                migration.remap_property_values('representation_type', {'narrator_speech': 'narration'})
+
+            reloaded_ac = CatmaProject(projects_directory=f'{temp_dir}/', project_name=PROJECT_NAME).ac_dict['ac_2']
+            values = [value for an in reloaded_ac.annotations for value in an.properties['representation_type']]
+            self.assertIn('narration', values)
+            self.assertNotIn('narrator_speech', values)
+
+    def test_update(self):
+        # test that updating a project only patches the changed page files and gives the same result as loading it again
+        git = ['git', '-c', 'user.name=GitMA', '-c', 'user.email=gitma@example.com']
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            origin = os.path.join(temp_dir, 'origin')
+            projects_directory = os.path.join(temp_dir, 'projects/')
+            shutil.copytree(f'{PROJECTS_DIRECTORY}{PROJECT_NAME}', origin)
+            subprocess.run(git + ['init', '-q', origin], check=True)
+            subprocess.run(git + ['-C', origin, 'add', '-A'], check=True)
+            subprocess.run(git + ['-C', origin, 'commit', '-q', '-m', 'init'], check=True)
+            subprocess.run(['git', 'clone', '-q', origin, projects_directory + PROJECT_NAME], check=True)
+
+            project = CatmaProject(projects_directory=projects_directory, project_name='GitMA_Demo_Project')
+            ac = project.ac_dict['ac_1']
+            unchanged_ac = project.ac_dict['ac_2']
+
+            # remove one annotation from a page file of ac_1
+            annotations_directory = f'{origin}/collections/{ac.uuid}/annotations/'
+            page_file_path = annotations_directory + sorted(os.listdir(annotations_directory))[0]
+            with open(page_file_path, 'r', encoding='utf-8') as page_file:
+                page_file_annotations = json.load(page_file)
+            with open(page_file_path, 'w', encoding='utf-8') as page_file:
+                json.dump(page_file_annotations[1:], page_file, indent=2)
+            subprocess.run(git + ['-C', origin, 'commit', '-q', '-a', '-m', 'remove annotation'], check=True)
+
+            annotation_count = len(ac.annotations)
+            project.update()
+            self.assertIs(project.ac_dict['ac_1'], ac)
+            self.assertIs(project.ac_dict['ac_2'], unchanged_ac)
+            self.assertEqual(len(ac.annotations), annotation_count - 1)
+
+            reloaded_project = CatmaProject(projects_directory=projects_directory, project_name='GitMA_Demo_Project')
+            for updated_ac in project.annotation_collections:
+                reloaded_ac = reloaded_project.ac_dict[updated_ac.name]
+                self.assertListEqual([an.uuid for an in updated_ac.annotations], [an.uuid for an in reloaded_ac.annotations])
+                self.assertTrue(updated_ac.df.equals(reloaded_ac.df))
+
+    def test_load_from_ref(self):
+        # test that a project read from the Git object database of a bare mirror equals the checked out project,
+        # with the tagsets in a submodule whose mirror lies next to the project's mirror
+        git = ['git', '-c', 'user.name=GitMA', '-c', 'user.email=gitma@example.com', '-c', 'protocol.file.allow=always']
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            origin = os.path.join(temp_dir, 'origin')
+            tagsets_origin = os.path.join(temp_dir, 'tagsets')
+            mirrors_directory = os.path.join(temp_dir, 'mirrors/')
+            shutil.copytree(f'{PROJECTS_DIRECTORY}{PROJECT_NAME}/tagsets', tagsets_origin)
+            subprocess.run(git + ['init', '-q', tagsets_origin], check=True)
+            subprocess.run(git + ['-C', tagsets_origin, 'add', '-A'], check=True)
+            subprocess.run(git + ['-C', tagsets_origin, 'commit', '-q', '-m', 'init'], check=True)
+            subprocess.run(['git', 'clone', '-q', '--mirror', tagsets_origin, mirrors_directory + 'tagsets.git'], check=True)
+
+            shutil.copytree(f'{PROJECTS_DIRECTORY}{PROJECT_NAME}', origin, ignore=shutil.ignore_patterns('tagsets'))
+            subprocess.run(git + ['init', '-q', origin], check=True)
+            subprocess.run(git + ['-C', origin, 'submodule', 'add', '-q', tagsets_origin, 'tagsets'], check=True)
+            # relative to the project's mirror
+            subprocess.run(git + ['-C', origin, 'config', '-f', '.gitmodules', 'submodule.tagsets.url', '../tagsets.git'], check=True)
+            subprocess.run(git + ['-C', origin, 'add', '-A'], check=True)
+            subprocess.run(git + ['-C', origin, 'commit', '-q', '-m', 'init'], check=True)
+            subprocess.run(['git', 'clone', '-q', '--mirror', origin, mirrors_directory + PROJECT_NAME], check=True)
+
+            project = CatmaProject(projects_directory=PROJECTS_DIRECTORY, project_name='GitMA_Demo_Project')
+            mirrored_project = CatmaProject(projects_directory=mirrors_directory, project_name='GitMA_Demo_Project', ref='HEAD')
+
+            self.assertListEqual(sorted(mirrored_project.tagset_dict), sorted(project.tagset_dict))
+            self.assertListEqual(sorted(mirrored_project.text_dict), sorted(project.text_dict))
+            for ac in project.annotation_collections:
+                mirrored_ac = mirrored_project.ac_dict[ac.name]
+                self.assertEqual(mirrored_ac.text.plain_text, ac.text.plain_text)
+                self.assertListEqual([an.uuid for an in mirrored_ac.annotations], [an.uuid for an in ac.annotations])
+                self.assertTrue(mirrored_ac.df.equals(ac.df))
+
+            # remove one annotation in the origin, the update fetches it into the mirror
+            ac = mirrored_project.ac_dict['ac_1']
+            annotations_directory = f'{origin}/collections/{ac.uuid}/annotations/'
+            page_file_path = annotations_directory + sorted(os.listdir(annotations_directory))[0]
+            with open(page_file_path, 'r', encoding='utf-8') as page_file:
+                page_file_annotations = json.load(page_file)
+            with open(page_file_path, 'w', encoding='utf-8') as page_file:
+                json.dump(page_file_annotations[1:], page_file, indent=2)
+            subprocess.run(git + ['-C', origin, 'commit', '-q', '-a', '-m', 'remove annotation'], check=True)
+
+            annotation_count = len(ac.annotations)
+            mirrored_project.update()
+            self.assertIs(mirrored_project.ac_dict['ac_1'], ac)
+            self.assertEqual(len(ac.annotations), annotation_count - 1)
+
+    def test_load_local_projects(self):
+        # test that projects loaded in threads equal a project loaded on its own, without changing the working directory
+        cwd = os.getcwd()
+        project = CatmaProject(projects_directory=PROJECTS_DIRECTORY, project_name='GitMA_Demo_Project')
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            shutil.copytree(f'{PROJECTS_DIRECTORY}{PROJECT_NAME}', f'{temp_dir}/{PROJECT_NAME}')
+            shutil.copytree(
+                f'{PROJECTS_DIRECTORY}{PROJECT_NAME}',
+                f'{temp_dir}/CATMA_00000000-0000-0000-0000-000000000000_GitMA_Demo_Copy'
+            )
+            projects = load_local_projects(temp_dir, workers=2, lazy=True)
+            self.assertEqual(os.getcwd(), cwd)
+            self.assertListEqual(sorted(projects), ['GitMA_Demo_Copy', 'GitMA_Demo_Project'])
+
+            try:
+                # lazy annotation collections get loaded independently of the working directory
+                os.chdir(temp_dir)
+                for loaded_project in projects.values():
+                    for ac in project.annotation_collections:
+                        loaded_ac = loaded_project.ac_dict[ac.name]
+                        self.assertListEqual([an.uuid for an in ac.annotations], [an.uuid for an in loaded_ac.annotations])
+                        self.assertTrue(ac.df.equals(loaded_ac.df))
+            finally:
+                os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    unittest.main()